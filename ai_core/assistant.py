@@ -2,23 +2,36 @@ from typing import Dict, Any
 from .intent import detect_intent
 from .engine import HuggingFaceEngine
 from .postprocess import clean_user_instruction, format_output
+from .registry import ModelLoadTimeout, model_registry
+
+ENGINE_MODEL = "mt5"
 
-_engine = None
 _engine_error = None
 
+# The registry owns the engine so it counts against the memory budget and
+# can be unloaded when idle; close() stops its batching threads.
+model_registry.register(ENGINE_MODEL, HuggingFaceEngine, unload=lambda engine: engine.close())
+
 
 def _get_engine():
-    global _engine, _engine_error
-    if _engine is not None:
-        return _engine
+    global _engine_error
     if _engine_error is not None:
         return None
     try:
-        _engine = HuggingFaceEngine()
+        return model_registry.get(ENGINE_MODEL)
+    except ModelLoadTimeout:
+        # Another request is still loading it; fall back for this request only
+        return None
     except Exception as exc:
         _engine_error = exc
         return None
-    return _engine
+
+def get_engine_stats() -> Dict[str, Any]:
+    """Micro-batching metrics of the engine (empty until it is loaded)."""
+    engine = model_registry.peek(ENGINE_MODEL)
+    if engine is None:
+        return {"loaded": False}
+    return {"loaded": True, "batchers": engine.stats()}
 
 def handle_request(text: str, meta: Dict[str, Any] | None = None) -> Dict[str, Any]:
     meta = meta or {}
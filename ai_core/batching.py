@@ -0,0 +1,132 @@
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Tuple
+
+
+class MicroBatcher:
+    """
+    Dynamic micro-batching scheduler.
+    Callers submit one item and block; a background thread collects items
+    for up to `max_wait_ms` or `max_batch_size` items, runs them through
+    `fn` as one batch and hands each caller its own result.
+    """
+
+    def __init__(
+        self,
+        fn: Callable[[List[Any]], List[Any]],
+        max_batch_size: int = 8,
+        max_wait_ms: float = 20,
+        name: str = "batcher",
+    ):
+        self.fn = fn
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        self.name = name
+        self._queue: "queue.Queue[Tuple[Any, Future, float]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._pid: int | None = None
+        self._closed = False
+        self._metrics = {
+            "batches": 0,
+            "items": 0,
+            "max_batch_size_seen": 0,
+            "total_queue_wait": 0.0,
+            "max_queue_wait": 0.0,
+            "total_batch_time": 0.0,
+        }
+
+    def _ensure_worker(self) -> None:
+        # Threads do not survive fork, so a forked worker starts its own
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+                return
+            if self._pid != os.getpid():
+                self._queue = queue.Queue()
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._loop, name=f"{self.name}-worker", daemon=True)
+            self._thread.start()
+
+    def submit(self, item: Any, timeout: float | None = None) -> Any:
+        if self._closed:
+            raise RuntimeError(f"{self.name} is closed")
+        self._ensure_worker()
+        future: Future = Future()
+        self._queue.put((item, future, time.monotonic()))
+        return future.result(timeout=timeout)
+
+    def _collect(self) -> List[Tuple[Any, Future, float]]:
+        first = self._queue.get()
+        if first is None:
+            return []
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                entry = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if entry is None:
+                # Close requested: finish this batch, then stop
+                self._queue.put(None)
+                break
+            batch.append(entry)
+        return batch
+
+    def _loop(self) -> None:
+        while True:
+            batch = self._collect()
+            if not batch:
+                break
+            started = time.monotonic()
+            items = [item for item, _, _ in batch]
+            try:
+                outputs = self.fn(items)
+                if len(outputs) != len(items):
+                    raise RuntimeError(f"{self.name}: expected {len(items)} outputs, got {len(outputs)}")
+                for (_, future, _), output in zip(batch, outputs):
+                    future.set_result(output)
+            except Exception as exc:
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(exc)
+            self._record(batch, started)
+
+    def _record(self, batch: List[Tuple[Any, Future, float]], started: float) -> None:
+        finished = time.monotonic()
+        waits = [started - enqueued for _, _, enqueued in batch]
+        with self._lock:
+            m = self._metrics
+            m["batches"] += 1
+            m["items"] += len(batch)
+            m["max_batch_size_seen"] = max(m["max_batch_size_seen"], len(batch))
+            m["total_queue_wait"] += sum(waits)
+            m["max_queue_wait"] = max(m["max_queue_wait"], max(waits))
+            m["total_batch_time"] += finished - started
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            m = dict(self._metrics)
+        batches, items = m["batches"], m["items"]
+        return {
+            "batches": batches,
+            "items": items,
+            "avg_batch_size": round(items / batches, 2) if batches else 0.0,
+            "max_batch_size_seen": m["max_batch_size_seen"],
+            "avg_queue_wait_ms": round(m["total_queue_wait"] / items * 1000, 1) if items else 0.0,
+            "max_queue_wait_ms": round(m["max_queue_wait"] * 1000, 1),
+            "avg_batch_time_ms": round(m["total_batch_time"] / batches * 1000, 1) if batches else 0.0,
+            "queued": self._queue.qsize(),
+        }
+
+    def close(self) -> None:
+        """Stop the worker thread once the queued items are processed."""
+        if not self._closed:
+            self._closed = True
+            self._queue.put(None)
@@ -1,5 +1,8 @@
-from transformers import pipeline
-from typing import Dict, Any
+import os
+from typing import Dict, Any, List
+
+from .batching import MicroBatcher
+from .runtime import inference_context, prepare_pipeline
 
 class HuggingFaceEngine:
     """
@@ -7,13 +10,37 @@ class HuggingFaceEngine:
     - Multilingual
     - Stable
     - One model, one brain
+    - Concurrent requests are micro-batched through the pipeline
     """
 
     def __init__(self):
-        self.model = pipeline(
+        # transformers (and torch) are imported when the engine is first built
+        from transformers import pipeline
+
+        self.model = prepare_pipeline(pipeline(
             task="text2text-generation",
             model="google/mt5-small"
-        )
+        ))
+
+        max_batch_size = int(os.getenv("AI_BATCH_MAX_SIZE", "8"))
+        max_wait_ms = float(os.getenv("AI_BATCH_MAX_WAIT_MS", "20"))
+
+        # One batcher per task: generation settings differ, so prompts of
+        # different tasks cannot share a batch
+        self._batchers = {
+            "summarize": MicroBatcher(
+                lambda prompts: self._generate(prompts, max_length=120, min_length=40),
+                max_batch_size=max_batch_size,
+                max_wait_ms=max_wait_ms,
+                name="mt5-summarize"
+            ),
+            "rewrite": MicroBatcher(
+                lambda prompts: self._generate(prompts, max_length=150, min_length=40),
+                max_batch_size=max_batch_size,
+                max_wait_ms=max_wait_ms,
+                name="mt5-rewrite"
+            ),
+        }
 
     def run(self, task: str, text: str, options: Dict[str, Any] | None = None) -> Dict[str, Any]:
         options = options or {}
@@ -30,27 +57,39 @@ class HuggingFaceEngine:
 
         return {"output": "Task not supported yet"}
 
+    def _generate(self, prompts: List[str], **kwargs) -> List[Dict[str, Any]]:
+        # The pipeline pads the prompts and runs them as one batch
+        with inference_context():
+            results = self.model(
+                prompts,
+                batch_size=len(prompts),
+                do_sample=False,
+                **kwargs
+            )
+        return [r[0] if isinstance(r, list) else r for r in results]
+
     def _summarize(self, text: str) -> str:
         prompt = f"summarize: {text}"
 
-        result = self.model(
-        prompt,
-        max_length=120,
-        min_length=40,
-        do_sample=False
-        )
+        result = self._batchers["summarize"].submit(prompt)
 
-        return result[0]["generated_text"].strip()
+        return result["generated_text"].strip()
 
 
     def _rewrite(self, text: str) -> str:
         prompt = f"paraphrase: {text}"
 
-        result = self.model(
-            prompt,
-            max_length=150,
-            min_length=40,
-            do_sample=False
-        )
+        result = self._batchers["rewrite"].submit(prompt)
+
+        return result["generated_text"].strip()
+
+    def warm_up(self) -> None:
+        """One tiny generation outside the batchers, used by the boot warm-up."""
+        self._generate(["summarize: warm up"], max_length=8, min_length=1)
+
+    def stats(self) -> Dict[str, Any]:
+        return {task: batcher.stats() for task, batcher in self._batchers.items()}
 
-        return result[0]["summary_text"].strip()
+    def close(self) -> None:
+        for batcher in self._batchers.values():
+            batcher.close()
@@ -0,0 +1,262 @@
+import gc
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def estimate_size(obj: Any, _seen: Optional[set] = None) -> int:
+    """
+    Approximate memory held by a loaded model, in bytes.
+    Understands torch modules, transformers pipelines (`.model`), objects that
+    wrap either (e.g. HuggingFaceEngine) and tuples of them.
+    """
+    _seen = _seen if _seen is not None else set()
+    if obj is None or id(obj) in _seen:
+        return 0
+    _seen.add(id(obj))
+
+    if isinstance(obj, (tuple, list)):
+        return sum(estimate_size(item, _seen) for item in obj)
+
+    if hasattr(obj, "parameters") and callable(obj.parameters):
+        total = 0
+        try:
+            for tensor in list(obj.parameters()) + list(obj.buffers()):
+                total += tensor.numel() * tensor.element_size()
+            for module in obj.modules():
+                packed = getattr(module, "_packed_params", None)
+                if packed is not None:
+                    weight, _ = packed._weight_bias()
+                    total += weight.numel() * weight.element_size()
+        except Exception:
+            pass
+        return total
+
+    inner = getattr(obj, "model", None)
+    if inner is not None:
+        return estimate_size(inner, _seen)
+    return 0
+
+
+class ModelLoadTimeout(TimeoutError):
+    """Raised when waiting on another thread's load takes longer than the timeout."""
+
+
+@dataclass
+class ModelEntry:
+    name: str
+    loader: Callable[[], Any]
+    unload: Optional[Callable[[Any], None]] = None
+    value: Any = None
+    size_bytes: int = 0
+    last_used: float = 0.0
+    loads: int = 0
+    evictions: int = 0
+    hits: int = 0
+    load_seconds: float = 0.0
+    # Set while one thread is loading; other callers wait on it
+    loading: Optional[threading.Event] = None
+    load_error: Optional[BaseException] = None
+
+    @property
+    def loaded(self) -> bool:
+        return self.value is not None
+
+    @property
+    def state(self) -> str:
+        if self.loaded:
+            return "ready"
+        if self.loading is not None:
+            return "loading"
+        if self.load_error is not None:
+            return "failed"
+        return "not_loaded"
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "loaded": self.loaded,
+            "size_mb": round(self.size_bytes / (1024 * 1024), 1),
+            "loads": self.loads,
+            "evictions": self.evictions,
+            "hits": self.hits,
+            "last_load_seconds": round(self.load_seconds, 2),
+            "idle_seconds": round(time.time() - self.last_used, 1) if self.loaded else None,
+        }
+
+
+class ModelRegistry:
+    """
+    Owns every lazily loaded model in the worker.
+    Models are loaded on first get(), their memory is estimated, and when the
+    total exceeds `budget_mb` the least recently used models are unloaded.
+    Loading is single-flight: concurrent first requests for a model wait on
+    one load (up to `load_timeout` seconds) instead of each loading a copy.
+    """
+
+    def __init__(self, budget_mb: Optional[float] = None, load_timeout: Optional[float] = None):
+        self.budget_bytes = int(budget_mb * 1024 * 1024) if budget_mb else None
+        self.load_timeout = load_timeout
+        self._entries: Dict[str, ModelEntry] = {}
+        self._lock = threading.RLock()
+
+    def register(
+        self,
+        name: str,
+        loader: Callable[[], Any],
+        unload: Optional[Callable[[Any], None]] = None,
+    ) -> None:
+        with self._lock:
+            if name not in self._entries:
+                self._entries[name] = ModelEntry(name=name, loader=loader, unload=unload)
+
+    def is_registered(self, name: str) -> bool:
+        return name in self._entries
+
+    def peek(self, name: str) -> Any:
+        """The loaded model, or None; does not load or count as a use."""
+        entry = self._entries.get(name)
+        return entry.value if entry is not None else None
+
+    def get(self, name: str, timeout: Optional[float] = None) -> Any:
+        timeout = timeout if timeout is not None else self.load_timeout
+        with self._lock:
+            entry = self._entries[name]
+            if entry.loaded:
+                entry.hits += 1
+                entry.last_used = time.time()
+                return entry.value
+            leader = entry.loading is None
+            if leader:
+                entry.loading = threading.Event()
+                entry.load_error = None
+            event = entry.loading
+
+        if not leader:
+            if not event.wait(timeout):
+                raise ModelLoadTimeout(f"Timed out after {timeout:g}s waiting for model {name} to load")
+            with self._lock:
+                if entry.loaded:
+                    entry.hits += 1
+                    entry.last_used = time.time()
+                    return entry.value
+                error = entry.load_error
+            raise RuntimeError(f"Loading model {name} failed: {error}")
+
+        # The loader runs outside the registry lock so other models stay usable
+        started = time.monotonic()
+        try:
+            value = entry.loader()
+            size = estimate_size(value)
+        except BaseException as exc:
+            with self._lock:
+                entry.load_error = exc
+                entry.loading = None
+            event.set()
+            raise
+        with self._lock:
+            entry.load_seconds = time.monotonic() - started
+            entry.value = value
+            entry.size_bytes = size
+            entry.loads += 1
+            entry.last_used = time.time()
+            entry.loading = None
+        event.set()
+        logger.info(
+            "Loaded model %s (%.0f MB in %.1fs)",
+            name, entry.size_bytes / (1024 * 1024), entry.load_seconds,
+        )
+        self._enforce_budget(keep=name)
+        return value
+
+    def readiness(self) -> Dict[str, str]:
+        """State of every registered model: ready | loading | failed | not_loaded."""
+        with self._lock:
+            return {name: e.state for name, e in self._entries.items()}
+
+    def _enforce_budget(self, keep: str) -> None:
+        if not self.budget_bytes:
+            return
+        # Victims are picked under the lock; unload hooks and gc.collect() run
+        # outside it so get() on loaded models never waits on an eviction
+        with self._lock:
+            evicted = self._detach_over_budget(keep)
+        self._release(evicted)
+
+    def _detach_over_budget(self, keep: str) -> list:
+        evicted = []
+        while self.total_bytes() > self.budget_bytes:
+            candidates = [
+                e for e in self._entries.values()
+                if e.loaded and e.name != keep
+            ]
+            if not candidates:
+                logger.warning(
+                    "Model %s alone exceeds the memory budget (%.0f MB)",
+                    keep, self.budget_bytes / (1024 * 1024),
+                )
+                break
+            evicted.append(self._detach(min(candidates, key=lambda e: e.last_used)))
+        return evicted
+
+    def _detach(self, entry: ModelEntry) -> tuple:
+        """Mark `entry` unloaded; caller holds the lock. Returns what _release() needs."""
+        value, entry.value = entry.value, None
+        freed = entry.size_bytes
+        entry.size_bytes = 0
+        entry.evictions += 1
+        return entry, value, freed
+
+    def _release(self, evicted: list) -> None:
+        if not evicted:
+            return
+        for entry, value, freed in evicted:
+            if entry.unload is not None:
+                try:
+                    entry.unload(value)
+                except Exception as exc:
+                    logger.warning("Unload hook for %s failed: %s", entry.name, exc)
+            logger.info("Evicted model %s (freed ~%.0f MB)", entry.name, freed / (1024 * 1024))
+        del value
+        evicted.clear()
+        gc.collect()
+
+    def evict(self, name: str) -> bool:
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is None or not entry.loaded:
+                return False
+            evicted = [self._detach(entry)]
+        self._release(evicted)
+        return True
+
+    def total_bytes(self) -> int:
+        return sum(e.size_bytes for e in self._entries.values() if e.loaded)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            states = [e.state for e in self._entries.values()]
+            return {
+                # Ready = nothing is mid-load or failed; models never used are fine
+                "ready": all(state in ("ready", "not_loaded") for state in states),
+                "budget_mb": round(self.budget_bytes / (1024 * 1024), 1) if self.budget_bytes else None,
+                "used_mb": round(self.total_bytes() / (1024 * 1024), 1),
+                "models": {name: e.as_dict() for name, e in self._entries.items()},
+            }
+
+
+def _float_from_env(name: str, default: Optional[float] = None) -> Optional[float]:
+    value = os.getenv(name, "").strip()
+    return float(value) if value else default
+
+
+# Shared by app.py and ai_core.assistant
+model_registry = ModelRegistry(
+    budget_mb=_float_from_env("MODEL_MEMORY_BUDGET_MB"),
+    load_timeout=_float_from_env("MODEL_LOAD_TIMEOUT", 300.0),
+)
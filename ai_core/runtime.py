@@ -0,0 +1,69 @@
+import contextlib
+import logging
+import os
+import threading
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+_configured = False
+_configure_lock = threading.Lock()
+
+
+def quantization_mode() -> str:
+    """`int8` enables dynamic quantization of Linear layers; anything else keeps fp32."""
+    return os.getenv("MODEL_QUANTIZATION", "none").strip().lower()
+
+
+def configure_torch() -> None:
+    """
+    Apply CPU runtime settings once per process, before the first model runs.
+    TORCH_NUM_THREADS / TORCH_INTEROP_THREADS default to torch's own choice.
+    """
+    global _configured
+    with _configure_lock:
+        if _configured:
+            return
+        import torch
+
+        threads = os.getenv("TORCH_NUM_THREADS")
+        if threads:
+            torch.set_num_threads(int(threads))
+        interop = os.getenv("TORCH_INTEROP_THREADS")
+        if interop:
+            try:
+                # Only allowed before any inter-op parallel work has started
+                torch.set_num_interop_threads(int(interop))
+            except RuntimeError as exc:
+                logger.warning("Could not set interop threads: %s", exc)
+        _configured = True
+
+
+def optimize_model(model: Any) -> Any:
+    """
+    Prepare a freshly loaded torch model for CPU inference:
+    eval mode, runtime thread settings and optional int8 dynamic quantization.
+    """
+    configure_torch()
+    import torch
+
+    model.eval()
+    if quantization_mode() == "int8":
+        model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        logger.info("Applied int8 dynamic quantization to %s", model.__class__.__name__)
+    return model
+
+
+def prepare_pipeline(pipe: Any) -> Any:
+    """optimize_model() for the model wrapped by a transformers pipeline."""
+    pipe.model = optimize_model(pipe.model)
+    return pipe
+
+
+def inference_context():
+    """torch.inference_mode() when torch is importable, otherwise a no-op."""
+    try:
+        import torch
+    except ImportError:
+        return contextlib.nullcontext()
+    return torch.inference_mode()
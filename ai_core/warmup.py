@@ -0,0 +1,44 @@
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from .runtime import inference_context
+
+logger = logging.getLogger(__name__)
+
+# Report of the most recent warm-up in this process (shown by /health)
+last_report: Dict[str, Dict[str, Any]] = {}
+
+
+@dataclass
+class WarmupTask:
+    name: str
+    load: Callable[[], Any]
+    # Dummy inference on the loaded model: allocates buffers and selects kernels
+    # so the first real request does not pay for it
+    infer: Optional[Callable[[Any], Any]] = None
+
+
+def run_warmup(tasks: Iterable[WarmupTask], inference: bool = True) -> Dict[str, Dict[str, Any]]:
+    """Load each model (and optionally run its dummy inference); failures are logged, not raised."""
+    report: Dict[str, Dict[str, Any]] = {}
+    for task in tasks:
+        started = time.monotonic()
+        try:
+            model = task.load()
+            loaded = time.monotonic()
+            if inference and task.infer is not None:
+                with inference_context():
+                    task.infer(model)
+            report[task.name] = {
+                "status": "ok",
+                "load_seconds": round(loaded - started, 2),
+                "inference_seconds": round(time.monotonic() - loaded, 2) if inference and task.infer else None,
+            }
+            logger.info("Warmed up %s in %.1fs", task.name, time.monotonic() - started)
+        except Exception as exc:
+            report[task.name] = {"status": "failed", "error": str(exc)}
+            logger.warning("Warm-up of %s failed: %s", task.name, exc)
+        last_report[task.name] = report[task.name]
+    return report
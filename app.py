@@ -1,9 +1,39 @@
 from flask import (
     Flask, render_template, request, jsonify,
-    redirect, url_for, flash, session, Response, send_file
+    redirect, url_for, flash, session, Response, send_file, stream_with_context
+)
+from ai_core.assistant import ENGINE_MODEL, handle_request, get_engine_stats
+from ai_core.runtime import inference_context, optimize_model, prepare_pipeline
+from ai_core.registry import ModelLoadTimeout, model_registry
+from ai_core.warmup import WarmupTask, run_warmup, last_report as warmup_report
+from jobs_core import JobQueue, JobWorker, PermanentJobError, QueueFull, SUCCEEDED, FAILED, CANCELLED
+from media_core import (
+    ParallelTranscriber,
+    compact_speech,
+    decode_audio,
+    detect_speech,
+    duration_seconds,
+    join_segments,
+    plan_windows,
+    read_and_hash,
+    remap_segments,
+    resolve_ffmpeg,
+    save_and_hash,
+    stitch_segments,
+    to_whisper_language,
+    transcript_key,
+    WhisperModelPolicy,
+)
+from translation_core import (
+    TwoTierCache, ItemResult, PROVIDER_CHAR_LIMIT,
+    make_translation_key, resolve_source_language,
+    run_ordered,
+    segment_document, reassemble_document,
+    BackendRouter, GoogleBackend, LocalMarianBackend,
+    BatchSweeper
 )
-from ai_core.assistant import handle_request
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event
 from flask_login import (
     LoginManager, UserMixin,
     login_user, logout_user,
@@ -12,73 +42,140 @@ from flask_login import (
 from werkzeug.security import generate_password_hash, check_password_hash
 from werkzeug.utils import secure_filename
 from flask_mail import Mail, Message
-from deep_translator import GoogleTranslator
-from langdetect import detect
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
 from flask_limiter.errors import RateLimitExceeded
 from authlib.integrations.flask_client import OAuth
 from dotenv import load_dotenv
-import ffmpeg
-from transformers import pipeline
 
 from werkzeug.utils import secure_filename
 from flask import request, jsonify
 import subprocess
 import shutil
 import tempfile
-import whisper
 import os
 import uuid
 import time
 import logging
 from logging.handlers import RotatingFileHandler
-from datetime import datetime
+from datetime import date, datetime
+import base64
 import json
 import csv
 import io
-from gtts import gTTS
 import re
 import concurrent.futures
-from transformers import AutoModelForCausalLM, AutoTokenizer
-import torch
+import contextlib
+import threading
+from functools import lru_cache
 
-# Defer heavyweight model loading until first use.
-whisper_model = None
-dialogpt_tokenizer = None
-dialogpt_model = None
-summarizer = None
+# ML and media libraries (torch, whisper, transformers, gtts) are
+# imported inside the features that use them, so importing this module
+# (gunicorn boot, make_admin.py, init_database.py, ...) stays fast.
+# `python benchmark_import_time.py` keeps an eye on it.
 
 app = Flask(__name__)
 
 OPENAI_AVAILABLE = False
 
-def get_whisper_model():
-    global whisper_model
-    if whisper_model is None:
-        model_name = os.getenv("WHISPER_MODEL", "base")
-        whisper_model = whisper.load_model(model_name)
-    return whisper_model
+# Defer heavyweight model loading until first use. Every model is owned by
+# the shared registry, which tracks its memory and unloads the least
+# recently used ones when MODEL_MEMORY_BUDGET_MB is exceeded.
+def whisper_model_name():
+    """Default Whisper model; with WHISPER_MODEL_POLICY=auto other sizes are picked per request"""
+    return os.getenv("WHISPER_MODEL", "base")
+
+
+def _load_whisper(name):
+    import whisper
+    return whisper.load_model(name)
+
+
+def _register_whisper(name):
+    """Each Whisper size is its own registry entry ("whisper:base", ...), loaded on first use"""
+    key = f"whisper:{name}"
+    if not model_registry.is_registered(key):
+        model_registry.register(key, lambda: _load_whisper(name))
+    return key
+
+
+def _load_dialogpt():
+    from transformers import AutoModelForCausalLM, AutoTokenizer
+
+    tokenizer = AutoTokenizer.from_pretrained("microsoft/DialoGPT-medium")
+    # Prefer safetensors to avoid torch.load vulnerability checks
+    model = optimize_model(AutoModelForCausalLM.from_pretrained(
+        "microsoft/DialoGPT-medium",
+        use_safetensors=True
+    ))
+    return tokenizer, model
+
+
+def _load_summarizer():
+    # Abstractive summarization with a small, fast instruction-tuned model.
+    from transformers import pipeline
+
+    return prepare_pipeline(pipeline("text2text-generation", model="google/flan-t5-small"))
+
+
+_register_whisper(whisper_model_name())
+model_registry.register("dialogpt", _load_dialogpt)
+model_registry.register("summarizer", _load_summarizer)
+
+
+def get_whisper_model(name=None):
+    return model_registry.get(_register_whisper(name or whisper_model_name()))
 
 
 def get_dialogpt():
-    global dialogpt_tokenizer, dialogpt_model
-    if dialogpt_tokenizer is None or dialogpt_model is None:
-        dialogpt_tokenizer = AutoTokenizer.from_pretrained("microsoft/DialoGPT-medium")
-        # Prefer safetensors to avoid torch.load vulnerability checks
-        dialogpt_model = AutoModelForCausalLM.from_pretrained(
-            "microsoft/DialoGPT-medium",
-            use_safetensors=True
-        )
-    return dialogpt_tokenizer, dialogpt_model
+    return model_registry.get("dialogpt")
 
 
 def get_summarizer():
-    global summarizer
-    if summarizer is None:
-        # Abstractive summarization with a small, fast instruction-tuned model.
-        summarizer = pipeline("text2text-generation", model="google/flan-t5-small")
-    return summarizer
+    return model_registry.get("summarizer")
+
+
+def _warm_whisper(model):
+    import numpy as np
+    model.transcribe(np.zeros(16000, dtype=np.float32), fp16=False, language="en")
+
+
+def _warm_dialogpt(loaded):
+    tokenizer, model = loaded
+    input_ids = tokenizer.encode("Hello" + tokenizer.eos_token, return_tensors="pt")
+    model.generate(input_ids, max_length=input_ids.shape[-1] + 4, pad_token_id=tokenizer.eos_token_id)
+
+
+def _warmup_tasks(names):
+    """WARMUP_MODELS entries: whisper (or whisper:<size>), summarizer, dialogpt, mt5"""
+    tasks = []
+    for name in names:
+        if name == "whisper" or name.startswith("whisper:"):
+            size = name.split(":", 1)[1] if ":" in name else None
+            tasks.append(WarmupTask(name, lambda size=size: get_whisper_model(size), _warm_whisper))
+        elif name == "summarizer":
+            tasks.append(WarmupTask(
+                name,
+                get_summarizer,
+                lambda pipe: pipe("summarize: warm up", max_length=8, min_length=1, do_sample=False)
+            ))
+        elif name == "dialogpt":
+            tasks.append(WarmupTask(name, get_dialogpt, _warm_dialogpt))
+        elif name == ENGINE_MODEL:
+            tasks.append(WarmupTask(name, lambda: model_registry.get(ENGINE_MODEL), lambda engine: engine.warm_up()))
+        else:
+            app.logger.warning(f"Unknown model in WARMUP_MODELS: {name}")
+    return tasks
+
+
+def warm_up_models(names=None, inference=None):
+    """
+    Load the WARMUP_MODELS into the registry and run a dummy inference on each.
+    Called at gunicorn boot (see gunicorn.conf.py) and by `python app.py`.
+    """
+    names = app.config['WARMUP_MODELS'] if names is None else names
+    inference = app.config['WARMUP_INFERENCE'] if inference is None else inference
+    return run_warmup(_warmup_tasks(names), inference=inference)
 
 
 def quick_summary(text: str, max_sentences: int = 3, max_words: int = 60) -> str:
@@ -113,7 +210,8 @@ def generate_huggingface_response(user_input):
     input_ids = tokenizer.encode(user_input + tokenizer.eos_token, return_tensors="pt")
 
     # توليد الرد من النموذج
-    bot_output = model.generate(input_ids, max_length=1000, pad_token_id=tokenizer.eos_token_id)
+    with inference_context():
+        bot_output = model.generate(input_ids, max_length=1000, pad_token_id=tokenizer.eos_token_id)
 
     # فك ترميز الرد الناتج
     chatbot_response = tokenizer.decode(bot_output[:, input_ids.shape[-1]:][0], skip_special_tokens=True)
@@ -122,142 +220,301 @@ def generate_huggingface_response(user_input):
 
 
 
-def convert_to_wav(input_path):
+def _decode_speech(audio_source):
     """
-    Convert audio file to WAV (16kHz mono) using ffmpeg
+    Decode media to 16 kHz mono PCM and cut silence with the VAD pass.
+    Returns (audio, timestamp_map, info); audio is None when nothing is voiced.
     """
-    if not shutil.which("ffmpeg"):
-        raise RuntimeError("ffmpeg is not installed or not in PATH")
-
-    wav_path = input_path.rsplit(".", 1)[0] + ".wav"
-
-    command = [
-        "ffmpeg",
-        "-y",
-        "-i", input_path,
-        "-ac", "1",
-        "-ar", "16000",
-        wav_path
+    # 🔁 فك ترميز الصوت مباشرة إلى الذاكرة (webm → PCM)
+    audio = decode_audio(
+        audio_source,
+        ffmpeg=resolve_ffmpeg(_local_ffmpeg),
+        max_seconds=app.config['MEDIA_MAX_SECONDS'] or None
+    )
+    duration = duration_seconds(audio)
+    info = {
+        'duration': round(duration, 2),
+        'speech_seconds': round(duration, 2),
+        'skipped_seconds': 0.0,
+    }
+
+    # 🔇 تجاهل الصمت قبل Whisper
+    if not app.config['VAD_ENABLED']:
+        return audio, None, info
+    detection = detect_speech(audio, threshold_db=app.config['VAD_THRESHOLD_DB'])
+    info.update(speech_seconds=round(detection.speech_seconds, 2), skipped_seconds=round(detection.skipped_seconds, 2))
+    if not detection.has_speech:
+        app.logger.info(f"VAD: no speech in {duration:.1f}s of audio, skipping transcription")
+        return None, None, info
+    audio, timestamp_map = compact_speech(audio, detection)
+    app.logger.info(
+        f"VAD: kept {detection.speech_seconds:.1f}s of {duration:.1f}s "
+        f"({detection.skipped_seconds:.1f}s skipped)"
+    )
+    return audio, timestamp_map, info
+
+
+def _whisper_segments(output):
+    return [
+        {'start': round(s['start'], 2), 'end': round(s['end'], 2), 'text': s['text'].strip()}
+        for s in output.get("segments", [])
+        if s['text'].strip()
     ]
 
-    subprocess.run(
-        command,
-        stdout=subprocess.DEVNULL,
-        stderr=subprocess.DEVNULL,
-        check=True
+
+_active_transcriptions = 0
+_active_transcriptions_lock = threading.Lock()
+
+
+@contextlib.contextmanager
+def _transcription_slot():
+    """Counts transcriptions running in this process (part of the queue depth)"""
+    global _active_transcriptions
+    with _active_transcriptions_lock:
+        _active_transcriptions += 1
+    try:
+        yield
+    finally:
+        with _active_transcriptions_lock:
+            _active_transcriptions -= 1
+
+
+def transcription_queue_depth():
+    """
+    Other transcriptions running in this worker plus media jobs waiting in the
+    shared queue. Called from inside the caller's own _transcription_slot(),
+    which is not counted, so an idle worker reports 0.
+    """
+    try:
+        queued = job_queue.stats()['queued']
+    except Exception:
+        queued = 0
+    return max(_active_transcriptions - 1, 0) + queued
+
+
+def choose_whisper_model(duration):
+    """Whisper model for a clip of `duration` seconds under the current load"""
+    choice = whisper_policy.choose(duration, transcription_queue_depth())
+    app.logger.info(f"Whisper model: {choice.name} ({choice.reason})")
+    return choice
+
+
+def whisper_language_hint(source_lang):
+    """Known source language (code or name) → Whisper language code, skipping its detection"""
+    if not source_lang:
+        return None
+    return to_whisper_language(detect_source('', source_lang).code)
+
+
+def _transcript_cache_key(content_hash, model_name, language=None):
+    return transcript_key(
+        content_hash,
+        model_name,
+        vad=app.config['VAD_ENABLED'],
+        max_seconds=app.config['MEDIA_MAX_SECONDS'] or None,
+        language=language
     )
 
-    return wav_path
 
-def transcribe_audio(audio_path):
+def _cached_transcript(content_hash, language=None):
+    """Cached transcript from the most accurate model the policy could pick, if any"""
+    if not content_hash or transcript_cache is None:
+        return None
+    for model_name in whisper_policy.candidates():
+        cached = transcript_cache.get(_transcript_cache_key(content_hash, model_name, language))
+        if cached is not None:
+            app.logger.info(f"Transcript cache hit for {content_hash[:12]} ({model_name})")
+            return cached
+    return None
+
+
+def _store_transcript(content_hash, language, result):
+    if content_hash and transcript_cache is not None and result.get('model'):
+        transcript_cache.set(_transcript_cache_key(content_hash, result['model'], language), result)
+
+
+def transcribe_media(audio_source, content_hash=None, language=None):
     """
-    Transcribe audio using Whisper AI (Windows-safe)
+    Transcribe audio or video using Whisper AI.
+    `audio_source` is a file path, raw bytes or a readable stream (e.g. an
+    upload's request stream). ffmpeg decodes it to 16 kHz mono PCM straight
+    into memory and the NumPy array is handed to Whisper, so no WAV file is
+    written or re-read.
+    An energy-based VAD pass first drops silence; if nothing is voiced the
+    model is never loaded. Speech longer than TRANSCRIBE_LONG_MEDIA_SECONDS
+    is split into overlapping windows cut at pauses and transcribed in
+    parallel worker processes.
+    `language` (a Whisper code) skips Whisper's language detection, and the
+    model size comes from the WHISPER_MODEL_POLICY.
+    Returns text, language, timestamped segments (original timeline),
+    duration, window count, the model used and how much audio the VAD skipped.
+    With `content_hash` (sha256 of the uploaded bytes) the transcript is
+    cached per (hash, Whisper model), so re-uploads skip ffmpeg and Whisper.
     """
-    if not os.path.exists(audio_path):
-        raise FileNotFoundError(f"Audio file not found: {audio_path}")
+    cached = _cached_transcript(content_hash, language)
+    if cached is not None:
+        return {**cached, 'cached': True}
+
+    with _transcription_slot():
+        result = _transcribe_uncached(audio_source, language)
+    _store_transcript(content_hash, language, result)
+    return {**result, 'cached': False}
 
-    wav_path = None
-    try:
-        # 🔁 تحويل webm → wav
-        wav_path = convert_to_wav(audio_path)
 
-        model = get_whisper_model()
-        result = model.transcribe(
-            wav_path,
-            fp16=False
+def _transcribe_uncached(audio_source, language=None):
+    audio, timestamp_map, info = _decode_speech(audio_source)
+    result = {'text': '', 'language': language, 'segments': [], 'chunks': 0, 'model': None, **info}
+    if audio is None:
+        return result
+    speech_duration = duration_seconds(audio)
+    choice = choose_whisper_model(speech_duration)
+    result.update(model=choice.name, model_reason=choice.reason)
+
+    windows = None
+    if parallel_transcriber.enabled and speech_duration >= app.config['TRANSCRIBE_LONG_MEDIA_SECONDS']:
+        windows = plan_windows(
+            audio,
+            window_seconds=app.config['TRANSCRIBE_WINDOW_SECONDS'],
+            overlap_seconds=app.config['TRANSCRIBE_WINDOW_OVERLAP']
         )
-        return result.get("text", "").strip()
 
-    finally:
-        # تنظيف ملف wav
-        if wav_path and os.path.exists(wav_path):
-            try:
-                os.remove(wav_path)
-            except Exception:
-                pass
+    if windows and len(windows) > 1:
+        app.logger.info(f"Long media ({speech_duration:.0f}s): transcribing {len(windows)} windows in parallel")
+        outputs = parallel_transcriber.transcribe(audio, windows, choice.name, language=language)
+        segments = stitch_segments(windows, [o['segments'] for o in outputs])
+        languages = [o['language'] for o in outputs if o.get('language')]
+        result.update({
+            'text': join_segments(segments),
+            'language': max(set(languages), key=languages.count) if languages else language,
+            'segments': segments,
+            'chunks': len(windows),
+        })
+    else:
+        model = get_whisper_model(choice.name)
+        output = model.transcribe(
+            audio,
+            fp16=False,
+            language=language
+        )
+        result.update({
+            'text': output.get("text", "").strip(),
+            'language': output.get("language") or language,
+            'segments': _whisper_segments(output),
+            'chunks': 1,
+        })
+
+    if timestamp_map is not None:
+        result['segments'] = remap_segments(result['segments'], timestamp_map)
+    return result
+
+
+def iter_transcription(audio_source, content_hash=None, language=None):
+    """
+    Incremental transcription for streaming clients.
+    Yields ('meta', info) once, then ('segments', [...]) per window of
+    TRANSCRIBE_STREAM_WINDOW_SECONDS in time order, so the first words are
+    available after one short window instead of after the whole file.
+    Speech of at least TRANSCRIBE_LONG_MEDIA_SECONDS runs its windows on the
+    process pool when it is enabled; shorter speech is transcribed window
+    by window in this worker (reusing the first window's language), so the
+    first event does not wait for pool processes to spawn and load models.
+    Cached transcripts (see transcribe_media) are replayed in one event, and
+    a finished stream is cached for later uploads of the same bytes.
+    """
+    cached = _cached_transcript(content_hash, language)
+    if cached is not None:
+        yield 'meta', {
+            key: cached.get(key)
+            for key in ('duration', 'speech_seconds', 'skipped_seconds', 'chunks', 'model')
+        }
+        if cached['segments']:
+            yield 'segments', cached['segments']
+        return
+
+    with _transcription_slot():
+        audio, timestamp_map, info = _decode_speech(audio_source)
+        windows = plan_windows(
+            audio,
+            window_seconds=app.config['TRANSCRIBE_STREAM_WINDOW_SECONDS'],
+            overlap_seconds=app.config['TRANSCRIBE_WINDOW_OVERLAP']
+        ) if audio is not None else []
+        choice = choose_whisper_model(duration_seconds(audio)) if windows else None
+        model_name = choice.name if choice else None
+        yield 'meta', {**info, 'chunks': len(windows), 'model': model_name}
+
+        use_pool = (
+            parallel_transcriber.enabled
+            and len(windows) > 1
+            and duration_seconds(audio) >= app.config['TRANSCRIBE_LONG_MEDIA_SECONDS']
+        )
+        if use_pool:
+            outputs = parallel_transcriber.iter_transcribe(audio, windows, model_name, language=language)
+        else:
+            def _sequential():
+                model = get_whisper_model(model_name)
+                window_language = language
+                for window in windows:
+                    output = model.transcribe(audio[window.start:window.end], fp16=False, language=window_language)
+                    window_language = window_language or output.get("language")
+                    yield {'language': output.get("language"), 'segments': _whisper_segments(output)}
+            outputs = _sequential()
+
+        all_segments = []
+        languages = []
+        for window, output in zip(windows, outputs):
+            segments = stitch_segments([window], [output['segments']])
+            if timestamp_map is not None:
+                segments = remap_segments(segments, timestamp_map)
+            all_segments.extend(segments)
+            if output.get('language'):
+                languages.append(output['language'])
+            yield 'segments', segments
+
+    _store_transcript(content_hash, language, {
+        'text': join_segments(all_segments),
+        'language': languages[0] if languages else language,
+        'segments': all_segments,
+        'chunks': len(windows),
+        'model': model_name,
+        **info
+    })
+
+
+def transcribe_audio(audio_source):
+    """Transcribe audio using Whisper AI and return only the text"""
+    return transcribe_media(audio_source)['text']
 
 # Load environment variables from .env file
 load_dotenv()
 
-# Configure pydub to use local ffmpeg if available
 # Check for local ffmpeg in bin directory (installed without brew)
-# IMPORTANT: Patch pydub BEFORE importing AudioSegment, because AudioSegment
-# imports mediainfo_json at module level
 _script_dir = os.path.dirname(os.path.abspath(__file__))
 _local_ffmpeg = os.path.join(_script_dir, 'bin', 'ffmpeg')
 _local_ffprobe = os.path.join(_script_dir, 'bin', 'ffprobe')
 
-# Define patched functions at module level so they're accessible
-_patched_mediainfo_json = None
-
-# Patch pydub.utils.mediainfo_json BEFORE importing AudioSegment
 if os.path.exists(_local_ffprobe) and os.access(_local_ffprobe, os.X_OK):
     # Also add to PATH for subprocess calls
     bin_dir = os.path.join(_script_dir, 'bin')
     current_path = os.environ.get('PATH', '')
     if bin_dir not in current_path:
         os.environ['PATH'] = f"{bin_dir}:{current_path}"
-    
-    # Monkey-patch pydub's get_prober_name and mediainfo_json to use absolute path
-    # This must be done BEFORE importing AudioSegment
-    import pydub.utils
-    _original_get_prober_name = pydub.utils.get_prober_name
-    def patched_get_prober_name():
-        """Patched version that returns absolute path to ffprobe"""
-        return _local_ffprobe
-    pydub.utils.get_prober_name = patched_get_prober_name
-    
-    # Also patch mediainfo_json to be safe
-    _original_mediainfo_json = pydub.utils.mediainfo_json
-    def patched_mediainfo_json(file_path, read_ahead_limit=-1):
-        """Patched version that uses absolute path to ffprobe"""
-        from subprocess import Popen, PIPE
-        # Use the same logic as original but with absolute path
-        prober = _local_ffprobe
-        command_args = ["-v", "info", "-show_format", "-show_streams"]
-        try:
-            command_args.append(pydub.utils.fsdecode(file_path))
-            stdin_parameter = None
-            stdin_data = None
-        except TypeError:
-            command_args.extend(["-read_ahead_limit", str(read_ahead_limit), "cache:pipe:0"])
-            stdin_parameter = PIPE
-            file, close_file = pydub.utils._fd_or_path_or_tempfile(file_path, 'rb', tempfile=False)
-            file.seek(0)
-            stdin_data = file.read()
-            if close_file:
-                file.close()
-        
-        command = [prober, '-of', 'json'] + command_args
-        res = Popen(command, stdin=stdin_parameter, stdout=PIPE, stderr=PIPE)
-        output, stderr = res.communicate(input=stdin_data)
-        output = output.decode("utf-8", 'ignore')
-        stderr = stderr.decode("utf-8", 'ignore')
+
+
+@lru_cache(maxsize=1)
+def media_tool_versions():
+    """First line of `ffmpeg -version` / `ffprobe -version`; probed once, on first /health call"""
+    versions = {}
+    for name, local in (('ffmpeg', _local_ffmpeg), ('ffprobe', _local_ffprobe)):
+        binary = local if os.path.exists(local) and os.access(local, os.X_OK) else shutil.which(name)
+        if not binary:
+            versions[name] = None
+            continue
         try:
-            return json.loads(output)
-        except json.decoder.JSONDecodeError:
-            # If JSON parsing fails, raise with error message
-            raise Exception(f"ffprobe failed: {stderr}")
-    _patched_mediainfo_json = patched_mediainfo_json
-    pydub.utils.mediainfo_json = patched_mediainfo_json
-
-# Now import AudioSegment (it will use the patched mediainfo_json)
-from pydub import AudioSegment
-# Also patch it in AudioSegment module namespace since it imports mediainfo_json
-import pydub.audio_segment
-if _patched_mediainfo_json is not None and hasattr(pydub.audio_segment, 'mediainfo_json'):
-    # Force patch it in audio_segment module
-    pydub.audio_segment.mediainfo_json = _patched_mediainfo_json
-
-# Configure AudioSegment to use local ffmpeg/ffprobe
-if os.path.exists(_local_ffmpeg) and os.access(_local_ffmpeg, os.X_OK):
-    AudioSegment.converter = _local_ffmpeg
-    AudioSegment.ffmpeg = _local_ffmpeg
-    if os.path.exists(_local_ffprobe) and os.access(_local_ffprobe, os.X_OK):
-        AudioSegment.ffprobe = _local_ffprobe
-    else:
-        AudioSegment.ffprobe = None
-    # Note: Logging will be initialized later, so we'll log this after Flask app is created
+            output = subprocess.check_output([binary, '-version'], stderr=subprocess.STDOUT, timeout=2)
+            versions[name] = output.decode().split('\n')[0]
+        except Exception:
+            versions[name] = binary
+    return versions
 
 # Initialize Sentry for error tracking (optional - only if SENTRY_DSN is set)
 sentry_dsn = os.getenv('SENTRY_DSN')
@@ -294,6 +551,174 @@ app = Flask(__name__)
 app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'dev-key-change-in-production-12345')
 app.config['MAX_CONTENT_LENGTH'] = int(os.getenv('MAX_CONTENT_LENGTH', 16 * 1024 * 1024))  # Default: 16MB
 app.config['UPLOAD_FOLDER'] = os.getenv('UPLOAD_FOLDER', tempfile.gettempdir())
+app.config['JOB_UPLOAD_FOLDER'] = os.path.join(app.config['UPLOAD_FOLDER'], 'jobs')  # Uploads waiting for a worker
+
+# ==============================
+# Translation cache configuration
+# ==============================
+app.config['TRANSLATION_CACHE_ENABLED'] = os.getenv('TRANSLATION_CACHE_ENABLED', 'true').lower() == 'true'
+app.config['TRANSLATION_CACHE_SIZE'] = int(os.getenv('TRANSLATION_CACHE_SIZE', '2048'))  # In-process entries
+app.config['TRANSLATION_CACHE_TTL'] = int(os.getenv('TRANSLATION_CACHE_TTL', str(24 * 3600)))  # Seconds
+# Shared tier (SQLite file used by every worker on the host); empty disables it
+app.config['TRANSLATION_CACHE_PATH'] = os.getenv(
+    'TRANSLATION_CACHE_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache', 'translations.sqlite3')
+)
+app.config['TRANSLATION_CACHE_SHARED_TTL'] = int(os.getenv('TRANSLATION_CACHE_SHARED_TTL', str(7 * 24 * 3600)))
+app.config['TRANSLATION_CACHE_SHARED_SIZE'] = int(os.getenv('TRANSLATION_CACHE_SHARED_SIZE', '100000'))
+
+# Concurrent fan-out for /translate_batch
+app.config['TRANSLATION_BATCH_CONCURRENCY'] = int(os.getenv('TRANSLATION_BATCH_CONCURRENCY', '8'))
+app.config['TRANSLATION_ITEM_TIMEOUT'] = float(os.getenv('TRANSLATION_ITEM_TIMEOUT', '20'))  # Seconds per text
+
+# Translation backends: ordered preference list, e.g. "local,google"
+app.config['TRANSLATION_BACKENDS'] = [
+    name.strip() for name in os.getenv('TRANSLATION_BACKENDS', 'google').split(',') if name.strip()
+]
+# Per-pair overrides, e.g. "en-fr:local,google;ar-en:google"
+app.config['TRANSLATION_BACKEND_PAIRS'] = os.getenv('TRANSLATION_BACKEND_PAIRS', '')
+# Pairs the local backend may serve, e.g. "en-fr,fr-en" or "*"
+app.config['TRANSLATION_LOCAL_PAIRS'] = os.getenv('TRANSLATION_LOCAL_PAIRS', '')
+app.config['TRANSLATION_LOCAL_MODEL'] = os.getenv('TRANSLATION_LOCAL_MODEL', 'Helsinki-NLP/opus-mt-{source}-{target}')
+app.config['TRANSLATION_LOCAL_BATCH_SIZE'] = int(os.getenv('TRANSLATION_LOCAL_BATCH_SIZE', '16'))
+app.config['TRANSLATION_BACKEND_COOLDOWN'] = float(os.getenv('TRANSLATION_BACKEND_COOLDOWN', '60'))  # Seconds
+app.config['TRANSLATION_BACKEND_SLOW_SECONDS'] = float(os.getenv('TRANSLATION_BACKEND_SLOW_SECONDS', '2'))  # Per item
+
+def _build_translation_router():
+    """Create the backend router from TRANSLATION_* configuration"""
+    available = {
+        'google': lambda: GoogleBackend(),
+        'local': lambda: LocalMarianBackend(
+            pairs=app.config['TRANSLATION_LOCAL_PAIRS'].split(','),
+            model_template=app.config['TRANSLATION_LOCAL_MODEL'],
+            batch_size=app.config['TRANSLATION_LOCAL_BATCH_SIZE'],
+            registry=model_registry
+        ),
+    }
+    names = [name for name in app.config['TRANSLATION_BACKENDS'] if name in available] or ['google']
+    pair_order = {}
+    for entry in app.config['TRANSLATION_BACKEND_PAIRS'].split(';'):
+        if ':' not in entry:
+            continue
+        pair, order = entry.split(':', 1)
+        pair_order[pair.strip()] = [name.strip() for name in order.split(',') if name.strip() in available]
+        for name in pair_order[pair.strip()]:
+            if name not in names:
+                names.append(name)
+    return BackendRouter(
+        [available[name]() for name in names],
+        pair_order=pair_order,
+        cooldown=app.config['TRANSLATION_BACKEND_COOLDOWN'],
+        slow_seconds=app.config['TRANSLATION_BACKEND_SLOW_SECONDS']
+    )
+
+translation_router = _build_translation_router()
+
+translation_cache = None
+if app.config['TRANSLATION_CACHE_ENABLED']:
+    translation_cache = TwoTierCache(
+        namespace='translations',
+        memory_entries=app.config['TRANSLATION_CACHE_SIZE'],
+        ttl=app.config['TRANSLATION_CACHE_TTL'],
+        disk_path=app.config['TRANSLATION_CACHE_PATH'] or None,
+        disk_ttl=app.config['TRANSLATION_CACHE_SHARED_TTL'],
+        disk_max_entries=app.config['TRANSLATION_CACHE_SHARED_SIZE'],
+    )
+
+# Long-media transcription: audio longer than this is split into windows and
+# transcribed across a process pool (TRANSCRIBE_WORKERS <= 1 disables it).
+# Off by default: every pool process keeps its own Whisper models, which the
+# MODEL_MEMORY_BUDGET_MB registry does not see
+app.config['TRANSCRIBE_WORKERS'] = int(os.getenv('TRANSCRIBE_WORKERS', '0'))
+app.config['TRANSCRIBE_LONG_MEDIA_SECONDS'] = float(os.getenv('TRANSCRIBE_LONG_MEDIA_SECONDS', '600'))
+app.config['TRANSCRIBE_WINDOW_SECONDS'] = float(os.getenv('TRANSCRIBE_WINDOW_SECONDS', '120'))
+app.config['TRANSCRIBE_WINDOW_OVERLAP'] = float(os.getenv('TRANSCRIBE_WINDOW_OVERLAP', '1.5'))  # Seconds per side
+app.config['TRANSCRIBE_STREAM_WINDOW_SECONDS'] = float(os.getenv('TRANSCRIBE_STREAM_WINDOW_SECONDS', '30'))  # /upload_media/stream
+# Only the first N seconds of an upload are decoded and transcribed (0 = no cap)
+app.config['MEDIA_MAX_SECONDS'] = float(os.getenv('MEDIA_MAX_SECONDS', '0'))
+
+parallel_transcriber = ParallelTranscriber(workers=app.config['TRANSCRIBE_WORKERS'])
+
+# Whisper model per request: "fixed" always uses WHISPER_MODEL; "auto" picks tiny/base/small
+# from the clip duration and steps down a size per WHISPER_AUTO_BUSY_DEPTH queued transcriptions
+app.config['WHISPER_MODEL_POLICY'] = os.getenv('WHISPER_MODEL_POLICY', 'fixed').lower()
+app.config['WHISPER_AUTO_MODELS'] = [
+    name.strip() for name in os.getenv('WHISPER_AUTO_MODELS', 'tiny,base,small').split(',') if name.strip()
+]
+app.config['WHISPER_AUTO_SMALL_MAX_SECONDS'] = float(os.getenv('WHISPER_AUTO_SMALL_MAX_SECONDS', '60'))
+app.config['WHISPER_AUTO_BASE_MAX_SECONDS'] = float(os.getenv('WHISPER_AUTO_BASE_MAX_SECONDS', '1800'))
+app.config['WHISPER_AUTO_BUSY_DEPTH'] = int(os.getenv('WHISPER_AUTO_BUSY_DEPTH', '4'))
+
+whisper_policy = WhisperModelPolicy(
+    default=whisper_model_name(),
+    auto=app.config['WHISPER_MODEL_POLICY'] == 'auto',
+    sizes=app.config['WHISPER_AUTO_MODELS'],
+    small_max_seconds=app.config['WHISPER_AUTO_SMALL_MAX_SECONDS'],
+    base_max_seconds=app.config['WHISPER_AUTO_BASE_MAX_SECONDS'],
+    busy_depth=app.config['WHISPER_AUTO_BUSY_DEPTH']
+)
+
+# Boot warm-up: models loaded (and run once) before the first request.
+# PRELOAD_SUMMARIZER=false is still honoured when WARMUP_MODELS is not set
+app.config['WARMUP_MODELS'] = [
+    name.strip() for name in os.getenv(
+        'WARMUP_MODELS',
+        'summarizer' if os.getenv('PRELOAD_SUMMARIZER', 'true').lower() == 'true' else ''
+    ).split(',') if name.strip()
+]
+app.config['WARMUP_INFERENCE'] = os.getenv('WARMUP_INFERENCE', 'true').lower() == 'true'
+app.config['MODEL_LOADING_RETRY_AFTER'] = int(os.getenv('MODEL_LOADING_RETRY_AFTER', '30'))  # Retry-After (s) on a 503 while a model loads
+
+# Transcripts cached by (sha256 of the uploaded bytes, Whisper model): re-uploads only redo the translation
+app.config['TRANSCRIPT_CACHE_ENABLED'] = os.getenv('TRANSCRIPT_CACHE_ENABLED', 'true').lower() == 'true'
+app.config['TRANSCRIPT_CACHE_SIZE'] = int(os.getenv('TRANSCRIPT_CACHE_SIZE', '256'))  # In-process entries
+app.config['TRANSCRIPT_CACHE_TTL'] = int(os.getenv('TRANSCRIPT_CACHE_TTL', str(7 * 24 * 3600)))  # Seconds
+app.config['TRANSCRIPT_CACHE_PATH'] = os.getenv(
+    'TRANSCRIPT_CACHE_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache', 'transcripts.sqlite3')
+)
+
+transcript_cache = None
+if app.config['TRANSCRIPT_CACHE_ENABLED']:
+    transcript_cache = TwoTierCache(
+        namespace='transcripts',
+        memory_entries=app.config['TRANSCRIPT_CACHE_SIZE'],
+        ttl=app.config['TRANSCRIPT_CACHE_TTL'],
+        disk_path=app.config['TRANSCRIPT_CACHE_PATH'] or None,
+        disk_max_entries=10000,
+    )
+
+# Voice-activity pre-pass: silence is cut before Whisper runs.
+# VAD_THRESHOLD_DB forces an absolute level (dBFS); by default it adapts to the clip's noise floor
+app.config['VAD_ENABLED'] = os.getenv('VAD_ENABLED', 'true').lower() == 'true'
+app.config['VAD_THRESHOLD_DB'] = float(os.environ['VAD_THRESHOLD_DB']) if os.getenv('VAD_THRESHOLD_DB') else None
+
+# Background jobs for audio/video uploads sent with async=1 (SQLite queue shared by all workers on the host)
+app.config['JOB_QUEUE_PATH'] = os.getenv(
+    'JOB_QUEUE_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache', 'jobs.sqlite3')
+)
+app.config['JOB_MAX_ATTEMPTS'] = int(os.getenv('JOB_MAX_ATTEMPTS', '3'))
+app.config['JOB_LEASE_SECONDS'] = float(os.getenv('JOB_LEASE_SECONDS', '900'))  # Re-queue if a worker goes silent
+app.config['JOB_USER_CONCURRENCY'] = int(os.getenv('JOB_USER_CONCURRENCY', '1'))  # Running jobs per user
+app.config['JOB_USER_MAX_PENDING'] = int(os.getenv('JOB_USER_MAX_PENDING', '10'))  # Queued + running per user
+# Worker threads inside each web process; set 0 when running `python worker.py` separately
+app.config['JOB_INLINE_WORKERS'] = int(os.getenv('JOB_INLINE_WORKERS', '1'))
+
+job_queue = JobQueue(
+    app.config['JOB_QUEUE_PATH'],
+    max_attempts=app.config['JOB_MAX_ATTEMPTS'],
+    lease_seconds=app.config['JOB_LEASE_SECONDS'],
+    user_concurrency=app.config['JOB_USER_CONCURRENCY'],
+    user_max_pending=app.config['JOB_USER_MAX_PENDING']
+)
+
+# Translation history retention: newest N rows per user are kept, older ones are
+# deleted in batches by a background sweep instead of after every request
+app.config['HISTORY_MAX_PER_USER'] = int(os.getenv('HISTORY_MAX_PER_USER', '100'))  # 0 keeps everything
+app.config['HISTORY_KEEP_FAVORITES'] = os.getenv('HISTORY_KEEP_FAVORITES', 'false').lower() == 'true'  # Opt-in: favorites never pruned
+app.config['HISTORY_RETENTION_INTERVAL'] = float(os.getenv('HISTORY_RETENTION_INTERVAL', '5'))  # Seconds between sweeps
+app.config['HISTORY_RETENTION_BATCH'] = int(os.getenv('HISTORY_RETENTION_BATCH', '200'))  # Users per DELETE
 
 # ==============================
 # Database configuration
@@ -434,26 +859,14 @@ if sentry_dsn:
     app.logger.info('✅ Sentry error tracking: ENABLED')
 else:
     app.logger.info('⚠️  Sentry error tracking: DISABLED (set SENTRY_DSN to enable)')
-# Log ffmpeg and ffprobe configuration
+# Log ffmpeg and ffprobe configuration (versions are probed lazily by /health)
 if os.path.exists(_local_ffmpeg) and os.access(_local_ffmpeg, os.X_OK):
-    try:
-        import subprocess
-        ffmpeg_version = subprocess.check_output([_local_ffmpeg, '-version'], stderr=subprocess.STDOUT, timeout=2).decode().split('\n')[0]
-        app.logger.info(f'✅ ffmpeg: Using local installation ({_local_ffmpeg})')
-        app.logger.info(f'   {ffmpeg_version}')
-    except Exception:
-        app.logger.info(f'✅ ffmpeg: Using local installation ({_local_ffmpeg})')
+    app.logger.info(f'✅ ffmpeg: Using local installation ({_local_ffmpeg})')
 else:
     app.logger.warning('⚠️  ffmpeg: Not found in bin/ directory. Audio conversion may not work properly.')
 
 if os.path.exists(_local_ffprobe) and os.access(_local_ffprobe, os.X_OK):
-    try:
-        import subprocess
-        ffprobe_version = subprocess.check_output([_local_ffprobe, '-version'], stderr=subprocess.STDOUT, timeout=2).decode().split('\n')[0]
-        app.logger.info(f'✅ ffprobe: Using local installation ({_local_ffprobe})')
-        app.logger.info(f'   {ffprobe_version}')
-    except Exception:
-        app.logger.info(f'✅ ffprobe: Using local installation ({_local_ffprobe})')
+    app.logger.info(f'✅ ffprobe: Using local installation ({_local_ffprobe})')
 else:
     app.logger.warning('⚠️  ffprobe: Not found in bin/ directory. Some audio formats may not work properly.')
 
@@ -498,6 +911,10 @@ class User(UserMixin, db.Model):
     # Admin field
     is_admin = db.Column(db.Boolean, default=False, nullable=False, index=True)
     
+    # Number of translations, kept in sync with the translations table
+    # (existing databases: python migrate_add_translations_count.py)
+    translations_count = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+    
     # Relationship to translations
     translations = db.relationship('Translation', backref='user', lazy=True, cascade='all, delete-orphan')
     
@@ -614,6 +1031,11 @@ class User(UserMixin, db.Model):
 class Translation(db.Model):
     """Translation history model"""
     __tablename__ = 'translations'
+    __table_args__ = (
+        # History pages and retention read a user's rows newest first
+        # (existing databases: python migrate_add_history_index.py)
+        db.Index('idx_translations_user_timestamp', 'user_id', 'timestamp', 'id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False, index=True)
@@ -636,6 +1058,209 @@ class Translation(db.Model):
             'is_favorite': self.is_favorite
         }
 
+class TranslationDailyStat(db.Model):
+    """
+    Rollup of translations per day, user and language pair, so dashboards
+    do not scan the translations table. Kept in step with it by
+    _track_translation_stats (ORM inserts/deletes) and
+    delete_translations (bulk deletes); existing databases are filled by
+    backfill_translation_daily_stats.py.
+    """
+    __tablename__ = 'translation_daily_stats'
+    __table_args__ = (
+        db.Index('idx_translation_daily_stats_day', 'day'),
+    )
+    
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), primary_key=True)
+    day = db.Column(db.Date, primary_key=True)
+    # '' when unknown, since primary key columns cannot be NULL
+    source_language = db.Column(db.String(50), primary_key=True, default='')
+    target_language = db.Column(db.String(50), primary_key=True, default='')
+    count = db.Column(db.Integer, nullable=False, default=0)
+    chars = db.Column(db.BigInteger, nullable=False, default=0)
+
+
+def _add_stat_delta(deltas, day, user_id, source_language, target_language, count, chars):
+    if isinstance(day, str):
+        day = date.fromisoformat(day)
+    elif isinstance(day, datetime):
+        day = day.date()
+    key = (user_id, day, source_language or '', target_language or '')
+    current = deltas.get(key, (0, 0))
+    deltas[key] = (current[0] + count, current[1] + chars)
+
+
+def apply_daily_stats(connection, deltas):
+    """
+    Add (count, chars) deltas keyed by (user_id, day, source, target) to the
+    rollup with one upsert; rows that drop to zero are removed.
+    """
+    deltas = {key: value for key, value in deltas.items() if value != (0, 0)}
+    if not deltas:
+        return
+    if connection.dialect.name == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+
+    table = TranslationDailyStat.__table__
+    statement = insert(table).values([
+        {
+            'user_id': user_id,
+            'day': day,
+            'source_language': source_language,
+            'target_language': target_language,
+            'count': count,
+            'chars': chars
+        }
+        for (user_id, day, source_language, target_language), (count, chars) in deltas.items()
+    ])
+    connection.execute(statement.on_conflict_do_update(
+        index_elements=[table.c.user_id, table.c.day, table.c.source_language, table.c.target_language],
+        set_={
+            'count': table.c.count + statement.excluded.count,
+            'chars': table.c.chars + statement.excluded.chars
+        }
+    ))
+    connection.execute(table.delete().where(
+        table.c.user_id.in_({key[0] for key in deltas}),
+        table.c.count <= 0
+    ))
+
+
+def apply_user_translation_counts(connection, deltas):
+    """Add the per-user sums of rollup deltas to users.translations_count"""
+    from sqlalchemy import bindparam
+
+    per_user = {}
+    for (user_id, _, _, _), (count, _) in deltas.items():
+        per_user[user_id] = per_user.get(user_id, 0) + count
+    per_user = {user_id: count for user_id, count in per_user.items() if count}
+    if not per_user:
+        return
+    users = User.__table__
+    connection.execute(
+        users.update().where(users.c.id == bindparam('user')).values(
+            translations_count=users.c.translations_count + bindparam('delta')
+        ),
+        [{'user': user_id, 'delta': count} for user_id, count in per_user.items()]
+    )
+
+
+@event.listens_for(db.session, 'after_flush')
+def _track_translation_stats(session, flush_context):
+    """Apply the translations inserted/deleted by this flush to the daily rollup and user counters"""
+    deleted_users = {obj.id for obj in session.deleted if isinstance(obj, User)}
+    deltas = {}
+    for objects, sign in ((session.new, 1), (session.deleted, -1)):
+        for obj in objects:
+            if not isinstance(obj, Translation) or obj.user_id in deleted_users:
+                continue
+            _add_stat_delta(
+                deltas,
+                obj.timestamp or datetime.utcnow(),
+                obj.user_id,
+                obj.detected_language,
+                obj.target_language,
+                sign,
+                sign * len(obj.original_text or '')
+            )
+    if not deltas and not deleted_users:
+        return
+    connection = session.connection()
+    if deleted_users:
+        table = TranslationDailyStat.__table__
+        connection.execute(table.delete().where(table.c.user_id.in_(deleted_users)))
+    apply_daily_stats(connection, deltas)
+    apply_user_translation_counts(connection, deltas)
+
+
+def delete_translations(*criteria):
+    """
+    Bulk-delete translations matching `criteria` in one statement.
+    Query.delete() bypasses the flush hook, so the deleted rows are returned
+    (DELETE ... RETURNING), grouped and subtracted from the rollup in the
+    same transaction. Returns the number of rows deleted; the caller commits.
+    """
+    from sqlalchemy import delete, func
+
+    table = Translation.__table__
+    deleted_rows = db.session.execute(
+        delete(table).where(*criteria).returning(
+            table.c.timestamp,
+            table.c.user_id,
+            table.c.detected_language,
+            table.c.target_language,
+            func.length(table.c.original_text)
+        )
+    ).all()
+    deltas = {}
+    for timestamp, user_id, source_language, target_language, chars in deleted_rows:
+        _add_stat_delta(deltas, timestamp, user_id, source_language, target_language, -1, -(chars or 0))
+    apply_daily_stats(db.session.connection(), deltas)
+    apply_user_translation_counts(db.session.connection(), deltas)
+    return len(deleted_rows)
+
+
+def prune_history(user_ids, keep=None):
+    """
+    Delete everything but the newest `keep` translations of each user in one
+    statement: rows are ranked per user by (timestamp, id) with a window
+    function and the ones past the cap are deleted by id. With
+    HISTORY_KEEP_FAVORITES, favorites are neither ranked nor deleted.
+    Returns the number of rows deleted.
+    """
+    from sqlalchemy import func, select
+
+    keep = app.config['HISTORY_MAX_PER_USER'] if keep is None else keep
+    if keep <= 0 or not user_ids:
+        return 0
+
+    ranked = db.session.query(
+        Translation.id.label('id'),
+        func.row_number().over(
+            partition_by=Translation.user_id,
+            order_by=(Translation.timestamp.desc(), Translation.id.desc())
+        ).label('position')
+    ).filter(Translation.user_id.in_(list(user_ids)))
+    if app.config['HISTORY_KEEP_FAVORITES']:
+        ranked = ranked.filter(Translation.is_favorite.is_(False))
+    ranked = ranked.subquery()
+
+    deleted = delete_translations(
+        Translation.id.in_(select(ranked.c.id).where(ranked.c.position > keep))
+    )
+    db.session.commit()
+    if deleted:
+        app.logger.info(f'History retention: deleted {deleted} old translations for {len(user_ids)} users (kept last {keep})')
+    return deleted
+
+
+def _prune_history_batch(user_ids):
+    try:
+        prune_history(user_ids)
+    except Exception:
+        db.session.rollback()
+        raise
+    finally:
+        db.session.remove()
+
+
+history_retention = BatchSweeper(
+    _prune_history_batch,
+    interval=app.config['HISTORY_RETENTION_INTERVAL'],
+    batch_size=app.config['HISTORY_RETENTION_BATCH'],
+    context=app.app_context,
+    name='history-retention'
+)
+
+
+def schedule_history_retention(user_id):
+    """Queue the user for the next retention sweep (called after saving translations)"""
+    if app.config['HISTORY_MAX_PER_USER'] > 0:
+        history_retention.mark(user_id)
+
+
 # User loader for Flask-Login
 @login_manager.user_loader
 def load_user(user_id):
@@ -874,29 +1499,133 @@ LANG_CODES = {
     'Finnish': 'fi'
 }
 
+def detect_source(text, source_lang=None):
+    """
+    Detect the source language once per request.
+    Returns a DetectionResult that is passed through the translate pipeline;
+    a caller-supplied source_lang (code or name) skips detection.
+    """
+    return resolve_source_language(text, LANGUAGES, source_lang=source_lang)
+
 def detect_language(text):
     """Detect the language of the input text"""
-    try:
-        lang_code = detect(text)
-        return LANGUAGES.get(lang_code, 'Unknown')
-    except:
-        return 'Unknown'
+    return detect_source(text).name
 
-def translate_text(text, target_lang):
-    """Translate text to target language"""
-    try:
-        # Detect source language
-        source_lang = detect(text)
-        target_code = LANG_CODES[target_lang]
-        
+def translate_texts(texts, target_lang, detections):
+    """
+    Translate many texts with as few provider calls as possible.
+    Cache hits are served directly; the misses are grouped by source language
+    and split into units of work by the preferred backend for that pair
+    (packed requests for Google, padded batches for the local model), which
+    run concurrently with fallback between backends. Returns one ItemResult
+    per text, in input order.
+    """
+    target_code = LANG_CODES[target_lang]
+    results = [ItemResult(index=i) for i in range(len(texts))]
+    
+    # source code -> cache key -> indices of texts with that key
+    misses = {}
+    for i, (text, detection) in enumerate(zip(texts, detections)):
         # If source and target are the same, return original
-        if source_lang == target_code:
-            return text
-        
-        # Translate using Google Translator
-        translator = GoogleTranslator(source=source_lang, target=target_code)
-        translated = translator.translate(text)
-        return translated
+        if detection.code == target_code:
+            results[i].value = text
+            continue
+        cache_key = make_translation_key(text, detection.code, target_code)
+        if translation_cache is not None:
+            cached = translation_cache.get(cache_key)
+            if cached is not None:
+                results[i].value = cached
+                continue
+        misses.setdefault(detection.code, {}).setdefault(cache_key, []).append(i)
+    
+    jobs = []
+    for source_code, by_key in misses.items():
+        keys = list(by_key)
+        unique_texts = [texts[by_key[key][0]] for key in keys]
+        if source_code == 'auto':
+            # Undetected texts may be in different languages; a packed request
+            # would be translated as whichever language the provider picks
+            units = [[j] for j in range(len(unique_texts))]
+        else:
+            units = translation_router.plan(unique_texts, source_code, target_code)
+        for unit in units:
+            jobs.append((
+                source_code,
+                [keys[j] for j in unit],
+                [unique_texts[j] for j in unit]
+            ))
+    
+    def _run_job(job_index):
+        source_code, _, unit = jobs[job_index]
+        return translation_router.translate_batch(unit, source_code, target_code)
+    
+    # Even a single job goes through run_ordered: a backend failure or a hung
+    # provider call becomes a per-item error instead of failing the request
+    job_results = run_ordered(
+        list(range(len(jobs))),
+        _run_job,
+        max_workers=app.config['TRANSLATION_BATCH_CONCURRENCY'],
+        timeout=app.config['TRANSLATION_ITEM_TIMEOUT']
+    )
+    
+    for (source_code, keys, _), job_result in zip(jobs, job_results):
+        for position, key in enumerate(keys):
+            if job_result.ok:
+                item = job_result.value[position]
+                value, error = item.value, item.error
+            else:
+                value, error = None, job_result.error
+            if error is None and not value:
+                error = 'Empty translation'
+            if error is None and translation_cache is not None:
+                translation_cache.set(key, value)
+            for i in misses[source_code][key]:
+                results[i].value = value
+                results[i].error = error
+    return results
+
+def translate_document(text, target_lang, detection=None):
+    """
+    Translate a large document chunk by chunk.
+    The text is segmented into sentence/paragraph chunks under the provider
+    limit, the chunks go through translate_texts() (cached, packed and
+    translated in parallel) and are reassembled in order with the original
+    paragraph breaks. Re-uploading a lightly edited document only sends the
+    changed chunks to the provider.
+    """
+    if detection is None:
+        detection = detect_source(text)
+    segments = segment_document(text, PROVIDER_CHAR_LIMIT)
+    chunks = [segment.text for segment in segments if segment.text]
+    if not chunks:
+        return text
+    
+    results = translate_texts(chunks, target_lang, [detection] * len(chunks))
+    failed = [result for result in results if not result.ok]
+    if len(failed) == len(results):
+        raise RuntimeError(failed[0].error)
+    if failed:
+        app.logger.warning(f'Document translation: {len(failed)}/{len(results)} chunks failed, keeping original text for them')
+    
+    translated_chunks = iter(
+        result.value if result.ok else chunk
+        for chunk, result in zip(chunks, results)
+    )
+    return reassemble_document(
+        segments,
+        [next(translated_chunks) if segment.text else '' for segment in segments]
+    )
+
+def translate_text(text, target_lang, detection=None):
+    """Translate text to target language (reuses `detection` when provided)"""
+    try:
+        # Detect source language only if the caller has not already
+        if detection is None:
+            detection = detect_source(text)
+        result = translate_texts([text], target_lang, [detection])[0]
+        if not result.ok:
+            raise RuntimeError(result.error)
+        return result.value
     except Exception as e:
         return f"Translation error: {str(e)}"
     
@@ -936,7 +1665,8 @@ def orchestrator_handle(intent: str, text: str, meta: dict | None = None):
 
     if intent == "translation":
         target_lang = meta.get("target_lang", "English")  # default
-        translated_text = translate_text(text, target_lang)
+        detection = detect_source(text, meta.get("source_lang"))
+        translated_text = translate_text(text, target_lang, detection)
         return {
             "type": "translation",
             "target_language": target_lang,
@@ -987,6 +1717,24 @@ def handle_rate_limit(e):
         'retry_after': getattr(e, 'retry_after', None)
     }), 429
 
+def model_loading_response(e):
+    """503 with Retry-After for a request that timed out waiting on a model load"""
+    retry_after = app.config['MODEL_LOADING_RETRY_AFTER']
+    app.logger.warning(f'Model still loading for {request.path}: {e}')
+    response = jsonify({
+        'error': 'Model is loading',
+        'message': 'The model is still loading. Please try again shortly.',
+        'retry_after': retry_after
+    })
+    response.status_code = 503
+    response.headers['Retry-After'] = str(retry_after)
+    return response
+
+@app.errorhandler(ModelLoadTimeout)
+def handle_model_load_timeout(e):
+    """Handle requests that waited too long for a model another request is loading"""
+    return model_loading_response(e)
+
 # Global error handlers
 @app.errorhandler(404)
 def handle_404(e):
@@ -1112,6 +1860,54 @@ def health_check():
         'message': 'Sentry error tracking enabled' if sentry_dsn else 'Sentry error tracking disabled'
     }
     
+    # Translation cache status
+    if translation_cache is not None:
+        health_status['checks']['translation_cache'] = {
+            'status': 'enabled',
+            **translation_cache.stats()
+        }
+    else:
+        health_status['checks']['translation_cache'] = {
+            'status': 'disabled',
+            'message': 'Translation cache disabled (set TRANSLATION_CACHE_ENABLED=true to enable)'
+        }
+    
+    # Transcript cache (content-hash deduplication of media uploads)
+    if transcript_cache is not None:
+        health_status['checks']['transcript_cache'] = {
+            'status': 'enabled',
+            **transcript_cache.stats()
+        }
+    else:
+        health_status['checks']['transcript_cache'] = {'status': 'disabled'}
+    
+    # Loaded models, memory use and load/evict counters; `ready` is false
+    # while a model is still loading (or failed to load) in this worker
+    model_stats = model_registry.stats()
+    health_status['checks']['models'] = model_stats
+    health_status['ready'] = model_stats['ready']
+    
+    # AI engine micro-batching metrics (batch size, queue wait)
+    health_status['checks']['ai_engine'] = get_engine_stats()
+    
+    # Translation backend health
+    health_status['checks']['translation_backends'] = translation_router.stats()
+    
+    # ffmpeg / ffprobe used for audio and video decoding
+    health_status['checks']['media_tools'] = media_tool_versions()
+    
+    # Boot warm-up results in this worker
+    health_status['checks']['warmup'] = dict(warmup_report)
+    
+    # Background job queue depth
+    try:
+        health_status['checks']['jobs'] = job_queue.stats()
+    except Exception as e:
+        health_status['checks']['jobs'] = {'error': str(e)}
+    
+    # Background history retention sweeps in this worker
+    health_status['checks']['history_retention'] = history_retention.stats()
+    
     # Overall status
     if db_status == 'unhealthy':
         health_status['status'] = 'unhealthy'
@@ -1547,6 +2343,7 @@ def translate():
         data = request.get_json()
         text = data.get('text', '').strip()
         target_lang = data.get('target_lang', 'English')
+        source_lang = data.get('source_lang')  # Optional: skips language detection
         
         app.logger.info(f'Translation request from {current_user.email} ({client_ip}): {len(text)} chars, target: {target_lang}')
         
@@ -1573,12 +2370,13 @@ def translate():
                 app.logger.debug('Validation error tracking is disabled (set SENTRY_CAPTURE_VALIDATION_ERRORS=true to enable)')
             return jsonify({'error': 'No text provided'}), 400
         
-        # Detect source language
-        detected_lang = detect_language(text)
-        app.logger.debug(f'Detected language: {detected_lang} for text: {text[:50]}...')
+        # Detect source language (once per request)
+        detection = detect_source(text, source_lang)
+        detected_lang = detection.name
+        app.logger.debug(f'Detected language: {detected_lang} ({detection.source}) for text: {text[:50]}...')
         
         # Translate text
-        translated_text = translate_text(text, target_lang)
+        translated_text = translate_text(text, target_lang, detection)
         
         # Save to database with user_id
         translation = Translation(
@@ -1593,16 +2391,8 @@ def translate():
         db.session.commit()
         app.logger.info(f'Translation saved to database (ID: {translation.id}, User: {current_user.email})')
         
-        # Keep only last 100 translations per user (optional cleanup)
-        user_translations_count = Translation.query.filter_by(user_id=current_user.id).count()
-        if user_translations_count > 100:
-            # Delete oldest translations beyond 100 for this user
-            oldest = Translation.query.filter_by(user_id=current_user.id).order_by(Translation.timestamp.asc()).limit(user_translations_count - 100).all()
-            deleted_count = len(oldest)
-            for old_translation in oldest:
-                db.session.delete(old_translation)
-            db.session.commit()
-            app.logger.info(f'Cleaned up {deleted_count} old translations for user {current_user.email} (kept last 100)')
+        # Keep only the last HISTORY_MAX_PER_USER translations (pruned in the background)
+        schedule_history_retention(current_user.id)
         
         app.logger.info(f'Translation successful: {detected_lang} -> {target_lang}')
         return jsonify({
@@ -1652,22 +2442,24 @@ def upload_text_file():
                 text = f.read()
         elif filename.endswith('.pdf'):
             from PyPDF2 import PdfReader
-            text = ''
             with open(filepath, 'rb') as f:
                 reader = PdfReader(f)
-                for page in reader.pages:
-                    text += page.extract_text()
+                # Keep page breaks so the document translator can preserve them
+                text = '\n\n'.join(page.extract_text() or '' for page in reader.pages)
         elif filename.endswith('.docx'):
             from docx import Document
-            text = ''
             doc = Document(filepath)
-            for para in doc.paragraphs:
-                text += para.text
+            text = '\n'.join(para.text for para in doc.paragraphs)
         
         # ترجم النص
         target_lang = request.form.get('target_lang', 'English')
-        detected_lang = detect_language(text)
-        translated_text = translate_text(text, target_lang)
+        detection = detect_source(text, request.form.get('source_lang'))
+        detected_lang = detection.name
+        # Large documents are translated in chunks under the provider limit
+        try:
+            translated_text = translate_document(text, target_lang, detection)
+        except Exception as e:
+            translated_text = f"Translation error: {str(e)}"
 
         # حفظ الترجمة في قاعدة البيانات
         translation = Translation(
@@ -1680,6 +2472,7 @@ def upload_text_file():
         )
         db.session.add(translation)
         db.session.commit()
+        schedule_history_retention(current_user.id)
 
         return jsonify({
             'original_text': text,
@@ -1711,7 +2504,8 @@ def summarize_text():
         prompt = f"summarize: {trimmed_text}"
 
         def _run_summary():
-            return summarizer_model(prompt, max_length=70, min_length=25, do_sample=False)
+            with inference_context():
+                return summarizer_model(prompt, max_length=70, min_length=25, do_sample=False)
 
         with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
             future = executor.submit(_run_summary)
@@ -1722,17 +2516,152 @@ def summarize_text():
                 # Fallback to fast extractive summary if model is slow or fails
                 return jsonify({'summarized_text': quick_summary(text)})
 
+    except ModelLoadTimeout as e:
+        return model_loading_response(e)
     except Exception as e:
         app.logger.error(f"Error in summarization: {str(e)}", exc_info=True)
         return jsonify({'error': 'Summarization failed'}), 500
 
 
+def process_media_upload(user_id, media_source, target_lang, source_lang=None, checkpoint=None, content_hash=None):
+    """
+    Transcribe, translate and save one audio/video upload.
+    Shared by the synchronous upload endpoints and the background job worker;
+    `checkpoint` is called between stages so a queued job can be cancelled.
+    `content_hash` lets a re-upload of the same bytes reuse its transcript.
+    Returns the response payload; it carries an 'error' key when no speech was found.
+    """
+    checkpoint = checkpoint or (lambda: None)
+
+    # 1️⃣ + 2️⃣ فك ترميز الملف وتحويله إلى نص (Whisper)
+    transcription = transcribe_media(
+        media_source,
+        content_hash=content_hash,
+        language=whisper_language_hint(source_lang)
+    )
+    text = transcription['text']
+    if not text:
+        return {'error': 'No speech detected', 'skipped_seconds': transcription['skipped_seconds']}
+    checkpoint()
+
+    # 3️⃣ كشف اللغة والترجمة
+    detection = detect_source(text, source_lang)
+    detected_lang = detection.name
+    translated_text = translate_text(text, target_lang, detection)
+    checkpoint()
+
+    # 4️⃣ حفظ النتيجة في قاعدة البيانات
+    translation = Translation(
+        user_id=user_id,
+        original_text=text,
+        detected_language=detected_lang,
+        target_language=target_lang,
+        translated_text=translated_text,
+        is_favorite=False
+    )
+    db.session.add(translation)
+    db.session.commit()
+    schedule_history_retention(user_id)
+
+    return {
+        'original_text': text,
+        'detected_language': detected_lang,
+        'target_language': target_lang,
+        'translated_text': translated_text,
+        'history_id': translation.id,
+        'segments': transcription['segments'],
+        'duration': transcription['duration'],
+        'skipped_seconds': transcription['skipped_seconds'],
+        'transcript_cached': transcription['cached'],
+        'whisper_model': transcription['model']
+    }
+
+
+def _wants_async():
+    """Uploads run as a background job when the client sends async=1"""
+    value = request.form.get('async') or request.args.get('async') or ''
+    return value.lower() in ('1', 'true', 'yes')
+
+
+def enqueue_media_job(kind, upload, target_lang, source_lang=None):
+    """Store the upload for the worker and queue it; returns a 202 response with the job id"""
+    os.makedirs(app.config['JOB_UPLOAD_FOLDER'], exist_ok=True)
+    extension = os.path.splitext(secure_filename(upload.filename or ''))[1] or '.bin'
+    path = os.path.join(app.config['JOB_UPLOAD_FOLDER'], f"{uuid.uuid4().hex}{extension}")
+    content_hash = save_and_hash(upload.stream, path)
+    try:
+        job = job_queue.enqueue(
+            'media',
+            {
+                'path': path,
+                'media': kind,
+                'target_lang': target_lang,
+                'source_lang': source_lang,
+                'content_hash': content_hash
+            },
+            user_id=current_user.id
+        )
+    except QueueFull as e:
+        os.remove(path)
+        return jsonify({'error': str(e)}), 429
+
+    # Normally already running since worker boot; idempotent
+    start_inline_job_workers()
+    app.logger.info(f"Queued {kind} job {job.id} for user {current_user.id}")
+    return jsonify({
+        **job.as_dict(),
+        'status_url': url_for('job_status', job_id=job.id),
+        'result_url': url_for('job_result', job_id=job.id)
+    }), 202
+
+
+def _run_media_job(job, context):
+    """Job handler: same pipeline as the synchronous upload endpoints"""
+    payload = job.payload
+    if not os.path.exists(payload['path']):
+        raise PermanentJobError('Uploaded file is no longer available')
+    result = process_media_upload(
+        job.user_id,
+        payload['path'],
+        payload['target_lang'],
+        payload.get('source_lang'),
+        checkpoint=context.checkpoint,
+        content_hash=payload.get('content_hash')
+    )
+    if 'error' in result:
+        raise PermanentJobError(result['error'])
+    return result
+
+
+def _cleanup_media_job(job):
+    path = job.payload.get('path')
+    if path and os.path.exists(path):
+        os.remove(path)
+
+
+job_worker = JobWorker(
+    job_queue,
+    {'media': _run_media_job},
+    context=app.app_context,
+    on_finished=_cleanup_media_job
+)
+
+
+def start_inline_job_workers():
+    """
+    Start this process's job threads (JOB_INLINE_WORKERS). Called at worker
+    boot so jobs left queued or leased by a restart are picked up without
+    waiting for a new upload.
+    """
+    if app.config['JOB_INLINE_WORKERS'] > 0:
+        job_worker.start(app.config['JOB_INLINE_WORKERS'])
+
+
 @app.route('/upload_audio', methods=['POST'])
 @login_required
 @limiter.limit("5 per minute")
 def upload_audio():
     client_ip = get_remote_address()
-    filepath = None
     app.logger.info(f"request.files: {request.files}")
     app.logger.info(f"request.form: {request.form}")
 
@@ -1746,58 +2675,28 @@ def upload_audio():
         if audio_file.filename == '':
             return jsonify({'error': 'Empty audio file'}), 400
 
-        # 1️⃣ حفظ الملف باسم مؤقت فريد (حل WinError)
-        filename = f"{uuid.uuid4().hex}.webm"
-        filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        audio_file.save(filepath)
-
-        if not os.path.exists(filepath):
-            raise FileNotFoundError("Audio file was not saved correctly")
-
-        app.logger.info(f"Audio saved: {filepath}")
-
-        # 2️⃣ تحويل الصوت إلى نص (Whisper)
-        text = transcribe_audio(filepath)
-
-        if not text:
-            return jsonify({'error': 'No speech detected'}), 400
-
-        # 3️⃣ كشف اللغة والترجمة
-        detected_lang = detect_language(text)
-        translated_text = translate_text(text, target_lang)
-
-        # 4️⃣ حفظ النتيجة في قاعدة البيانات
-        translation = Translation(
-            user_id=current_user.id,
-            original_text=text,
-            detected_language=detected_lang,
-            target_language=target_lang,
-            translated_text=translated_text,
-            is_favorite=False
+        if _wants_async():
+            return enqueue_media_job('audio', audio_file, target_lang, request.form.get('source_lang'))
+
+        # The upload is hashed while it is read and piped into ffmpeg from memory;
+        # nothing is saved to disk and a repeated upload reuses its transcript
+        audio_bytes, content_hash = read_and_hash(audio_file.stream)
+        result = process_media_upload(
+            current_user.id,
+            audio_bytes,
+            target_lang,
+            request.form.get('source_lang'),
+            content_hash=content_hash
         )
-        db.session.add(translation)
-        db.session.commit()
-
-        return jsonify({
-            'original_text': text,
-            'detected_language': detected_lang,
-            'target_language': target_lang,
-            'translated_text': translated_text,
-            'history_id': translation.id
-        })
+        if 'error' in result:
+            return jsonify(result), 400
+        return jsonify(result)
 
+    except ModelLoadTimeout as e:
+        return model_loading_response(e)
     except Exception as e:
         app.logger.error(f"Audio upload error from {client_ip}: {e}", exc_info=True)
         return jsonify({'error': 'Audio processing failed'}), 500
-
-    finally:
-        # 5️⃣ حذف الملف بعد انتهاء Whisper (Windows-safe)
-        if filepath and os.path.exists(filepath):
-            try:
-                time.sleep(1)  # مهم جدًا في Windows
-                os.remove(filepath)
-            except PermissionError:
-                app.logger.warning(f"File still in use: {filepath}")
     client_ip = get_remote_address()
 
     if 'audio' not in request.files:
@@ -1928,29 +2827,8 @@ def upload_audio():
             f'(ID={translation.id}, User={current_user.email})'
         )
 
-        # 7️⃣ تنظيف السجل (الاحتفاظ بآخر 100 ترجمة)
-        translations_count = Translation.query.filter_by(
-            user_id=current_user.id
-        ).count()
-
-        if translations_count > 100:
-            excess = translations_count - 100
-            old_items = (
-                Translation.query
-                .filter_by(user_id=current_user.id)
-                .order_by(Translation.timestamp.asc())
-                .limit(excess)
-                .all()
-            )
-
-            for item in old_items:
-                db.session.delete(item)
-
-            db.session.commit()
-            app.logger.info(
-                f'Cleaned up {len(old_items)} old translations '
-                f'for user {current_user.email}'
-            )
+        # 7️⃣ تنظيف السجل (يتم في الخلفية حسب HISTORY_MAX_PER_USER)
+        schedule_history_retention(current_user.id)
 
         # 8️⃣ الاستجابة النهائية
         return jsonify({
@@ -2033,15 +2911,8 @@ def upload_audio():
             db.session.commit()
             app.logger.info(f'Audio translation saved (ID: {translation.id}, User: {current_user.email})')
             
-            # Keep only last 100 translations per user (optional cleanup)
-            user_translations_count = Translation.query.filter_by(user_id=current_user.id).count()
-            if user_translations_count > 100:
-                oldest = Translation.query.filter_by(user_id=current_user.id).order_by(Translation.timestamp.asc()).limit(user_translations_count - 100).all()
-                deleted_count = len(oldest)
-                for old_translation in oldest:
-                    db.session.delete(old_translation)
-                db.session.commit()
-                app.logger.info(f'Cleaned up {deleted_count} old translations for user {current_user.email}')
+            # Keep only the last HISTORY_MAX_PER_USER translations (pruned in the background)
+            schedule_history_retention(current_user.id)
             
             return jsonify({
                 'original_text': text,
@@ -2136,6 +3007,8 @@ def chatbot_ask():
             'response': response
         })
         
+    except ModelLoadTimeout as e:
+        return model_loading_response(e)
     except Exception as e:
         app.logger.error(f'Chatbot ask error: {str(e)}', exc_info=True)
         return jsonify({'error': str(e)}), 500
@@ -2146,7 +3019,6 @@ def chatbot_ask():
 def upload_video():
     client_ip = get_remote_address()
     video_filepath = None
-    audio_filepath = None
     try:
         if 'video' not in request.files:
             app.logger.error("No video file provided")
@@ -2159,53 +3031,35 @@ def upload_video():
             app.logger.error("Empty video file")
             return jsonify({'error': 'Empty video file'}), 400
 
+        if _wants_async():
+            return enqueue_media_job('video', video_file, target_lang, request.form.get('source_lang'))
+
         # حفظ الفيديو مؤقتًا
-        filename = secure_filename(video_file.filename)
-        video_filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        video_file.save(video_filepath)
+        # A unique name per request: ffmpeg must read exactly the bytes that were hashed
+        extension = os.path.splitext(secure_filename(video_file.filename))[1] or '.bin'
+        video_filepath = os.path.join(app.config['UPLOAD_FOLDER'], f"{uuid.uuid4().hex}{extension}")
+        content_hash = save_and_hash(video_file.stream, video_filepath)
 
         app.logger.info(f"Video file saved to: {video_filepath}")
 
-        # معالجة الفيديو
-        audio_filepath = os.path.splitext(video_filepath)[0] + ".wav"
-        ffmpeg_cmd = _local_ffmpeg if os.path.exists(_local_ffmpeg) and os.access(_local_ffmpeg, os.X_OK) else "ffmpeg"
-        ffmpeg.input(video_filepath).output(audio_filepath).run(cmd=ffmpeg_cmd)
-
-        # تحويل الصوت إلى نص باستخدام whisper
-        model = get_whisper_model()
-        result = model.transcribe(audio_filepath)
-        text = result['text']
-
-        if not text:
-            app.logger.error("No speech detected in the video")
-            return jsonify({'error': 'No speech detected'}), 400
-
-        app.logger.info(f"Extracted text from video: {text}")
-
-        # ترجمته
-        detected_lang = detect_language(text)
-        translated_text = translate_text(text, target_lang)
-
-        # حفظ الترجمة في قاعدة البيانات
-        translation = Translation(
-            user_id=current_user.id,
-            original_text=text,
-            detected_language=detected_lang,
-            target_language=target_lang,
-            translated_text=translated_text,
-            is_favorite=False
+        # استخراج الصوت وتحويله إلى نص ثم الترجمة
+        # ffmpeg decodes the audio track into memory; long videos are transcribed in parallel windows
+        result = process_media_upload(
+            current_user.id,
+            video_filepath,
+            target_lang,
+            request.form.get('source_lang'),
+            content_hash=content_hash
         )
-        db.session.add(translation)
-        db.session.commit()
+        if 'error' in result:
+            app.logger.error("No speech detected in the video")
+            return jsonify(result), 400
 
-        return jsonify({
-            'original_text': text,
-            'detected_language': detected_lang,
-            'target_language': target_lang,
-            'translated_text': translated_text,
-            'history_id': translation.id
-        })
+        app.logger.info(f"Extracted text from video: {result['original_text']}")
+        return jsonify(result)
 
+    except ModelLoadTimeout as e:
+        return model_loading_response(e)
     except Exception as e:
         app.logger.error(f"Error processing video: {str(e)}", exc_info=True)
         return jsonify({'error': 'Video processing failed'}), 500
@@ -2218,11 +3072,174 @@ def upload_video():
             except Exception as e:
                 app.logger.warning(f"Failed to delete video file: {str(e)}")
 
-        if audio_filepath and os.path.exists(audio_filepath):
-            try:
-                os.remove(audio_filepath)
-            except Exception as e:
-                app.logger.warning(f"Failed to delete audio file: {str(e)}")
+
+
+def _sse(event, data):
+    """Format one Server-Sent Event"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@app.route('/upload_media/stream', methods=['POST'])
+@login_required
+@limiter.limit("5 per minute")
+def upload_media_stream():
+    """
+    Transcribe and translate an audio or video upload, streaming progress as
+    Server-Sent Events: `meta` (duration, skipped silence), one `segment` per
+    transcript segment with its translation as soon as its window is done,
+    then `done` with the saved history entry, or `error`.
+    """
+    client_ip = get_remote_address()
+    field = 'video' if 'video' in request.files else 'audio'
+    upload = request.files.get(field)
+    if upload is None or upload.filename == '':
+        return jsonify({'error': 'No media file provided'}), 400
+
+    target_lang = request.form.get('target_lang', 'English')
+    source_lang = request.form.get('source_lang')
+    user_id = current_user.id
+
+    # Video containers often need seeking, so they are decoded from a temp file;
+    # audio is piped to ffmpeg from memory
+    filepath = None
+    if field == 'video':
+        extension = os.path.splitext(secure_filename(upload.filename))[1] or '.bin'
+        filepath = os.path.join(app.config['UPLOAD_FOLDER'], f"{uuid.uuid4().hex}{extension}")
+        content_hash = save_and_hash(upload.stream, filepath)
+        media_source = filepath
+    else:
+        media_source, content_hash = read_and_hash(upload.stream)
+
+    def generate():
+        detection = None
+        segments = []
+        try:
+            events = iter_transcription(
+                media_source,
+                content_hash=content_hash,
+                language=whisper_language_hint(source_lang)
+            )
+            for kind, payload in events:
+                if kind == 'meta':
+                    yield _sse('meta', payload)
+                    skipped_seconds = payload['skipped_seconds']
+                    whisper_model = payload['model']
+                    continue
+                if not payload:
+                    continue
+
+                texts = [segment['text'] for segment in payload]
+                if detection is None:
+                    detection = detect_source(' '.join(texts), source_lang)
+                results = translate_texts(texts, target_lang, [detection] * len(texts))
+                for segment, item in zip(payload, results):
+                    segment = {
+                        **segment,
+                        'index': len(segments),
+                        'translated_text': item.value if item.ok else segment['text']
+                    }
+                    segments.append(segment)
+                    yield _sse('segment', segment)
+
+            if not segments:
+                yield _sse('error', {'error': 'No speech detected', 'skipped_seconds': skipped_seconds})
+                return
+
+            original_text = ' '.join(segment['text'] for segment in segments)
+            translated_text = ' '.join(segment['translated_text'] for segment in segments)
+            translation = Translation(
+                user_id=user_id,
+                original_text=original_text,
+                detected_language=detection.name,
+                target_language=target_lang,
+                translated_text=translated_text,
+                is_favorite=False
+            )
+            db.session.add(translation)
+            db.session.commit()
+            schedule_history_retention(user_id)
+
+            yield _sse('done', {
+                'original_text': original_text,
+                'detected_language': detection.name,
+                'target_language': target_lang,
+                'translated_text': translated_text,
+                'history_id': translation.id,
+                'skipped_seconds': skipped_seconds,
+                'whisper_model': whisper_model
+            })
+        except ModelLoadTimeout as e:
+            # Headers are already sent, so the retry hint goes in the event
+            app.logger.warning(f"Model still loading for streaming media from {client_ip}: {e}")
+            yield _sse('error', {
+                'error': 'Model is loading',
+                'retry_after': app.config['MODEL_LOADING_RETRY_AFTER']
+            })
+        except Exception as e:
+            app.logger.error(f"Streaming media error from {client_ip}: {e}", exc_info=True)
+            yield _sse('error', {'error': 'Media processing failed'})
+        finally:
+            if filepath and os.path.exists(filepath):
+                os.remove(filepath)
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+
+def _get_user_job(job_id):
+    """The job if it belongs to the current user (admins see every job)"""
+    job = job_queue.get(job_id)
+    if job is None or (job.user_id != current_user.id and not current_user.is_admin):
+        return None
+    return job
+
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+@login_required
+def job_status(job_id):
+    """Status of a background upload job"""
+    job = _get_user_job(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify({
+        **job.as_dict(),
+        'result_url': url_for('job_result', job_id=job.id)
+    })
+
+
+@app.route('/jobs/<job_id>/result', methods=['GET'])
+@login_required
+def job_result(job_id):
+    """Result of a finished job; 202 while it is still queued or running"""
+    job = _get_user_job(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    if job.status == SUCCEEDED:
+        return jsonify(job.result)
+    if job.status == FAILED:
+        return jsonify({'error': job.error or 'Processing failed', 'status': job.status}), 422
+    if job.status == CANCELLED:
+        return jsonify({'error': 'Job was cancelled', 'status': job.status}), 410
+    return jsonify(job.as_dict()), 202
+
+
+@app.route('/jobs/<job_id>/cancel', methods=['POST'])
+@login_required
+def cancel_job(job_id):
+    """Cancel a queued job, or ask a running one to stop at its next stage"""
+    job = _get_user_job(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    if job.finished:
+        return jsonify({'error': f'Job already {job.status}', **job.as_dict()}), 409
+    job = job_queue.cancel(job_id)
+    if job.status == CANCELLED:
+        _cleanup_media_job(job)
+    app.logger.info(f"Job {job_id} cancel requested by user {current_user.id}")
+    return jsonify(job.as_dict())
 
 
 @app.route('/statistics', methods=['POST'])
@@ -2262,37 +3279,69 @@ def dashboard():
 @login_required
 @limiter.limit("30 per minute")  # Allow 30 dashboard requests per minute per IP
 def get_dashboard_stats():
-    """Get dashboard statistics for current user"""
+    """
+    Get dashboard statistics for current user.
+    Served from the translation_daily_stats rollup: one row of conditional
+    sums (time windows, characters, last 7 days) and one GROUP BY over
+    language pairs, from which the target language distribution is summed.
+    Favorites are counted on translations through the user_id index.
+    """
     try:
-        from sqlalchemy import func, extract
+        from sqlalchemy import func, case
         from datetime import datetime, timedelta
         
         user_id = current_user.id
+        today = datetime.utcnow().date()
+        first_day_of_month = today.replace(day=1)
+        # Last 7 days including today, oldest first
+        days = [today - timedelta(days=i) for i in range(6, -1, -1)]
+        
+        stats = TranslationDailyStat
+        
+        def sum_where(condition):
+            return func.coalesce(func.sum(case((condition, stats.count), else_=0)), 0)
+        
+        totals = db.session.query(
+            func.coalesce(func.sum(stats.count), 0),
+            sum_where(stats.day >= first_day_of_month),
+            sum_where(stats.day >= days[0]),
+            sum_where(stats.day == today),
+            func.coalesce(func.sum(stats.chars), 0),
+            *[sum_where(stats.day == day) for day in days]
+        ).filter(stats.user_id == user_id).one()
+        total_translations, this_month, this_week, today_count, total_chars = totals[:5]
+        avg_length = total_chars / total_translations if total_translations else 0
+        
+        activity_data = [
+            {
+                'date': day.strftime('%Y-%m-%d'),
+                'day': day.strftime('%a'),
+                'count': day_count
+            }
+            for day, day_count in zip(days, totals[5:])
+        ]
         
-        # Total translations
-        total_translations = Translation.query.filter_by(user_id=user_id).count()
-        
-        # Translations this month
-        now = datetime.utcnow()
-        first_day_of_month = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-        this_month = Translation.query.filter(
-            Translation.user_id == user_id,
-            Translation.timestamp >= first_day_of_month
-        ).count()
-        
-        # Translations this week
-        week_ago = now - timedelta(days=7)
-        this_week = Translation.query.filter(
-            Translation.user_id == user_id,
-            Translation.timestamp >= week_ago
-        ).count()
+        # Language pairs; the target language distribution is summed from them
+        pair_counts = db.session.query(
+            stats.source_language,
+            stats.target_language,
+            func.sum(stats.count).label('count')
+        ).filter(stats.user_id == user_id).group_by(
+            stats.source_language,
+            stats.target_language
+        ).order_by(func.sum(stats.count).desc()).all()
+        
+        target_counts = {}
+        for _, target, count in pair_counts:
+            target_counts[target] = target_counts.get(target, 0) + count
+        top_targets = sorted(target_counts.items(), key=lambda item: item[1], reverse=True)[:10]
+        language_distribution = {lang: count for lang, count in top_targets if lang}
         
-        # Translations today
-        today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
-        today = Translation.query.filter(
-            Translation.user_id == user_id,
-            Translation.timestamp >= today_start
-        ).count()
+        # Most common language pairs
+        top_language_pairs = [
+            {'from': pair[0] or 'Unknown', 'to': pair[1] or None, 'count': pair[2]}
+            for pair in pair_counts[:5]
+        ]
         
         # Favorite translations count
         favorites_count = Translation.query.filter_by(
@@ -2300,62 +3349,11 @@ def get_dashboard_stats():
             is_favorite=True
         ).count()
         
-        # Language distribution (target languages)
-        language_stats = db.session.query(
-            Translation.target_language,
-            func.count(Translation.id).label('count')
-        ).filter_by(user_id=user_id).group_by(
-            Translation.target_language
-        ).order_by(func.count(Translation.id).desc()).limit(10).all()
-        
-        language_distribution = {lang: count for lang, count in language_stats if lang}
-        
-        # Activity over last 7 days
-        activity_data = []
-        for i in range(6, -1, -1):  # Last 7 days including today
-            day_start = (now - timedelta(days=i)).replace(hour=0, minute=0, second=0, microsecond=0)
-            day_end = day_start + timedelta(days=1)
-            day_count = Translation.query.filter(
-                Translation.user_id == user_id,
-                Translation.timestamp >= day_start,
-                Translation.timestamp < day_end
-            ).count()
-            activity_data.append({
-                'date': day_start.strftime('%Y-%m-%d'),
-                'day': day_start.strftime('%a'),
-                'count': day_count
-            })
-        
-        # Most common language pairs
-        language_pairs = db.session.query(
-            Translation.detected_language,
-            Translation.target_language,
-            func.count(Translation.id).label('count')
-        ).filter_by(user_id=user_id).group_by(
-            Translation.detected_language,
-            Translation.target_language
-        ).order_by(func.count(Translation.id).desc()).limit(5).all()
-        
-        top_language_pairs = [
-            {'from': pair[0] or 'Unknown', 'to': pair[1], 'count': pair[2]}
-            for pair in language_pairs
-        ]
-        
-        # Average text length
-        avg_length = db.session.query(
-            func.avg(func.length(Translation.original_text))
-        ).filter_by(user_id=user_id).scalar() or 0
-        
-        # Total characters translated
-        total_chars = db.session.query(
-            func.sum(func.length(Translation.original_text))
-        ).filter_by(user_id=user_id).scalar() or 0
-        
         return jsonify({
             'total_translations': total_translations,
             'this_month': this_month,
             'this_week': this_week,
-            'today': today,
+            'today': today_count,
             'favorites_count': favorites_count,
             'language_distribution': language_distribution,
             'activity_timeline': activity_data,
@@ -2369,25 +3367,78 @@ def get_dashboard_stats():
         app.logger.error(f'Error getting dashboard stats for user {current_user.email}: {str(e)}', exc_info=True)
         return jsonify({'error': str(e)}), 500
 
+def encode_history_cursor(translation):
+    """Opaque keyset cursor: position of the last row of a page"""
+    raw = f"{translation.timestamp.isoformat()}|{translation.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_history_cursor(cursor):
+    """(timestamp, id) from a cursor; raises ValueError if it is malformed"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+        timestamp, translation_id = raw.rsplit('|', 1)
+        return datetime.fromisoformat(timestamp), int(translation_id)
+    except Exception:
+        raise ValueError('Invalid cursor')
+
+
 @app.route('/history', methods=['GET'])
 @login_required
 @limiter.limit("30 per minute")  # Allow 30 history requests per minute per IP
 def get_history():
-    """Get translation history for current user"""
+    """
+    Get translation history for current user, newest first.
+    Keyset pagination: pass the returned `next_cursor` as `cursor` to get the
+    next page (null on the last page). The total count (the user's
+    maintained translations_count) is only included when `include_total=1`.
+    """
     try:
-        limit = request.args.get('limit', 50, type=int)
-        # Return history in reverse order (newest first) for current user only
-        translations = Translation.query.filter_by(user_id=current_user.id).order_by(Translation.timestamp.desc()).limit(limit).all()
-        history_list = [t.to_dict() for t in translations]
-        total = Translation.query.filter_by(user_id=current_user.id).count()
-        return jsonify({
-            'history': history_list,
-            'total': total
-        })
+        from sqlalchemy import and_, or_
+
+        limit = max(1, min(request.args.get('limit', 50, type=int), 500))
+        cursor = request.args.get('cursor')
+        include_total = request.args.get('include_total', '').lower() in ('1', 'true', 'yes')
+
+        query = Translation.query.filter_by(user_id=current_user.id)
+        if cursor:
+            try:
+                cursor_timestamp, cursor_id = decode_history_cursor(cursor)
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+            # Rows strictly after the cursor in (timestamp desc, id desc) order
+            query = query.filter(or_(
+                Translation.timestamp < cursor_timestamp,
+                and_(Translation.timestamp == cursor_timestamp, Translation.id < cursor_id)
+            ))
+        # One extra row tells whether another page exists
+        translations = query.order_by(
+            Translation.timestamp.desc(), Translation.id.desc()
+        ).limit(limit + 1).all()
+        has_more = len(translations) > limit
+        translations = translations[:limit]
+
+        response = {
+            'history': [t.to_dict() for t in translations],
+            'next_cursor': encode_history_cursor(translations[-1]) if has_more else None
+        }
+        if include_total:
+            response['total'] = current_user.translations_count
+        return jsonify(response)
     except Exception as e:
         app.logger.error(f'Error getting history for user {current_user.email}: {str(e)}', exc_info=True)
         return jsonify({'error': str(e)}), 500
 
+@app.route('/history/<int:history_id>', methods=['GET'])
+@login_required
+@limiter.limit("30 per minute")  # Allow 30 history requests per minute per IP
+def get_history_item(history_id):
+    """Get a single history item (only if owned by current user)"""
+    translation = Translation.query.filter_by(id=history_id, user_id=current_user.id).first()
+    if translation is None:
+        return jsonify({'error': 'History item not found'}), 404
+    return jsonify(translation.to_dict())
+
 @app.route('/history/<int:history_id>', methods=['DELETE'])
 @login_required
 @limiter.limit("10 per minute")  # Allow 10 delete operations per minute per IP
@@ -2410,8 +3461,7 @@ def delete_history_item(history_id):
 def clear_history():
     """Clear all translation history for current user"""
     try:
-        count = Translation.query.filter_by(user_id=current_user.id).count()
-        Translation.query.filter_by(user_id=current_user.id).delete()
+        count = delete_translations(Translation.user_id == current_user.id)
         db.session.commit()
         app.logger.info(f'History cleared for user {current_user.email}: {count} translations deleted')
         return jsonify({'message': 'History cleared', 'deleted_count': count})
@@ -2449,6 +3499,7 @@ def translate_batch():
         data = request.get_json()
         texts = data.get('texts', [])
         target_lang = data.get('target_lang', 'English')
+        source_lang = data.get('source_lang')  # Optional: applies to every text
         
         if not texts or not isinstance(texts, list):
             return jsonify({'error': 'Please provide a list of texts'}), 400
@@ -2456,27 +3507,51 @@ def translate_batch():
         if len(texts) > 50:  # Limit batch size
             return jsonify({'error': 'Maximum 50 texts per batch'}), 400
         
+        texts = [text for text in texts if isinstance(text, str) and text.strip()]
+        
+        # Language detection fans out on the same bounded pool (identical
+        # texts are detected once); a failed detection only fails its item
+        detection_results = run_ordered(
+            texts,
+            lambda text: detect_source(text, source_lang),
+            max_workers=app.config['TRANSLATION_BATCH_CONCURRENCY'],
+            timeout=app.config['TRANSLATION_ITEM_TIMEOUT']
+        )
+        detected = [i for i, detection in enumerate(detection_results) if detection.ok]
+        
+        # Identical texts are translated once, texts sharing a language pair
+        # are packed into few provider calls that run concurrently, and one
+        # failing item does not fail the batch
+        item_results = list(detection_results)
+        translated = translate_texts(
+            [texts[i] for i in detected],
+            target_lang,
+            [detection_results[i].value for i in detected]
+        )
+        for i, item in zip(detected, translated):
+            item_results[i] = item
+        
         results = []
-        for text in texts:
-            if not text.strip():
-                continue
-            try:
-                detected_lang = detect_language(text)
-                translated_text = translate_text(text, target_lang)
+        for text, detection, item in zip(texts, detection_results, item_results):
+            if item.ok:
                 results.append({
                     'original': text,
-                    'detected_language': detected_lang,
-                    'translated': translated_text
+                    'detected_language': detection.value.name,
+                    'translated': item.value
                 })
-            except Exception as e:
+            else:
+                app.logger.warning(f'Batch item failed for user {current_user.email}: {item.error}')
                 results.append({
                     'original': text,
                     'detected_language': 'Unknown',
-                    'translated': f'Error: {str(e)}'
+                    'translated': f'Error: {item.error}',
+                    'error': item.error
                 })
         
-        # Save batch to database with user_id
+        # Save successful batch items to database with user_id
         for result in results:
+            if 'error' in result:
+                continue
             translation = Translation(
                 user_id=current_user.id,
                 original_text=result['original'],
@@ -2490,18 +3565,13 @@ def translate_batch():
         db.session.commit()
         app.logger.info(f'Batch translation saved for user {current_user.email}: {len(results)} translations')
         
-        # Keep only last 100 translations per user (optional cleanup)
-        user_translations_count = Translation.query.filter_by(user_id=current_user.id).count()
-        if user_translations_count > 100:
-            oldest = Translation.query.filter_by(user_id=current_user.id).order_by(Translation.timestamp.asc()).limit(user_translations_count - 100).all()
-            for old_translation in oldest:
-                db.session.delete(old_translation)
-            db.session.commit()
-            app.logger.info(f'Cleaned up old batch translations for user {current_user.email}')
+        # Keep only the last HISTORY_MAX_PER_USER translations (pruned in the background)
+        schedule_history_retention(current_user.id)
         
         return jsonify({
             'target_language': target_lang,
             'count': len(results),
+            'failed': sum(1 for result in results if 'error' in result),
             'results': results
         })
     except Exception as e:
@@ -2732,6 +3802,8 @@ def text_to_speech():
             name_to_code = {v: k for k, v in LANGUAGES.items()}
             lang_code = name_to_code.get(lang, 'en')
 
+        from gtts import gTTS
+
         tts = gTTS(text=text, lang=lang_code, slow=False)
         audio_buffer = io.BytesIO()
         tts.write_to_fp(audio_buffer)
@@ -2764,61 +3836,35 @@ def admin_dashboard():
 @admin_required
 @limiter.limit("30 per minute")
 def get_admin_stats():
-    """Get admin dashboard statistics"""
+    """
+    Get admin dashboard statistics.
+    User figures come from one row of conditional counts on users (plus the
+    provider GROUP BY); translation figures come from the
+    translation_daily_stats rollup rather than scanning translations.
+    """
     try:
-        from sqlalchemy import func
+        from sqlalchemy import func, case
         from datetime import datetime, timedelta
         
-        # Total users
-        total_users = User.query.count()
-        
-        # Total translations
-        total_translations = Translation.query.count()
-        
-        # Active users (logged in last 30 days)
-        thirty_days_ago = datetime.utcnow() - timedelta(days=30)
-        active_users = User.query.filter(
-            User.last_login >= thirty_days_ago
-        ).count()
-        
-        # New users this month
         now = datetime.utcnow()
+        thirty_days_ago = now - timedelta(days=30)
         first_day_of_month = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-        new_users_month = User.query.filter(
-            User.created_at >= first_day_of_month
-        ).count()
-        
-        # New users this week
         week_ago = now - timedelta(days=7)
-        new_users_week = User.query.filter(
-            User.created_at >= week_ago
-        ).count()
-        
-        # Translations this month
-        translations_month = Translation.query.filter(
-            Translation.timestamp >= first_day_of_month
-        ).count()
         
-        # Translations this week
-        translations_week = Translation.query.filter(
-            Translation.timestamp >= week_ago
-        ).count()
-        
-        # Verified users
-        verified_users = User.query.filter_by(email_verified=True).count()
-        
-        # Admin users
-        admin_users = User.query.filter_by(is_admin=True).count()
-        
-        # Language distribution (all users)
-        language_stats = db.session.query(
-            Translation.target_language,
-            func.count(Translation.id).label('count')
-        ).group_by(Translation.target_language).order_by(
-            func.count(Translation.id).desc()
-        ).limit(10).all()
-        
-        language_distribution = {lang: count for lang, count in language_stats if lang}
+        def count_where(condition):
+            return func.count(case((condition, User.id)))
+        
+        # Total, active (logged in last 30 days), new this month/week, verified and admin users
+        (
+            total_users, active_users, new_users_month, new_users_week, verified_users, admin_users
+        ) = db.session.query(
+            func.count(User.id),
+            count_where(User.last_login >= thirty_days_ago),
+            count_where(User.created_at >= first_day_of_month),
+            count_where(User.created_at >= week_ago),
+            count_where(User.email_verified.is_(True)),
+            count_where(User.is_admin.is_(True))
+        ).one()
         
         # Users by provider
         provider_stats = db.session.query(
@@ -2828,20 +3874,40 @@ def get_admin_stats():
         
         provider_distribution = {provider: count for provider, count in provider_stats}
         
-        # Activity over last 7 days
-        activity_data = []
-        for i in range(6, -1, -1):
-            day_start = (now - timedelta(days=i)).replace(hour=0, minute=0, second=0, microsecond=0)
-            day_end = day_start + timedelta(days=1)
-            day_count = Translation.query.filter(
-                Translation.timestamp >= day_start,
-                Translation.timestamp < day_end
-            ).count()
-            activity_data.append({
-                'date': day_start.strftime('%Y-%m-%d'),
-                'day': day_start.strftime('%a'),
+        # Translation totals and the last 7 days (including today), from the rollup
+        stats = TranslationDailyStat
+        today = now.date()
+        days = [today - timedelta(days=i) for i in range(6, -1, -1)]
+        
+        def sum_where(condition):
+            return func.coalesce(func.sum(case((condition, stats.count), else_=0)), 0)
+        
+        totals = db.session.query(
+            func.coalesce(func.sum(stats.count), 0),
+            sum_where(stats.day >= first_day_of_month.date()),
+            sum_where(stats.day >= days[0]),
+            *[sum_where(stats.day == day) for day in days]
+        ).one()
+        total_translations, translations_month, translations_week = totals[:3]
+        
+        activity_data = [
+            {
+                'date': day.strftime('%Y-%m-%d'),
+                'day': day.strftime('%a'),
                 'count': day_count
-            })
+            }
+            for day, day_count in zip(days, totals[3:])
+        ]
+        
+        # Language distribution (all users)
+        language_stats = db.session.query(
+            stats.target_language,
+            func.sum(stats.count).label('count')
+        ).group_by(stats.target_language).order_by(
+            func.sum(stats.count).desc()
+        ).limit(10).all()
+        
+        language_distribution = {lang: count for lang, count in language_stats if lang}
         
         return jsonify({
             'total_users': total_users,
@@ -2861,6 +3927,24 @@ def get_admin_stats():
         app.logger.error(f'Admin stats error: {str(e)}', exc_info=True)
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/admin/models', methods=['GET'])
+@admin_required
+@limiter.limit("30 per minute")
+def get_admin_models():
+    """Get model registry statistics (memory, loads, evictions)"""
+    return jsonify(model_registry.stats())
+
+@app.route('/api/admin/models/<name>/evict', methods=['POST'])
+@admin_required
+@limiter.limit("10 per minute")
+def evict_admin_model(name):
+    """Unload a model to free memory (it is reloaded on next use)"""
+    if not model_registry.is_registered(name):
+        return jsonify({'error': 'Unknown model'}), 404
+    evicted = model_registry.evict(name)
+    app.logger.info(f'Model {name} evict requested by {current_user.email}: evicted={evicted}')
+    return jsonify({'model': name, 'evicted': evicted, **model_registry.stats()})
+
 @app.route('/api/admin/users', methods=['GET'])
 @admin_required
 @limiter.limit("30 per minute")
@@ -2897,9 +3981,9 @@ def get_admin_users():
         pagination = query.paginate(page=page, per_page=per_page, error_out=False)
         users = pagination.items
         
+        # translations_count is a maintained column, so the page is one query
         users_data = []
         for user in users:
-            translations_count = Translation.query.filter_by(user_id=user.id).count()
             users_data.append({
                 'id': user.id,
                 'email': user.email,
@@ -2910,7 +3994,7 @@ def get_admin_users():
                 'is_admin': user.is_admin,
                 'created_at': user.created_at.isoformat() if user.created_at else None,
                 'last_login': user.last_login.isoformat() if user.last_login else None,
-                'translations_count': translations_count,
+                'translations_count': user.translations_count,
                 'picture': user.picture
             })
         
@@ -2950,8 +4034,8 @@ def get_admin_translations():
         if user_id:
             query = query.filter_by(user_id=user_id)
         
-        # Order by timestamp desc
-        query = query.order_by(Translation.timestamp.desc())
+        # Order by timestamp desc; owners are joined in instead of loaded per row
+        query = query.options(db.joinedload(Translation.user)).order_by(Translation.timestamp.desc())
         
         # Pagination
         pagination = query.paginate(page=page, per_page=per_page, error_out=False)
@@ -2959,7 +4043,7 @@ def get_admin_translations():
         
         translations_data = []
         for trans in translations:
-            user = User.query.get(trans.user_id)
+            user = trans.user
             translations_data.append({
                 'id': trans.id,
                 'user_id': trans.user_id,
@@ -3180,9 +4264,46 @@ def generate_chatbot_response(question, topic, context):
     
     else:
         return f"Regarding {topic}:\n\n{context}\n\nFeel free to ask me more specific questions about this topic. I can help with terminology, translation tips, or key concepts!"
+def _is_voice_request():
+    return bool(request.content_type and "multipart/form-data" in request.content_type)
+
+
 @app.route('/api/ai/assistant', methods=['POST'])
+@login_required
+# Voice input runs ffmpeg + Whisper, so it gets the same limit as /upload_audio
+@limiter.limit("5 per minute", exempt_when=lambda: not _is_voice_request())
 def ai_assistant():
     try:
+        # Voice input: multipart/form-data with an 'audio' file
+        if _is_voice_request():
+            audio_file = request.files.get("audio")
+            if not audio_file or audio_file.filename == "":
+                return jsonify({"status": "error", "error": "No audio file provided"}), 400
+
+            action = (request.form.get("action") or "").strip().lower() or None
+            meta = {"action": action, "target_lang": request.form.get("target_lang", "English")}
+
+            # Same bytes as an earlier upload → cached transcript, only the AI step runs
+            audio_bytes, content_hash = read_and_hash(audio_file.stream)
+            transcription = transcribe_media(
+                audio_bytes,
+                content_hash=content_hash,
+                language=whisper_language_hint(request.form.get("source_lang"))
+            )
+            transcript = transcription["text"]
+            if not transcript:
+                return jsonify({"status": "error", "error": "No speech detected"}), 400
+
+            result = handle_request(transcript, meta=meta)
+
+            return jsonify({
+                "status": "success",
+                "input_type": "voice",
+                "transcript": transcript,
+                "whisper_model": transcription["model"],
+                **result
+            })
+
         data = request.get_json(silent=True) or {}
 
         text = (data.get("content") or "").strip()
@@ -3197,6 +4318,8 @@ def ai_assistant():
             **result
         })
 
+    except ModelLoadTimeout as e:
+        return model_loading_response(e)
     except Exception as e:
         app.logger.error(str(e), exc_info=True)
         return jsonify({"error": str(e), "status": "error"}), 500
@@ -3320,29 +4443,21 @@ if __name__ == '__main__':
         print(f"❌ Database initialization error: {str(e)}")
         raise
 
-    # Preload summarization model in background to avoid blocking startup
-    try:
-        if os.getenv("PRELOAD_SUMMARIZER", "true").lower() == "true":
-            import threading
-
-            def _preload():
-                try:
-                    get_summarizer()
-                    app.logger.info("✅ Summarizer model preloaded")
-                except Exception as e:
-                    app.logger.warning(f"⚠️ Summarizer preload failed: {e}")
-
-            threading.Thread(target=_preload, daemon=True).start()
-        else:
-            app.logger.info("ℹ️ Summarizer preload skipped (PRELOAD_SUMMARIZER=false)")
-    except Exception as e:
-        app.logger.warning(f"⚠️ Summarizer preload setup failed: {e}")
-    
     # Production: use PORT from environment, default to 5000
     port = int(os.environ.get('PORT', 5000))
     # Only enable debug in development
     debug = os.environ.get('FLASK_ENV') == 'development'
     
+    # Resume queued jobs; with the debug reloader only the serving child runs them
+    if not debug or os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        start_inline_job_workers()
+    
+    # Warm up models in background to avoid blocking startup
+    if app.config['WARMUP_MODELS']:
+        threading.Thread(target=warm_up_models, name="warmup", daemon=True).start()
+    else:
+        app.logger.info("ℹ️ Model warm-up skipped (WARMUP_MODELS is empty)")
+    
     app.logger.info(f'Starting Flask server on port {port} (debug={debug})')
     app.run(host='0.0.0.0', port=port, debug=debug)
 
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Backfill script for the translation_daily_stats rollup table
+Run this once after upgrading so the dashboards include translations saved before the rollup existed.
+Safe to re-run: each user's rows are rebuilt from the translations table.
+"""
+
+import argparse
+from datetime import date
+from app import app, db, Translation, TranslationDailyStat, User
+from sqlalchemy import func, inspect
+
+
+def backfill_translation_daily_stats(batch_size=500):
+    """Rebuild translation_daily_stats from translations, a batch of users per transaction"""
+    with app.app_context():
+        try:
+            # Create the table if the app has not started since the upgrade
+            inspector = inspect(db.engine)
+            if TranslationDailyStat.__tablename__ not in inspector.get_table_names():
+                print("🔄 Creating translation_daily_stats table...")
+                TranslationDailyStat.__table__.create(db.engine)
+                print("✅ translation_daily_stats table created")
+
+            user_ids = [user_id for (user_id,) in db.session.query(User.id).order_by(User.id).all()]
+            print(f"📊 Found {len(user_ids)} users")
+
+            table = TranslationDailyStat.__table__
+            day = func.date(Translation.timestamp)
+            rows_written = 0
+            for start in range(0, len(user_ids), batch_size):
+                batch = user_ids[start:start + batch_size]
+                # Each batch of users is rebuilt in one transaction
+                db.session.execute(table.delete().where(table.c.user_id.in_(batch)))
+                grouped = db.session.query(
+                    Translation.user_id,
+                    day,
+                    func.coalesce(Translation.detected_language, ''),
+                    func.coalesce(Translation.target_language, ''),
+                    func.count(Translation.id),
+                    func.coalesce(func.sum(func.length(Translation.original_text)), 0)
+                ).filter(Translation.user_id.in_(batch)).group_by(
+                    Translation.user_id,
+                    day,
+                    Translation.detected_language,
+                    Translation.target_language
+                ).all()
+
+                # NULL and '' languages share a rollup row
+                rows = {}
+                for user_id, stat_day, source_language, target_language, count, chars in grouped:
+                    if isinstance(stat_day, str):
+                        stat_day = date.fromisoformat(stat_day[:10])
+                    key = (user_id, stat_day, source_language, target_language)
+                    current = rows.get(key, (0, 0))
+                    rows[key] = (current[0] + count, current[1] + chars)
+                if rows:
+                    db.session.execute(table.insert(), [
+                        {
+                            'user_id': user_id,
+                            'day': stat_day,
+                            'source_language': source_language,
+                            'target_language': target_language,
+                            'count': count,
+                            'chars': chars
+                        }
+                        for (user_id, stat_day, source_language, target_language), (count, chars) in rows.items()
+                    ])
+                db.session.commit()
+                rows_written += len(rows)
+                print(f"✅ Users {start + 1}-{start + len(batch)}: {len(rows)} rollup rows")
+
+            print(f"\n✅ Backfill completed: {rows_written} rollup rows written")
+            return True
+
+        except Exception as e:
+            db.session.rollback()
+            print(f"❌ Backfill failed: {str(e)}")
+            import traceback
+            traceback.print_exc()
+            return False
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Rebuild the translation_daily_stats rollup')
+    parser.add_argument('--batch-size', type=int, default=500, help='users per transaction')
+    args = parser.parse_args()
+
+    print("🚀 Starting backfill: translation_daily_stats")
+    print("-" * 60)
+
+    if backfill_translation_daily_stats(args.batch_size):
+        print("-" * 60)
+        print("✅ Backfill completed successfully!")
+    else:
+        print("-" * 60)
+        print("❌ Backfill failed!")
+        exit(1)
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Benchmark audio extraction from video for Whisper
+Usage: python benchmark_audio_extraction.py [clip.mp4] [--runs 3] [--max-seconds 60]
+
+Compares the old upload_video path (ffmpeg defaults → full-rate WAV on disk,
+then Whisper's own ffmpeg pass to resample it) with media_core's audio-only
+extraction: demux the audio stream, downmix/resample to 16 kHz mono in one
+pass, either streamed to stdout or written to a WAV.
+Without a clip, a 5 minute 720p test video with a tone is generated.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from media_core import decode_audio, extract_audio, resolve_ffmpeg
+
+_local_ffmpeg = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bin', 'ffmpeg')
+
+
+def make_sample(ffmpeg, path, seconds=300):
+    """Generate a 720p H.264 + stereo AAC test clip"""
+    subprocess.run([
+        ffmpeg, '-nostdin', '-y', '-loglevel', 'error',
+        '-f', 'lavfi', '-i', f'testsrc=size=1280x720:rate=30:duration={seconds}',
+        '-f', 'lavfi', '-i', f'sine=frequency=440:sample_rate=48000:duration={seconds}',
+        '-ac', '2', '-c:v', 'libx264', '-preset', 'ultrafast', '-c:a', 'aac', '-shortest', path
+    ], check=True)
+
+
+def legacy(ffmpeg, clip, workdir, max_seconds):
+    """Old path: ffmpeg defaults to WAV, then re-decode to 16 kHz mono like whisper.load_audio"""
+    wav = os.path.join(workdir, 'legacy.wav')
+    cap = ['-t', str(max_seconds)] if max_seconds else []
+    subprocess.run([ffmpeg, '-nostdin', '-y', '-loglevel', 'error', *cap, '-i', clip, wav], check=True)
+    size = os.path.getsize(wav)
+    decode_audio(wav, ffmpeg=ffmpeg)
+    os.remove(wav)
+    return size
+
+
+def audio_only_pipe(ffmpeg, clip, workdir, max_seconds):
+    pcm = decode_audio(clip, ffmpeg=ffmpeg, max_seconds=max_seconds)
+    return pcm.nbytes // 2  # s16le bytes that crossed the pipe
+
+
+def audio_only_wav(ffmpeg, clip, workdir, max_seconds):
+    wav = extract_audio(clip, os.path.join(workdir, 'extract.wav'), ffmpeg=ffmpeg, max_seconds=max_seconds)
+    size = os.path.getsize(wav)
+    os.remove(wav)
+    return size
+
+
+MODES = [
+    ('legacy (wav + resample)', legacy),
+    ('audio-only → stdout', audio_only_pipe),
+    ('audio-only → 16k wav', audio_only_wav),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('clip', nargs='?')
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('--max-seconds', type=float, default=None)
+    args = parser.parse_args()
+
+    ffmpeg = resolve_ffmpeg(_local_ffmpeg)
+    with tempfile.TemporaryDirectory() as workdir:
+        clip = args.clip
+        if not clip:
+            clip = os.path.join(workdir, 'sample.mp4')
+            print("🎬 Generating a 5 minute 720p sample clip...")
+            make_sample(ffmpeg, clip)
+
+        print(f"🚀 Audio extraction benchmark: {os.path.basename(clip)} ({os.path.getsize(clip) / 1e6:.1f} MB)")
+        print("-" * 64)
+        print(f"{'mode':<26}{'median s':>10}{'min s':>10}{'output MB':>12}{'speedup':>9}")
+        baseline = None
+        for name, run in MODES:
+            timings = []
+            for _ in range(args.runs):
+                started = time.perf_counter()
+                size = run(ffmpeg, clip, workdir, args.max_seconds)
+                timings.append(time.perf_counter() - started)
+            median = statistics.median(timings)
+            baseline = baseline or median
+            print(f"{name:<26}{median:>10.2f}{min(timings):>10.2f}{size / 1e6:>12.1f}{baseline / median:>8.2f}x")
+        print("-" * 64)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Measure how long `import app` takes in a fresh interpreter
+Usage: python benchmark_import_time.py [--runs 5] [--module app] [--top 15] [--max-seconds 3]
+
+Every run is a new subprocess, so nothing is cached between runs apart from
+the OS page cache. With --top the slowest modules from `python -X importtime`
+are listed, which makes it easy to spot a heavy library (torch, whisper,
+transformers, ...) that slipped back into module scope. With --max-seconds
+the script exits with status 1 when the median is above the limit, so it
+can run as a CI check.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# Libraries that must only be imported when a feature needs them
+HEAVY_MODULES = ('torch', 'whisper', 'transformers', 'gtts', 'ffmpeg')
+
+
+def time_import(module):
+    """Wall-clock seconds for a fresh interpreter to import `module`"""
+    started = time.perf_counter()
+    subprocess.run(
+        [sys.executable, '-c', f'import {module}'],
+        cwd=ROOT, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    return time.perf_counter() - started
+
+
+def heavy_modules_loaded(module):
+    """Which of HEAVY_MODULES end up in sys.modules after importing `module`"""
+    code = (
+        f'import sys, {module}\n'
+        f'print(",".join(m for m in {HEAVY_MODULES!r} if m in sys.modules))'
+    )
+    output = subprocess.run(
+        [sys.executable, '-c', code],
+        cwd=ROOT, check=True, capture_output=True, text=True,
+    ).stdout.strip()
+    return [name for name in output.split(',') if name]
+
+
+def slowest_imports(module, top):
+    """(cumulative seconds, module) for the slowest imports, from -X importtime"""
+    stderr = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=ROOT, check=True, capture_output=True, text=True,
+    ).stderr
+    rows = []
+    # Lines look like: "import time:   self [us] | cumulative | imported package"
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|', 2)
+        rows.append((int(cumulative) / 1e6, name.strip()))
+    rows.sort(reverse=True)
+    return rows[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--module', default='app')
+    parser.add_argument('--top', type=int, default=15, help='list the N slowest imports (0 to skip)')
+    parser.add_argument('--max-seconds', type=float, default=None, help='fail if the median is above this')
+    args = parser.parse_args()
+
+    print(f"🚀 Import time benchmark: import {args.module}")
+    print("-" * 60)
+    timings = []
+    for run in range(1, args.runs + 1):
+        seconds = time_import(args.module)
+        timings.append(seconds)
+        print(f"run {run:<3}{seconds:>10.2f} s")
+    median = statistics.median(timings)
+    print("-" * 60)
+    print(f"median {median:.2f} s   min {min(timings):.2f} s   max {max(timings):.2f} s")
+
+    loaded = heavy_modules_loaded(args.module)
+    if loaded:
+        print(f"⚠️  Heavy modules imported at module scope: {', '.join(loaded)}")
+    else:
+        print("✅ No heavy ML/media modules imported at module scope")
+
+    if args.top:
+        print("-" * 60)
+        print(f"{'cumulative s':>12}  module")
+        for seconds, name in slowest_imports(args.module, args.top):
+            print(f"{seconds:>12.3f}  {name}")
+
+    if args.max_seconds is not None and median > args.max_seconds:
+        print(f"❌ Median import time {median:.2f} s is above {args.max_seconds:g} s")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
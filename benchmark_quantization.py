@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Benchmark fp32 vs int8 dynamic quantization for the CPU transformer models
+Usage: python benchmark_quantization.py [--runs 5] [--models summarizer,dialogpt,mt5]
+
+Each model is loaded twice (MODEL_QUANTIZATION=none, then int8) through the
+same ai_core.runtime helpers the app uses, and the script reports median
+generation latency, weight size and resident memory growth.
+"""
+
+import argparse
+import gc
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+SAMPLE_TEXT = (
+    "The city council met on Tuesday to discuss the new public transport plan. "
+    "Members agreed to extend two bus lines, add night services on weekends and "
+    "review ticket prices after a six month trial. Residents will be able to "
+    "comment on the proposal online until the end of the month."
+)
+
+
+def rss_mb():
+    """Current resident set size in MB (Linux /proc, falls back to ru_maxrss)"""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def weights_mb(model):
+    """Approximate size of parameters and buffers, including packed int8 weights"""
+    import torch
+    total = 0
+    for tensor in list(model.parameters()) + list(model.buffers()):
+        total += tensor.numel() * tensor.element_size()
+    for module in model.modules():
+        packed = getattr(module, '_packed_params', None)
+        if packed is not None:
+            try:
+                weight, bias = packed._weight_bias()
+                total += weight.numel() * weight.element_size()
+                if bias is not None:
+                    total += bias.numel() * bias.element_size()
+            except Exception:
+                pass
+    return total / (1024 * 1024)
+
+
+def load_summarizer():
+    from transformers import pipeline
+    from ai_core.runtime import prepare_pipeline
+    pipe = prepare_pipeline(pipeline("text2text-generation", model="google/flan-t5-small"))
+    return pipe.model, lambda: pipe(f"summarize: {SAMPLE_TEXT}", max_length=70, min_length=25, do_sample=False)
+
+
+def load_mt5():
+    from transformers import pipeline
+    from ai_core.runtime import prepare_pipeline
+    pipe = prepare_pipeline(pipeline("text2text-generation", model="google/mt5-small"))
+    return pipe.model, lambda: pipe(f"summarize: {SAMPLE_TEXT}", max_length=120, min_length=40, do_sample=False)
+
+
+def load_dialogpt():
+    from transformers import AutoModelForCausalLM, AutoTokenizer
+    from ai_core.runtime import optimize_model
+    tokenizer = AutoTokenizer.from_pretrained("microsoft/DialoGPT-medium")
+    model = optimize_model(AutoModelForCausalLM.from_pretrained("microsoft/DialoGPT-medium", use_safetensors=True))
+    input_ids = tokenizer.encode("How do I translate a contract?" + tokenizer.eos_token, return_tensors="pt")
+    return model, lambda: model.generate(input_ids, max_length=60, pad_token_id=tokenizer.eos_token_id)
+
+
+LOADERS = {
+    'summarizer': load_summarizer,
+    'dialogpt': load_dialogpt,
+    'mt5': load_mt5,
+}
+
+
+def benchmark(name, mode, runs):
+    """Load one model in the given quantization mode and time it"""
+    from ai_core.runtime import inference_context
+    os.environ['MODEL_QUANTIZATION'] = mode
+    gc.collect()
+    rss_before = rss_mb()
+    started = time.perf_counter()
+    model, run = LOADERS[name]()
+    load_seconds = time.perf_counter() - started
+
+    with inference_context():
+        run()  # warm-up
+        timings = []
+        for _ in range(runs):
+            t0 = time.perf_counter()
+            run()
+            timings.append(time.perf_counter() - t0)
+
+    result = {
+        'model': name,
+        'mode': mode,
+        'load_s': load_seconds,
+        'median_ms': statistics.median(timings) * 1000,
+        'weights_mb': weights_mb(model),
+        'rss_growth_mb': rss_mb() - rss_before,
+    }
+    del model, run
+    gc.collect()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--models', default=','.join(LOADERS))
+    args = parser.parse_args()
+
+    print("🚀 Quantization benchmark (CPU)")
+    print("-" * 78)
+    print(f"{'model':<12}{'mode':<7}{'load s':>9}{'median ms':>12}{'weights MB':>13}{'RSS +MB':>10}{'speedup':>10}")
+    for name in [m.strip() for m in args.models.split(',') if m.strip() in LOADERS]:
+        baseline = benchmark(name, 'none', args.runs)
+        quantized = benchmark(name, 'int8', args.runs)
+        for row in (baseline, quantized):
+            speedup = baseline['median_ms'] / row['median_ms'] if row['median_ms'] else 0
+            print(
+                f"{row['model']:<12}{row['mode']:<7}{row['load_s']:>9.1f}{row['median_ms']:>12.0f}"
+                f"{row['weights_mb']:>13.0f}{row['rss_growth_mb']:>10.0f}{speedup:>9.2f}x"
+            )
+    print("-" * 78)
+    print("💡 RSS growth is measured in one process, so later rows include allocator reuse.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""
+Gunicorn configuration for the Translation App
+Usage: gunicorn -c gunicorn.conf.py app:app
+
+Warm-up policy (see WARMUP_MODELS / WARMUP_INFERENCE):
+- GUNICORN_PRELOAD=true: the app is imported once in the master, which loads
+  the warm-up models before forking. Workers then share the model weights
+  copy-on-write instead of each loading its own copy. The dummy inference
+  runs in each worker after the fork; torch thread pools are not fork-safe,
+  so no inference runs in the master.
+- GUNICORN_PRELOAD=false (default): every worker loads and warms the models
+  in a background thread right after it starts.
+"""
+
+import gc
+import os
+import threading
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+# One worker, as with plain `gunicorn app:app`: every extra worker keeps its
+# own Whisper/Marian/summarizer weights, so raise WEB_CONCURRENCY only when
+# the dyno has memory for another copy of the models
+workers = int(os.getenv('WEB_CONCURRENCY', '1'))
+threads = int(os.getenv('GUNICORN_THREADS', '1'))
+# Above gunicorn's 30 s default: a synchronous upload can spend longer in Whisper
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '120'))
+preload_app = os.getenv('GUNICORN_PRELOAD', 'false').lower() == 'true'
+
+
+def when_ready(server):
+    """Master is up; with preload_app, load the weights here so forked workers share them"""
+    if not preload_app:
+        return
+    from app import warm_up_models
+
+    server.log.info("Warming up models in the master before forking workers")
+    warm_up_models(inference=False)
+    # Move everything allocated so far out of the GC's generations, so
+    # collections in the workers do not touch (and un-share) those pages
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    """Connections opened in the master must not be shared with the workers"""
+    if not preload_app:
+        return
+    from app import app, db
+
+    with app.app_context():
+        db.engine.dispose()
+
+
+def post_worker_init(worker):
+    """Resume background jobs and warm up in the background, so the worker starts answering health checks at once"""
+    from app import app, start_inline_job_workers, warm_up_models
+
+    # Jobs queued (or leased) before a restart do not wait for the next upload
+    start_inline_job_workers()
+
+    if not app.config['WARMUP_MODELS']:
+        return
+    threading.Thread(target=warm_up_models, name="warmup", daemon=True).start()
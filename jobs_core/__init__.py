@@ -0,0 +1,2 @@
+from .queue import CANCELLED, FAILED, QUEUED, RUNNING, SUCCEEDED, Job, JobQueue, QueueFull
+from .worker import JobCancelled, JobContext, JobWorker, PermanentJobError
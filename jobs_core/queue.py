@@ -0,0 +1,314 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+# Job states
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+FINAL_STATES = (SUCCEEDED, FAILED, CANCELLED)
+
+
+class QueueFull(Exception):
+    """Raised when a user already has the maximum number of pending jobs."""
+
+
+@dataclass
+class Job:
+    id: str
+    user_id: Optional[int]
+    kind: str
+    status: str
+    payload: Dict[str, Any]
+    result: Optional[Dict[str, Any]]
+    error: Optional[str]
+    attempts: int
+    max_attempts: int
+    cancel_requested: bool
+    created_at: float
+    started_at: Optional[float]
+    finished_at: Optional[float]
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINAL_STATES
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "attempts": self.attempts,
+            "max_attempts": self.max_attempts,
+            "cancel_requested": self.cancel_requested,
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+_COLUMNS = (
+    "id, user_id, kind, status, payload, result, error, attempts, max_attempts, "
+    "cancel_requested, created_at, started_at, finished_at"
+)
+
+
+def _row_to_job(row) -> Job:
+    return Job(
+        id=row[0],
+        user_id=row[1],
+        kind=row[2],
+        status=row[3],
+        payload=json.loads(row[4]) if row[4] else {},
+        result=json.loads(row[5]) if row[5] else None,
+        error=row[6],
+        attempts=row[7],
+        max_attempts=row[8],
+        cancel_requested=bool(row[9]),
+        created_at=row[10],
+        started_at=row[11],
+        finished_at=row[12],
+    )
+
+
+class JobQueue:
+    """
+    Durable job queue in a SQLite file shared by the web workers and the
+    background workers on the host.
+    Claiming is a single IMMEDIATE transaction, so two workers never take the
+    same job. Running jobs hold a lease; a job whose worker died is re-queued
+    by expire_leases() once its lease expires. `user_concurrency` caps how many jobs of one user
+    run at the same time.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_attempts: int = 3,
+        lease_seconds: float = 900.0,
+        retry_delay: float = 10.0,
+        user_concurrency: int = 1,
+        user_max_pending: int = 10,
+        keep_seconds: float = 7 * 24 * 3600,
+    ):
+        self.path = path
+        self.max_attempts = max_attempts
+        self.lease_seconds = lease_seconds
+        self.retry_delay = retry_delay
+        self.user_concurrency = user_concurrency
+        self.user_max_pending = user_max_pending
+        self.keep_seconds = keep_seconds
+        self._local = threading.local()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        if not os.path.exists(directory):
+            os.makedirs(directory, exist_ok=True)
+        conn = self._connect()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            " id TEXT PRIMARY KEY,"
+            " user_id INTEGER,"
+            " kind TEXT NOT NULL,"
+            " status TEXT NOT NULL,"
+            " payload TEXT,"
+            " result TEXT,"
+            " error TEXT,"
+            " attempts INTEGER NOT NULL DEFAULT 0,"
+            " max_attempts INTEGER NOT NULL,"
+            " cancel_requested INTEGER NOT NULL DEFAULT 0,"
+            " available_at REAL NOT NULL,"
+            " lease_until REAL,"
+            " created_at REAL NOT NULL,"
+            " started_at REAL,"
+            " finished_at REAL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status_available ON jobs(status, available_at)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_user_status ON jobs(user_id, status)")
+
+    def _connect(self) -> sqlite3.Connection:
+        # Per thread and per process, like the translation cache
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and getattr(self._local, "pid", None) == os.getpid():
+            return conn
+        conn = sqlite3.connect(self.path, timeout=10, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        self._local.conn = conn
+        self._local.pid = os.getpid()
+        return conn
+
+    def enqueue(self, kind: str, payload: Dict[str, Any], user_id: Optional[int] = None) -> Job:
+        conn = self._connect()
+        now = time.time()
+        job_id = uuid.uuid4().hex
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if user_id is not None and self.user_max_pending:
+                (pending,) = conn.execute(
+                    "SELECT COUNT(*) FROM jobs WHERE user_id = ? AND status IN (?, ?)",
+                    (user_id, QUEUED, RUNNING),
+                ).fetchone()
+                if pending >= self.user_max_pending:
+                    raise QueueFull(f"User already has {pending} pending jobs")
+            conn.execute(
+                "INSERT INTO jobs (id, user_id, kind, status, payload, max_attempts, available_at, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (job_id, user_id, kind, QUEUED, json.dumps(payload), self.max_attempts, now, now),
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return self.get(job_id)
+
+    def get(self, job_id: str) -> Optional[Job]:
+        row = self._connect().execute(f"SELECT {_COLUMNS} FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return _row_to_job(row) if row else None
+
+    def expire_leases(self) -> List[Job]:
+        """
+        Re-queue running jobs whose lease expired (the worker died mid-job).
+        A job that keeps killing its worker (OOM, crash in ffmpeg/Whisper)
+        fails once out of attempts; those jobs are returned so the caller can
+        run its cleanup for them.
+        """
+        conn = self._connect()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            failed_ids = [
+                row[0] for row in conn.execute(
+                    "SELECT id FROM jobs WHERE status = ? AND lease_until < ? AND attempts >= max_attempts",
+                    (RUNNING, now),
+                ).fetchall()
+            ]
+            conn.executemany(
+                "UPDATE jobs SET status = ?, lease_until = NULL, finished_at = ?, "
+                " error = 'Worker stopped responding; no attempts left' "
+                "WHERE id = ?",
+                [(FAILED, now, job_id) for job_id in failed_ids],
+            )
+            conn.execute(
+                "UPDATE jobs SET status = ?, lease_until = NULL, available_at = ?, "
+                " error = 'Worker stopped responding' "
+                "WHERE status = ? AND lease_until < ?",
+                (QUEUED, now, RUNNING, now),
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return [job for job in map(self.get, failed_ids) if job is not None]
+
+    def claim(self) -> Optional[Job]:
+        """
+        Take the oldest runnable job whose user is under the concurrency limit.
+        Expired leases are not handled here; call expire_leases() first.
+        """
+        conn = self._connect()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT id FROM jobs AS j WHERE j.status = ? AND j.available_at <= ? "
+                " AND (j.user_id IS NULL OR ? <= 0 OR ("
+                "  SELECT COUNT(*) FROM jobs AS r WHERE r.user_id = j.user_id AND r.status = ?) < ?) "
+                "ORDER BY j.created_at LIMIT 1",
+                (QUEUED, now, self.user_concurrency, RUNNING, self.user_concurrency),
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = ?, attempts = attempts + 1, started_at = ?, lease_until = ? "
+                "WHERE id = ?",
+                (RUNNING, now, now + self.lease_seconds, row[0]),
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return self.get(row[0])
+
+    def complete(self, job_id: str, result: Dict[str, Any]) -> None:
+        self._connect().execute(
+            "UPDATE jobs SET status = ?, result = ?, error = NULL, lease_until = NULL, finished_at = ? "
+            "WHERE id = ? AND status = ?",
+            (SUCCEEDED, json.dumps(result, ensure_ascii=False), time.time(), job_id, RUNNING),
+        )
+
+    def fail(self, job_id: str, error: str, retry: bool = True) -> Job:
+        """Re-queue with a growing delay while attempts remain, otherwise mark failed."""
+        conn = self._connect()
+        now = time.time()
+        job = self.get(job_id)
+        if job is not None and retry and job.attempts < job.max_attempts and not job.cancel_requested:
+            conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, lease_until = NULL, available_at = ? "
+                "WHERE id = ? AND status = ?",
+                (QUEUED, error, now + self.retry_delay * job.attempts, job_id, RUNNING),
+            )
+        else:
+            conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, lease_until = NULL, finished_at = ? "
+                "WHERE id = ? AND status = ?",
+                (FAILED, error, now, job_id, RUNNING),
+            )
+        return self.get(job_id)
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        """
+        Queued jobs are cancelled at once; running jobs are flagged and stop at
+        the worker's next checkpoint.
+        """
+        conn = self._connect()
+        now = time.time()
+        conn.execute(
+            "UPDATE jobs SET status = ?, finished_at = ?, cancel_requested = 1 WHERE id = ? AND status = ?",
+            (CANCELLED, now, job_id, QUEUED),
+        )
+        conn.execute(
+            "UPDATE jobs SET cancel_requested = 1 WHERE id = ? AND status = ?",
+            (job_id, RUNNING),
+        )
+        return self.get(job_id)
+
+    def mark_cancelled(self, job_id: str) -> None:
+        self._connect().execute(
+            "UPDATE jobs SET status = ?, lease_until = NULL, finished_at = ? WHERE id = ? AND status = ?",
+            (CANCELLED, time.time(), job_id, RUNNING),
+        )
+
+    def cancel_requested(self, job_id: str) -> bool:
+        row = self._connect().execute("SELECT cancel_requested FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return bool(row and row[0])
+
+    def heartbeat(self, job_id: str) -> None:
+        """Extend a running job's lease."""
+        self._connect().execute(
+            "UPDATE jobs SET lease_until = ? WHERE id = ? AND status = ?",
+            (time.time() + self.lease_seconds, job_id, RUNNING),
+        )
+
+    def prune(self) -> int:
+        """Forget finished jobs older than keep_seconds."""
+        cur = self._connect().execute(
+            "DELETE FROM jobs WHERE status IN (?, ?, ?) AND finished_at < ?",
+            (*FINAL_STATES, time.time() - self.keep_seconds),
+        )
+        return cur.rowcount
+
+    def stats(self) -> Dict[str, int]:
+        rows = self._connect().execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        counts = {status: 0 for status in (QUEUED, RUNNING, *FINAL_STATES)}
+        counts.update({status: count for status, count in rows})
+        return counts
@@ -0,0 +1,152 @@
+import contextlib
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from .queue import Job, JobQueue
+
+logger = logging.getLogger(__name__)
+
+
+class JobCancelled(Exception):
+    """Raised at a checkpoint when the job's owner asked to cancel it."""
+
+
+class PermanentJobError(Exception):
+    """A failure that retrying cannot fix (bad media, no speech, ...)."""
+
+
+class JobContext:
+    """Handed to handlers so long stages can extend the lease and honour cancellation."""
+
+    def __init__(self, queue: JobQueue, job: Job):
+        self.queue = queue
+        self.job = job
+
+    def checkpoint(self) -> None:
+        self.queue.heartbeat(self.job.id)
+        if self.queue.cancel_requested(self.job.id):
+            raise JobCancelled(self.job.id)
+
+
+Handler = Callable[[Job, JobContext], Dict[str, Any]]
+
+
+class JobWorker:
+    """
+    Polls the queue and runs jobs through the handler registered for their kind.
+    `context` wraps each job (e.g. a Flask app context); `on_finished` runs once
+    a job reaches a final state, e.g. to delete its uploaded file.
+    """
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        handlers: Dict[str, Handler],
+        poll_interval: float = 1.0,
+        context: Optional[Callable[[], Any]] = None,
+        on_finished: Optional[Callable[[Job], None]] = None,
+    ):
+        self.queue = queue
+        self.handlers = handlers
+        self.poll_interval = poll_interval
+        self.context = context or contextlib.nullcontext
+        self.on_finished = on_finished
+        self._threads: List[threading.Thread] = []
+        self._pid: Optional[int] = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def _keep_lease(self, job_id: str):
+        """Renew the job's lease from a timer thread while the handler runs."""
+        done = threading.Event()
+        interval = max(self.queue.lease_seconds / 3.0, 0.01)
+
+        def renew():
+            while not done.wait(interval):
+                try:
+                    self.queue.heartbeat(job_id)
+                except Exception as exc:
+                    logger.warning("Heartbeat for job %s failed: %s", job_id, exc)
+
+        thread = threading.Thread(target=renew, name=f"job-heartbeat-{job_id[:8]}", daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            done.set()
+            thread.join()
+
+    def _finished(self, job: Job) -> None:
+        if self.on_finished is None:
+            return
+        try:
+            self.on_finished(job)
+        except Exception as exc:
+            logger.warning("Cleanup for job %s failed: %s", job.id, exc)
+
+    def run_once(self) -> bool:
+        """Run one job if any is runnable; returns whether a job was taken."""
+        # Jobs whose worker died on the last attempt never come back through
+        # a handler, so their cleanup runs here
+        for expired in self.queue.expire_leases():
+            logger.warning("Job %s (%s) failed: %s", expired.id, expired.kind, expired.error)
+            self._finished(expired)
+        job = self.queue.claim()
+        if job is None:
+            return False
+        handler = self.handlers.get(job.kind)
+        started = time.monotonic()
+        try:
+            if handler is None:
+                raise PermanentJobError(f"No handler for job kind {job.kind}")
+            # Long stages (a transcription can outlast the lease) keep the job
+            # leased even between checkpoints
+            with self._keep_lease(job.id), self.context():
+                result = handler(job, JobContext(self.queue, job))
+            self.queue.complete(job.id, result)
+            logger.info("Job %s (%s) succeeded in %.1fs", job.id, job.kind, time.monotonic() - started)
+        except JobCancelled:
+            self.queue.mark_cancelled(job.id)
+            logger.info("Job %s (%s) cancelled", job.id, job.kind)
+        except PermanentJobError as exc:
+            self.queue.fail(job.id, str(exc), retry=False)
+            logger.warning("Job %s (%s) failed: %s", job.id, job.kind, exc)
+        except Exception as exc:
+            job = self.queue.fail(job.id, str(exc))
+            logger.error("Job %s (%s) attempt %s failed: %s", job.id, job.kind, job.attempts, exc, exc_info=True)
+
+        final = self.queue.get(job.id)
+        if final is not None and final.finished:
+            self._finished(final)
+        return True
+
+    def run_forever(self) -> None:
+        while not self._stop.is_set():
+            try:
+                busy = self.run_once()
+            except Exception as exc:
+                logger.error("Job worker error: %s", exc, exc_info=True)
+                busy = False
+            if not busy:
+                self._stop.wait(self.poll_interval)
+
+    def start(self, threads: int = 1) -> None:
+        """Start background threads in this process (idempotent, fork-aware)."""
+        with self._lock:
+            if self._pid == os.getpid() and any(t.is_alive() for t in self._threads):
+                return
+            self._pid = os.getpid()
+            self._stop.clear()
+            self._threads = [
+                threading.Thread(target=self.run_forever, name=f"job-worker-{i}", daemon=True)
+                for i in range(threads)
+            ]
+            for thread in self._threads:
+                thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
@@ -0,0 +1,6 @@
+from .audio import SAMPLE_RATE, decode_audio, duration_seconds, extract_audio, resolve_ffmpeg
+from .chunking import AudioWindow, join_segments, plan_windows, stitch_segments
+from .hashing import read_and_hash, save_and_hash, transcript_key
+from .parallel import ParallelTranscriber
+from .selection import WHISPER_SIZES, ModelChoice, WhisperModelPolicy, to_whisper_language
+from .vad import SpeechDetection, TimestampMap, compact_speech, detect_speech, remap_segments
@@ -0,0 +1,129 @@
+import os
+import shutil
+import subprocess
+import tempfile
+from typing import Any, Optional, Union
+
+# Whisper works on 16 kHz mono float32 PCM
+SAMPLE_RATE = 16000
+
+AudioSource = Union[str, bytes, Any]  # path, raw bytes or a readable stream
+
+
+def resolve_ffmpeg(local_path: Optional[str] = None) -> str:
+    """Prefer a bundled ffmpeg binary, then the one on PATH."""
+    if local_path and os.path.exists(local_path) and os.access(local_path, os.X_OK):
+        return local_path
+    found = shutil.which("ffmpeg")
+    if not found:
+        raise RuntimeError("ffmpeg is not installed or not in PATH")
+    return found
+
+
+def pcm_to_float32(raw: bytes):
+    """s16le bytes -> float32 numpy array in [-1, 1]."""
+    import numpy as np
+
+    return np.frombuffer(raw, np.int16).flatten().astype(np.float32) / 32768.0
+
+
+def _run_ffmpeg(command, stdin_data: Optional[bytes] = None) -> bytes:
+    try:
+        completed = subprocess.run(
+            command,
+            input=stdin_data,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            check=True,
+        )
+    except subprocess.CalledProcessError as exc:
+        message = exc.stderr.decode("utf-8", "ignore").strip().splitlines()
+        raise RuntimeError(f"ffmpeg failed to decode audio: {message[-1] if message else exc}") from exc
+    return completed.stdout
+
+
+def _input_args(max_seconds: Optional[float]) -> list:
+    # -t before -i stops ffmpeg reading the input after the cap
+    return ["-t", f"{max_seconds:g}"] if max_seconds else []
+
+
+# Demux only the first audio stream (no video/subtitle/data decoding) and
+# downmix + resample to 16 kHz mono s16le in the same pass
+def _output_args(sample_rate: int) -> list:
+    return [
+        "-map", "0:a:0", "-vn", "-sn", "-dn",
+        "-ac", "1", "-ar", str(sample_rate), "-acodec", "pcm_s16le",
+    ]
+
+
+def decode_audio(
+    source: AudioSource,
+    ffmpeg: str = "ffmpeg",
+    sample_rate: int = SAMPLE_RATE,
+    max_seconds: Optional[float] = None,
+):
+    """
+    Decode any audio/video input to a 16 kHz mono float32 array in memory.
+    Only the first audio stream is demuxed, and PCM is streamed from ffmpeg's
+    stdout. Paths are read by ffmpeg directly; bytes and streams (e.g. an
+    upload's request stream) are piped through stdin, so nothing is written
+    to disk. Containers that need seeking (e.g. mp4 with the index at the end)
+    cannot be decoded from a pipe; for those the bytes are spilled to a temp
+    file. `max_seconds` caps how much of the input is decoded.
+    """
+    output_args = [*_output_args(sample_rate), "-f", "s16le", "pipe:1"]
+
+    if isinstance(source, (str, os.PathLike)):
+        if not os.path.exists(source):
+            raise FileNotFoundError(f"Audio file not found: {source}")
+        command = [
+            ffmpeg, "-nostdin", "-threads", "0", *_input_args(max_seconds),
+            "-i", os.fspath(source), *output_args,
+        ]
+        return pcm_to_float32(_run_ffmpeg(command))
+
+    data = source if isinstance(source, (bytes, bytearray)) else source.read()
+    if not data:
+        raise ValueError("Empty audio input")
+    command = [ffmpeg, "-threads", "0", *_input_args(max_seconds), "-i", "pipe:0", *output_args]
+    try:
+        return pcm_to_float32(_run_ffmpeg(command, stdin_data=bytes(data)))
+    except RuntimeError:
+        fd, path = tempfile.mkstemp(suffix=".media")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            return decode_audio(path, ffmpeg=ffmpeg, sample_rate=sample_rate, max_seconds=max_seconds)
+        finally:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def extract_audio(
+    input_path: str,
+    output_path: Optional[str] = None,
+    ffmpeg: str = "ffmpeg",
+    sample_rate: int = SAMPLE_RATE,
+    max_seconds: Optional[float] = None,
+):
+    """
+    Audio-only extraction from a video (or any media) file.
+    With `output_path` a 16 kHz mono WAV is written there and the path is
+    returned; without it the PCM is streamed to stdout and returned as a
+    float32 array (same as decode_audio).
+    """
+    if output_path is None:
+        return decode_audio(input_path, ffmpeg=ffmpeg, sample_rate=sample_rate, max_seconds=max_seconds)
+    if not os.path.exists(input_path):
+        raise FileNotFoundError(f"Media file not found: {input_path}")
+    _run_ffmpeg([
+        ffmpeg, "-nostdin", "-y", "-threads", "0", *_input_args(max_seconds),
+        "-i", input_path, *_output_args(sample_rate), output_path,
+    ])
+    return output_path
+
+
+def duration_seconds(pcm, sample_rate: int = SAMPLE_RATE) -> float:
+    return len(pcm) / float(sample_rate)
@@ -0,0 +1,112 @@
+from dataclasses import dataclass
+from typing import Any, Dict, List, Sequence
+
+from .audio import SAMPLE_RATE
+
+# Frame length used to look for quiet cut points (20 ms)
+FRAME_SECONDS = 0.02
+
+
+@dataclass(frozen=True)
+class AudioWindow:
+    """
+    A slice of the decoded audio, in samples.
+    [start, end) is what gets transcribed (includes the overlap);
+    [keep_start, keep_end) is the part this window owns when stitching.
+    """
+    start: int
+    end: int
+    keep_start: int
+    keep_end: int
+
+    def offset_seconds(self, sample_rate: int = SAMPLE_RATE) -> float:
+        return self.start / float(sample_rate)
+
+
+def frame_energy(pcm, frame: int):
+    """RMS energy per frame of `frame` samples (the tail shorter than a frame is dropped)."""
+    import numpy as np
+
+    count = len(pcm) // frame
+    if count == 0:
+        return np.zeros(0, dtype=np.float32)
+    frames = pcm[: count * frame].reshape(count, frame)
+    return np.sqrt(np.mean(frames * frames, axis=1) + 1e-12)
+
+
+def plan_windows(
+    pcm,
+    sample_rate: int = SAMPLE_RATE,
+    window_seconds: float = 120.0,
+    overlap_seconds: float = 1.5,
+    search_seconds: float = 10.0,
+) -> List[AudioWindow]:
+    """
+    Split audio into ~window_seconds windows. Each cut is placed at the
+    quietest frame in the last `search_seconds` before the target length, so
+    windows end on pauses rather than mid-word where possible, and every
+    window is extended by `overlap_seconds` on both sides.
+    """
+    total = len(pcm)
+    window = int(window_seconds * sample_rate)
+    if total <= window * 1.25:
+        return [AudioWindow(0, total, 0, total)]
+
+    frame = max(1, int(FRAME_SECONDS * sample_rate))
+    energy = frame_energy(pcm, frame)
+    search = int(search_seconds * sample_rate)
+    overlap = int(overlap_seconds * sample_rate)
+
+    cuts = [0]
+    position = 0
+    while total - position > window * 1.25:
+        target = position + window
+        low = max(position + window // 2, target - search)
+        first, last = low // frame, max(low // frame + 1, target // frame)
+        quietest = first + int(energy[first:last].argmin())
+        cut = min(quietest * frame + frame // 2, total)
+        cuts.append(cut)
+        position = cut
+    cuts.append(total)
+
+    return [
+        AudioWindow(
+            start=max(0, keep_start - overlap),
+            end=min(total, keep_end + overlap),
+            keep_start=keep_start,
+            keep_end=keep_end,
+        )
+        for keep_start, keep_end in zip(cuts, cuts[1:])
+    ]
+
+
+def stitch_segments(
+    windows: Sequence[AudioWindow],
+    window_segments: Sequence[Sequence[Dict[str, Any]]],
+    sample_rate: int = SAMPLE_RATE,
+) -> List[Dict[str, Any]]:
+    """
+    Shift each window's segments to absolute timestamps and drop duplicates
+    from the overlaps: a segment belongs to the window whose owned range
+    contains its midpoint.
+    """
+    stitched = []
+    for window, segments in zip(windows, window_segments):
+        offset = window.offset_seconds(sample_rate)
+        keep_start = window.keep_start / float(sample_rate)
+        keep_end = window.keep_end / float(sample_rate)
+        for segment in segments:
+            start = offset + float(segment.get("start", 0.0))
+            end = offset + float(segment.get("end", 0.0))
+            middle = (start + end) / 2
+            if middle < keep_start or middle >= keep_end:
+                continue
+            text = (segment.get("text") or "").strip()
+            if text:
+                stitched.append({"start": round(start, 2), "end": round(end, 2), "text": text})
+    stitched.sort(key=lambda s: s["start"])
+    return stitched
+
+
+def join_segments(segments: Sequence[Dict[str, Any]]) -> str:
+    return " ".join(s["text"] for s in segments).strip()
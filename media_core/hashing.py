@@ -0,0 +1,36 @@
+import hashlib
+from typing import Any, BinaryIO, Tuple
+
+CHUNK_SIZE = 1024 * 1024
+
+
+def read_and_hash(stream: BinaryIO, chunk_size: int = CHUNK_SIZE) -> Tuple[bytes, str]:
+    """Read an upload stream into memory, hashing it chunk by chunk on the way."""
+    digest = hashlib.sha256()
+    chunks = []
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        digest.update(chunk)
+        chunks.append(chunk)
+    return b"".join(chunks), digest.hexdigest()
+
+
+def save_and_hash(stream: BinaryIO, path: str, chunk_size: int = CHUNK_SIZE) -> str:
+    """Copy an upload stream to `path`, hashing it in the same pass."""
+    digest = hashlib.sha256()
+    with open(path, "wb") as f:
+        while True:
+            chunk = stream.read(chunk_size)
+            if not chunk:
+                break
+            digest.update(chunk)
+            f.write(chunk)
+    return digest.hexdigest()
+
+
+def transcript_key(content_hash: str, model_name: str, **options: Any) -> str:
+    """Cache key for a transcript: the media's content hash plus everything that changes the output."""
+    extras = ",".join(f"{name}={options[name]}" for name in sorted(options) if options[name] is not None)
+    return f"{content_hash}:{model_name}" + (f":{extras}" if extras else "")
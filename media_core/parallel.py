@@ -0,0 +1,120 @@
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+from .chunking import AudioWindow
+
+logger = logging.getLogger(__name__)
+
+# Per worker process: Whisper models loaded so far, by name
+_worker_models: Dict[str, Any] = {}
+
+
+def _init_worker(threads: int) -> None:
+    try:
+        import torch
+
+        torch.set_num_threads(max(1, threads))
+    except ImportError:
+        pass
+
+
+def _transcribe_window(model_name: str, pcm, options: Dict[str, Any]) -> Dict[str, Any]:
+    model = _worker_models.get(model_name)
+    if model is None:
+        import whisper
+
+        model = whisper.load_model(model_name)
+        _worker_models[model_name] = model
+    result = model.transcribe(pcm, fp16=False, **options)
+    return {
+        "language": result.get("language"),
+        "segments": [
+            {"start": s["start"], "end": s["end"], "text": s["text"]}
+            for s in result.get("segments", [])
+        ],
+    }
+
+
+class ParallelTranscriber:
+    """
+    Transcribes audio windows across a pool of worker processes.
+    Each worker loads its own Whisper model on first use and keeps it, so the
+    pool is created once per web worker and reused between requests. Workers
+    are spawned (not forked) so they never inherit torch threads or locks
+    from the parent.
+    """
+
+    def __init__(self, workers: int, threads_per_worker: Optional[int] = None):
+        self.workers = workers
+        cpus = os.cpu_count() or 1
+        self.threads_per_worker = threads_per_worker or max(1, cpus // max(1, workers))
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.workers > 1
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None or self._pid != os.getpid():
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(self.threads_per_worker,),
+                )
+                self._pid = os.getpid()
+            return self._executor
+
+    def iter_transcribe(
+        self,
+        pcm,
+        windows: Sequence[AudioWindow],
+        model_name: str,
+        **options: Any,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Yield one result dict ({language, segments}) per window, in window
+        order, as soon as that window and all earlier ones are done.
+        Windows not yet started are cancelled if the caller stops iterating.
+        """
+        executor = self._get_executor()
+        futures = []
+        try:
+            futures = [
+                executor.submit(_transcribe_window, model_name, pcm[w.start:w.end], options)
+                for w in windows
+            ]
+            for future in futures:
+                yield future.result()
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM); start a fresh pool next time
+            logger.error("Transcription worker pool broke; it will be recreated")
+            self.close()
+            raise
+        finally:
+            for future in futures:
+                future.cancel()
+
+    def transcribe(
+        self,
+        pcm,
+        windows: Sequence[AudioWindow],
+        model_name: str,
+        **options: Any,
+    ) -> List[Dict[str, Any]]:
+        """One result dict ({language, segments}) per window, in window order."""
+        return list(self.iter_transcribe(pcm, windows, model_name, **options))
+
+    def close(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None and self._pid == os.getpid():
+            executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,81 @@
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
+
+# Ordered from fastest to most accurate
+WHISPER_SIZES = ("tiny", "base", "small")
+
+# Provider codes that Whisper spells differently
+_WHISPER_ALIASES = {"iw": "he", "zh-cn": "zh", "zh-tw": "zh"}
+
+
+def to_whisper_language(code: Optional[str]) -> Optional[str]:
+    """
+    Translation-provider language code (e.g. "en", "zh-CN", "iw") to the code
+    Whisper expects, or None when Whisper does not know the language.
+    """
+    if not code or code == "auto":
+        return None
+    code = code.strip().lower()
+    code = _WHISPER_ALIASES.get(code, code.split("-")[0])
+    try:
+        from whisper.tokenizer import LANGUAGES
+    except ImportError:
+        return code
+    return code if code in LANGUAGES else None
+
+
+@dataclass(frozen=True)
+class ModelChoice:
+    name: str
+    reason: str
+
+
+class WhisperModelPolicy:
+    """
+    Picks the Whisper model per request.
+    Fixed mode always returns `default`. Auto mode starts from the clip
+    duration (short clips can afford `small`, long ones fall back to `base`,
+    very long ones to `tiny`) and steps one size down for every `busy_depth`
+    transcriptions already running or queued, trading accuracy for
+    throughput under load.
+    """
+
+    def __init__(
+        self,
+        default: str = "base",
+        auto: bool = False,
+        sizes: Sequence[str] = WHISPER_SIZES,
+        small_max_seconds: float = 60.0,
+        base_max_seconds: float = 1800.0,
+        busy_depth: int = 4,
+    ):
+        self.default = default
+        self.auto = auto
+        self.sizes = [size for size in WHISPER_SIZES if size in sizes] or [default]
+        self.small_max_seconds = small_max_seconds
+        self.base_max_seconds = base_max_seconds
+        self.busy_depth = max(1, busy_depth)
+
+    def candidates(self) -> List[str]:
+        """Models this policy may pick, most accurate first."""
+        return list(reversed(self.sizes)) if self.auto else [self.default]
+
+    def choose(self, duration: float, queue_depth: int = 0) -> ModelChoice:
+        if not self.auto:
+            return ModelChoice(self.default, "fixed")
+
+        if duration <= self.small_max_seconds:
+            wanted = "small"
+        elif duration <= self.base_max_seconds:
+            wanted = "base"
+        else:
+            wanted = "tiny"
+        # Largest allowed size not above the wanted one
+        allowed = [s for s in self.sizes if WHISPER_SIZES.index(s) <= WHISPER_SIZES.index(wanted)] or self.sizes[:1]
+        index = len(allowed) - 1
+        steps = queue_depth // self.busy_depth
+        index = max(0, index - steps)
+        return ModelChoice(
+            allowed[index],
+            f"duration {duration:.0f}s, queue depth {queue_depth}" + (f", down {steps}" if steps else ""),
+        )
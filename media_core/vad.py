@@ -0,0 +1,148 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .audio import SAMPLE_RATE
+from .chunking import frame_energy
+
+
+@dataclass
+class TimestampMap:
+    """
+    Maps times in the compacted (speech-only) audio back to the original.
+    Each span is (compact_start, original_start, length) in samples.
+    """
+    spans: List[Tuple[int, int, int]] = field(default_factory=list)
+    sample_rate: int = SAMPLE_RATE
+
+    def to_original(self, seconds: float) -> float:
+        position = int(seconds * self.sample_rate)
+        original = position
+        for compact_start, original_start, length in self.spans:
+            if position < compact_start:
+                break
+            # Inside a span: shift; past it (in a padding gap): clamp to its end
+            original = original_start + min(position - compact_start, length)
+        return original / float(self.sample_rate)
+
+
+@dataclass
+class SpeechDetection:
+    regions: List[Tuple[int, int]]  # [start, end) in samples
+    total_samples: int
+    sample_rate: int = SAMPLE_RATE
+
+    @property
+    def has_speech(self) -> bool:
+        return bool(self.regions)
+
+    @property
+    def speech_seconds(self) -> float:
+        return sum(end - start for start, end in self.regions) / float(self.sample_rate)
+
+    @property
+    def total_seconds(self) -> float:
+        return self.total_samples / float(self.sample_rate)
+
+    @property
+    def skipped_seconds(self) -> float:
+        return max(0.0, self.total_seconds - self.speech_seconds)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "speech_seconds": round(self.speech_seconds, 2),
+            "skipped_seconds": round(self.skipped_seconds, 2),
+            "regions": len(self.regions),
+        }
+
+
+def detect_speech(
+    pcm,
+    sample_rate: int = SAMPLE_RATE,
+    frame_ms: int = 30,
+    threshold_db: Optional[float] = None,
+    margin_db: float = 12.0,
+    min_speech_ms: int = 200,
+    merge_gap_ms: int = 400,
+    padding_ms: int = 200,
+) -> SpeechDetection:
+    """
+    Energy-based voice activity detection.
+    A frame is voiced when its level is `margin_db` above the clip's noise
+    floor (10th percentile), clamped to [-50, -35] dBFS, unless an absolute
+    `threshold_db` is given. Voiced runs closer than `merge_gap_ms` are joined,
+    runs shorter than `min_speech_ms` are dropped and the rest are padded so
+    word onsets and tails are kept.
+    """
+    import numpy as np
+
+    frame = max(1, int(sample_rate * frame_ms / 1000))
+    energy = frame_energy(pcm, frame)
+    if len(energy) == 0:
+        return SpeechDetection([], len(pcm), sample_rate)
+
+    levels = 20 * np.log10(energy)
+    if threshold_db is None:
+        noise_floor = float(np.percentile(levels, 10))
+        threshold_db = min(max(noise_floor + margin_db, -50.0), -35.0)
+    voiced = levels > threshold_db
+
+    # Runs of voiced frames as [start, end) frame indices
+    edges = np.diff(np.concatenate(([0], voiced.astype(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+
+    merge_gap = merge_gap_ms / frame_ms
+    runs: List[List[int]] = []
+    for start, end in zip(starts.tolist(), ends.tolist()):
+        if runs and start - runs[-1][1] <= merge_gap:
+            runs[-1][1] = end
+        else:
+            runs.append([start, end])
+
+    min_frames = min_speech_ms / frame_ms
+    padding = int(sample_rate * padding_ms / 1000)
+    regions: List[Tuple[int, int]] = []
+    for start, end in runs:
+        if end - start < min_frames:
+            continue
+        region_start = max(0, start * frame - padding)
+        region_end = min(len(pcm), end * frame + padding)
+        if regions and region_start <= regions[-1][1]:
+            regions[-1] = (regions[-1][0], region_end)
+        else:
+            regions.append((region_start, region_end))
+    return SpeechDetection(regions, len(pcm), sample_rate)
+
+
+def compact_speech(pcm, detection: SpeechDetection, gap_ms: int = 200):
+    """
+    Concatenate the voiced regions, separated by `gap_ms` of silence so
+    Whisper still sees a pause between them. Returns (audio, TimestampMap).
+    """
+    import numpy as np
+
+    gap = np.zeros(int(detection.sample_rate * gap_ms / 1000), dtype=pcm.dtype)
+    pieces = []
+    spans = []
+    position = 0
+    for index, (start, end) in enumerate(detection.regions):
+        if index:
+            pieces.append(gap)
+            position += len(gap)
+        pieces.append(pcm[start:end])
+        spans.append((position, start, end - start))
+        position += end - start
+    audio = np.concatenate(pieces) if pieces else pcm[:0]
+    return audio, TimestampMap(spans, detection.sample_rate)
+
+
+def remap_segments(segments: Sequence[Dict[str, Any]], timestamp_map: TimestampMap) -> List[Dict[str, Any]]:
+    """Segments with start/end shifted from compacted to original timestamps."""
+    return [
+        {
+            **segment,
+            "start": round(timestamp_map.to_original(segment["start"]), 2),
+            "end": round(timestamp_map.to_original(segment["end"]), 2),
+        }
+        for segment in segments
+    ]
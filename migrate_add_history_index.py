@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Migration script to add a composite (user_id, timestamp, id) index to the translations table
+Run this script once on existing databases; new databases get the index from db.create_all()
+"""
+
+from app import app, db
+from sqlalchemy import text, inspect
+
+INDEX_NAME = 'idx_translations_user_timestamp'
+
+
+def migrate_add_history_index():
+    """Add the composite index used by /history pagination and history retention"""
+    with app.app_context():
+        try:
+            # Check if the index already exists
+            inspector = inspect(db.engine)
+            indexes = [index['name'] for index in inspector.get_indexes('translations')]
+
+            if INDEX_NAME in indexes:
+                print(f"✅ {INDEX_NAME} already exists on translations table")
+                return True
+
+            result = db.session.execute(text("SELECT COUNT(*) FROM translations"))
+            print(f"📊 Found {result.scalar()} existing translations")
+            db.session.commit()
+
+            # Step 1: Build the index without blocking inserts (PostgreSQL needs
+            # CONCURRENTLY outside a transaction, hence the autocommit connection)
+            print(f"Step 1: Creating {INDEX_NAME} on translations(user_id, timestamp, id)...")
+            with db.engine.connect() as connection:
+                connection = connection.execution_options(isolation_level='AUTOCOMMIT')
+                if db.engine.dialect.name == 'postgresql':
+                    connection.execute(text(f"""
+                        CREATE INDEX CONCURRENTLY IF NOT EXISTS {INDEX_NAME}
+                        ON translations(user_id, timestamp, id)
+                    """))
+                else:
+                    connection.execute(text(f"""
+                        CREATE INDEX IF NOT EXISTS {INDEX_NAME}
+                        ON translations(user_id, timestamp, id)
+                    """))
+            print(f"✅ {INDEX_NAME} created")
+
+            # Step 2: Refresh planner statistics so the new index is picked up
+            print("Step 2: Analyzing translations table...")
+            try:
+                db.session.execute(text("ANALYZE translations"))
+                db.session.commit()
+                print("✅ Statistics updated")
+            except Exception as e:
+                db.session.rollback()
+                print(f"ℹ️  Could not analyze translations: {e}")
+
+            # Verify the migration
+            inspector = inspect(db.engine)
+            indexes = [index['name'] for index in inspector.get_indexes('translations')]
+            if INDEX_NAME in indexes:
+                print(f"✅ Verification: {INDEX_NAME} exists")
+                return True
+            else:
+                print(f"❌ Verification failed: {INDEX_NAME} not found")
+                return False
+
+        except Exception as e:
+            db.session.rollback()
+            print(f"❌ Migration failed: {str(e)}")
+            import traceback
+            traceback.print_exc()
+            return False
+
+if __name__ == '__main__':
+    print("🚀 Starting migration: Add (user_id, timestamp) index to translations table")
+    print("-" * 60)
+
+    if migrate_add_history_index():
+        print("-" * 60)
+        print("✅ Migration completed successfully!")
+    else:
+        print("-" * 60)
+        print("❌ Migration failed!")
+        exit(1)
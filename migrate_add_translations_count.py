@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Migration script to add translations_count column to users table
+Run this script to update the database schema; the counter is then kept in sync by app.py
+"""
+
+from app import app, db
+from sqlalchemy import text, inspect
+
+def migrate_add_translations_count():
+    """Add translations_count column to users table and fill it from translations"""
+    with app.app_context():
+        try:
+            # Check if translations_count column already exists
+            inspector = inspect(db.engine)
+            columns = [col['name'] for col in inspector.get_columns('users')]
+
+            if 'translations_count' in columns:
+                print("ℹ️  translations_count column already exists, recounting...")
+            else:
+                print("🔄 Adding translations_count column to users table...")
+
+                # Step 1: Add the column with a default so existing rows get 0
+                print("Step 1: Adding translations_count column...")
+                db.session.execute(text("""
+                    ALTER TABLE users
+                    ADD COLUMN translations_count INTEGER NOT NULL DEFAULT 0
+                """))
+                db.session.commit()
+                print("✅ translations_count column added")
+
+            # Step 2: Count existing translations per user in one statement
+            print("Step 2: Counting existing translations per user...")
+            result = db.session.execute(text("""
+                UPDATE users
+                SET translations_count = COALESCE((
+                    SELECT COUNT(*) FROM translations
+                    WHERE translations.user_id = users.id
+                ), 0)
+            """))
+            db.session.commit()
+            print(f"✅ Updated translations_count for {result.rowcount} users")
+
+            print("\n✅ Migration completed successfully!")
+
+            # Verify the migration
+            inspector = inspect(db.engine)
+            columns = [col['name'] for col in inspector.get_columns('users')]
+            if 'translations_count' in columns:
+                print(f"✅ Verification: translations_count column exists")
+                return True
+            else:
+                print("❌ Verification failed: translations_count column not found")
+                return False
+
+        except Exception as e:
+            db.session.rollback()
+            print(f"❌ Migration failed: {str(e)}")
+            import traceback
+            traceback.print_exc()
+            return False
+
+if __name__ == '__main__':
+    print("🚀 Starting migration: Add translations_count to users table")
+    print("-" * 60)
+
+    if migrate_add_translations_count():
+        print("-" * 60)
+        print("✅ Migration completed successfully!")
+    else:
+        print("-" * 60)
+        print("❌ Migration failed!")
+        exit(1)
@@ -365,30 +365,91 @@ async function uploadAudioFile() {
     
     showLoading();
     
+    try {
+        // Segments are rendered as soon as each part of the file is transcribed
+        await streamMediaUpload('audio', file, targetLang);
+    } catch (error) {
+        showError('Network error: ' + error.message);
+    }
+}
+
+function parseSseEvent(raw) {
+    let type = 'message';
+    const data = [];
+    raw.split('\n').forEach(line => {
+        if (line.startsWith('event:')) {
+            type = line.slice(6).trim();
+        } else if (line.startsWith('data:')) {
+            data.push(line.slice(5).trim());
+        }
+    });
+    if (!data.length) return null;
+    return { type, data: JSON.parse(data.join('\n')) };
+}
+
+// Upload audio/video to /upload_media/stream and render the Server-Sent Events
+// (one per transcript segment with its translation) while Whisper is still running
+async function streamMediaUpload(field, file, targetLang) {
     const formData = new FormData();
-    formData.append('audio', file);
+    formData.append(field, file);
     formData.append('target_lang', targetLang);
-    
-    try {
-        const response = await fetch('/upload_audio', {
-            method: 'POST',
-            body: formData
-        });
-        
-        const data = await response.json();
-        
-        if (!response.ok) {
-            if (response.status === 429) {
-                showError(data.error || 'Too many audio uploads. Please wait a moment before trying again.');
-            } else {
-                showError(data.error || 'Audio upload failed');
+
+    const response = await fetch('/upload_media/stream', {
+        method: 'POST',
+        body: formData
+    });
+
+    if (!response.ok || !response.body) {
+        let message = field === 'video' ? 'Video upload failed' : 'Audio upload failed';
+        try {
+            message = (await response.json()).error || message;
+        } catch (e) {
+            // Non-JSON error page
+        }
+        if (response.status === 429) {
+            message = 'Too many uploads. Please wait a moment before trying again.';
+        }
+        showError(message);
+        return;
+    }
+
+    const originalEl = document.getElementById('original-text');
+    const translatedEl = document.getElementById('translated-text');
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    let started = false;
+
+    while (true) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+
+        let boundary;
+        while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+            const event = parseSseEvent(buffer.slice(0, boundary));
+            buffer = buffer.slice(boundary + 2);
+            if (!event) continue;
+
+            if (event.type === 'segment') {
+                if (!started) {
+                    // First segment: show the results panel and fill it progressively
+                    started = true;
+                    originalEl.textContent = '';
+                    translatedEl.textContent = '';
+                    document.getElementById('detected-lang').textContent = '…';
+                    document.getElementById('target-lang-display').textContent = targetLang;
+                    document.getElementById('results').classList.remove('hidden');
+                    hideLoading();
+                }
+                originalEl.textContent += (originalEl.textContent ? ' ' : '') + event.data.text;
+                translatedEl.textContent += (translatedEl.textContent ? ' ' : '') + event.data.translated_text;
+            } else if (event.type === 'done') {
+                showResults(event.data);
+            } else if (event.type === 'error') {
+                showError(event.data.error || 'Media processing failed');
             }
-            return;
         }
-        
-        showResults(data);
-    } catch (error) {
-        showError('Network error: ' + error.message);
     }
 }
 
@@ -564,21 +625,51 @@ async function showStatistics() {
 }
 
 let allHistory = [];
+let historyCursor = null;
 let showFavoritesOnly = false;
+const HISTORY_PAGE_SIZE = 50;
+
+async function fetchHistoryPage(cursor) {
+    const params = new URLSearchParams({ limit: HISTORY_PAGE_SIZE });
+    if (cursor) {
+        params.set('cursor', cursor);
+    }
+    const response = await fetch(`/history?${params}`);
+    const data = await response.json();
+    if (!response.ok) {
+        throw new Error(data.error || 'Failed to load history');
+    }
+    return data;
+}
+
+async function loadMoreHistory() {
+    if (!historyCursor) {
+        return;
+    }
+    try {
+        const data = await fetchHistoryPage(historyCursor);
+        allHistory = allHistory.concat(data.history);
+        historyCursor = data.next_cursor;
+        filterHistory();
+    } catch (error) {
+        showError(error.message);
+    }
+}
 
 async function loadHistory() {
     const historyList = document.getElementById('history-list');
     historyList.innerHTML = '<p>Loading history...</p>';
     
     try {
-        const response = await fetch('/history?limit=100');
-        const data = await response.json();
-        
-        if (!response.ok) {
-            showError(data.error || 'Failed to load history');
+        let data;
+        try {
+            data = await fetchHistoryPage(null);
+        } catch (error) {
+            showError(error.message);
             return;
         }
         
+        historyCursor = data.next_cursor;
         if (data.history.length === 0) {
             historyList.innerHTML = '<p class="history-empty">No translations yet. Start translating to see your history!</p>';
             allHistory = [];
@@ -642,6 +733,15 @@ function displayHistory(history) {
         
         historyList.appendChild(historyItem);
     });
+    
+    // Older translations are fetched a page at a time
+    if (historyCursor) {
+        const loadMore = document.createElement('button');
+        loadMore.className = 'view-history-btn';
+        loadMore.textContent = 'Load older translations';
+        loadMore.onclick = loadMoreHistory;
+        historyList.appendChild(loadMore);
+    }
 }
 
 function filterHistory() {
@@ -758,18 +858,17 @@ async function clearHistory() {
 
 async function loadHistoryItem(id) {
     try {
-        const response = await fetch('/history?limit=100');
-        const data = await response.json();
-        
-        if (!response.ok) {
-            showError(data.error || 'Failed to load history');
-            return;
-        }
-        
-        const item = data.history.find(h => h.id === id);
+        // Items on the loaded pages are already in memory; others are fetched by id
+        let item = allHistory.find(h => h.id === id);
         if (!item) {
-            showError('Translation not found');
-            return;
+            const response = await fetch(`/history/${id}`);
+            const data = await response.json();
+            
+            if (!response.ok) {
+                showError(data.error || 'Translation not found');
+                return;
+            }
+            item = data;
         }
         
         // Display in results section
@@ -979,27 +1078,9 @@ async function uploadVideoFile() {
 
     showLoading();
 
-    const formData = new FormData();
-    formData.append('video', file);
-    formData.append('target_lang', targetLang);
-
     try {
-        const response = await fetch('/upload_video', {
-            method: 'POST',
-            body: formData
-        });
-
-        const data = await response.json();  // حاول هنا تحليل الاستجابة على أنها JSON
-
-        if (!response.ok) {
-            // إذا كانت الاستجابة غير ناجحة
-            console.log('Error: ', data); // أظهر محتوى الاستجابة في الكونسول
-            showError(data.error || 'Video upload failed');
-            return;
-        }
-
-        console.log('Response:', data);  // عرض البيانات المستلمة من الخادم في الكونسول
-        showResults(data);
+        // النص والترجمة يظهران تدريجيًا أثناء معالجة الفيديو
+        await streamMediaUpload('video', file, targetLang);
     } catch (error) {
         // في حالة حدوث خطأ في الشبكة أو مشكلة في الاتصال
         console.error('Error:', error);
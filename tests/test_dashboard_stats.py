@@ -0,0 +1,113 @@
+"""
+Query-count regression test for /api/dashboard/stats
+Run: python -m pytest tests/
+
+The endpoint must stay O(1) in database round trips: the number of
+statements per request may not grow with the size of the user's history.
+Uses a throwaway SQLite database, so no PostgreSQL server is needed.
+"""
+
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+import pytest
+
+_tmp = tempfile.mkdtemp()
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(_tmp, 'test.db')}"
+os.environ.setdefault('JOB_QUEUE_PATH', os.path.join(_tmp, 'jobs.sqlite3'))
+os.environ.setdefault('TRANSCRIPT_CACHE_PATH', '')
+os.environ.setdefault('WARMUP_MODELS', '')
+os.environ.setdefault('JOB_INLINE_WORKERS', '0')
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event  # noqa: E402
+
+from app import app, db, Translation, User  # noqa: E402
+
+# Statements the endpoint may issue, including the Flask-Login user lookup
+MAX_STATEMENTS = 5
+
+
+@pytest.fixture
+def client():
+    app.config['TESTING'] = True
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        user = User(email='stats@example.com', name='Stats', provider='local', email_verified=True)
+        user.set_password('password-123')
+        db.session.add(user)
+        db.session.commit()
+        user_id = user.id
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['_user_id'] = str(user_id)
+        session['_fresh'] = True
+    client.user_id = user_id
+    # First request creates/verifies the tables; not part of the measurement
+    client.get('/api/dashboard/stats')
+    return client
+
+
+def _add_translations(user_id, count):
+    now = datetime.utcnow()
+    pairs = [('English', 'French'), ('Spanish', 'German'), ('English', 'Arabic')]
+    with app.app_context():
+        for i in range(count):
+            source, target = pairs[i % len(pairs)]
+            db.session.add(Translation(
+                user_id=user_id,
+                original_text='x' * (i + 1),
+                translated_text='y',
+                detected_language=source,
+                target_language=target,
+                timestamp=now - timedelta(days=i % 10),
+                is_favorite=(i % 4 == 0)
+            ))
+        db.session.commit()
+
+
+def _count_statements(client):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        response = client.get('/api/dashboard/stats')
+    finally:
+        event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+    assert response.status_code == 200, response.get_json()
+    return len(statements), response.get_json()
+
+
+def test_dashboard_stats_query_count_is_constant(client):
+    _add_translations(client.user_id, 3)
+    small_count, _ = _count_statements(client)
+
+    _add_translations(client.user_id, 60)
+    large_count, data = _count_statements(client)
+
+    assert small_count == large_count
+    assert large_count <= MAX_STATEMENTS
+    assert data['total_translations'] == 63
+
+
+def test_dashboard_stats_values(client):
+    _add_translations(client.user_id, 12)
+    _, data = _count_statements(client)
+
+    assert data['total_translations'] == 12
+    assert data['favorites_count'] == 3
+    assert data['today'] == 2
+    assert data['total_characters'] == sum(range(1, 13))
+    assert len(data['activity_timeline']) == 7
+    assert data['activity_timeline'][-1]['count'] == 2
+    assert data['language_distribution'] == {'French': 4, 'German': 4, 'Arabic': 4}
+    assert data['top_language_pairs'][0]['count'] == 4
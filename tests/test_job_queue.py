@@ -0,0 +1,59 @@
+"""
+Tests for the durable job queue in jobs_core
+Run: python -m pytest tests/
+
+A job whose worker dies on its last attempt is failed when its lease expires;
+the worker's cleanup hook must still run so its upload is deleted.
+"""
+
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from jobs_core import FAILED, QUEUED, JobQueue, JobWorker  # noqa: E402
+
+
+def _remove_upload(job):
+    path = job.payload.get('path')
+    if path and os.path.exists(path):
+        os.remove(path)
+
+
+@pytest.fixture
+def upload(tmp_path):
+    path = tmp_path / 'upload.wav'
+    path.write_bytes(b'RIFF')
+    return str(path)
+
+
+def _dead_worker_job(queue, upload):
+    """Enqueue a job, claim it and let its lease run out as if the worker died"""
+    job = queue.enqueue('media', {'path': upload}, user_id=1)
+    assert queue.claim().id == job.id
+    time.sleep(queue.lease_seconds * 2)
+    return job
+
+
+def test_expired_lease_without_attempts_left_removes_upload(tmp_path, upload):
+    queue = JobQueue(str(tmp_path / 'jobs.sqlite3'), max_attempts=1, lease_seconds=0.05)
+    job = _dead_worker_job(queue, upload)
+    worker = JobWorker(queue, {}, on_finished=_remove_upload)
+
+    assert worker.run_once() is False
+
+    assert queue.get(job.id).status == FAILED
+    assert not os.path.exists(upload)
+
+
+def test_expired_lease_with_attempts_left_is_requeued(tmp_path, upload):
+    queue = JobQueue(str(tmp_path / 'jobs.sqlite3'), max_attempts=2, lease_seconds=0.05)
+    job = _dead_worker_job(queue, upload)
+
+    assert queue.expire_leases() == []
+
+    assert queue.get(job.id).status == QUEUED
+    assert os.path.exists(upload)
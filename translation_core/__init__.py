@@ -0,0 +1,7 @@
+from .cache import TwoTierCache, make_translation_key, normalize_text
+from .detection import DetectionResult, resolve_source_language
+from .executor import ItemResult, run_ordered
+from .packer import PROVIDER_CHAR_LIMIT, pack_texts, translate_pack
+from .documents import Segment, reassemble_document, segment_document
+from .backends import BackendRouter, GoogleBackend, LocalMarianBackend, TranslationBackend
+from .housekeeping import BatchSweeper
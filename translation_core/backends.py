@@ -0,0 +1,270 @@
+import logging
+import threading
+from abc import ABC, abstractmethod
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .documents import _chunk_paragraph
+from .executor import ItemResult
+from .packer import PROVIDER_CHAR_LIMIT, pack_texts, translate_pack
+
+logger = logging.getLogger(__name__)
+
+
+class TranslationBackend(ABC):
+    """
+    Interface for a machine translation backend.
+    - plan(): how a list of texts should be split into units of work
+    - translate_batch(): translate any list of texts, one ItemResult per text;
+      raises only when the backend as a whole is unusable
+    """
+
+    name = "base"
+
+    def supports(self, source: str, target: str) -> bool:
+        return True
+
+    def plan(self, texts: Sequence[str]) -> List[List[int]]:
+        return [[i] for i in range(len(texts))]
+
+    @abstractmethod
+    def translate_batch(self, texts: Sequence[str], source: str, target: str) -> List[ItemResult]:
+        """Translate `texts` from source to target, one ItemResult per text."""
+
+
+class GoogleBackend(TranslationBackend):
+    """Remote backend: deep-translator's GoogleTranslator, with request packing."""
+
+    name = "google"
+
+    def __init__(self, max_chars: int = PROVIDER_CHAR_LIMIT):
+        self.max_chars = max_chars
+
+    def plan(self, texts: Sequence[str]) -> List[List[int]]:
+        return pack_texts(texts, self.max_chars)
+
+    def _translate(self, text: str, source: str, target: str) -> str:
+        from deep_translator import GoogleTranslator
+
+        return GoogleTranslator(source=source, target=target).translate(text)
+
+    def translate_batch(self, texts: Sequence[str], source: str, target: str) -> List[ItemResult]:
+        results: List[ItemResult] = [ItemResult(index=i) for i in range(len(texts))]
+        for pack in self.plan(texts):
+            pack_results = translate_pack(
+                [texts[i] for i in pack],
+                lambda payload: self._translate(payload, source, target),
+            )
+            for i, result in zip(pack, pack_results):
+                results[i].value, results[i].error = result.value, result.error
+        if results and all(not r.ok for r in results):
+            raise RuntimeError(results[0].error)
+        return results
+
+
+class LocalMarianBackend(TranslationBackend):
+    """
+    Local CPU backend using MarianMT checkpoints (one small model per pair).
+    Models are loaded lazily on first use of a pair. With a `registry`
+    (ai_core's ModelRegistry) each pair is a "marian:<src>-<tgt>" entry, so it
+    counts against the memory budget and can be evicted; without one they
+    are kept for the life of the worker. Batches are padded and generated
+    together.
+    """
+
+    name = "local"
+
+    # Marian models are trained on sentences; longer inputs are split first
+    MAX_INPUT_CHARS = 400
+
+    def __init__(
+        self,
+        pairs: Optional[Sequence[str]] = None,
+        model_template: str = "Helsinki-NLP/opus-mt-{source}-{target}",
+        batch_size: int = 16,
+        registry: Optional[Any] = None,
+    ):
+        # pairs like ["en-fr", "fr-en"], or ["*"] for any pair with a checkpoint
+        self.pairs = {p.strip().lower() for p in (pairs or []) if p.strip()}
+        self.model_template = model_template
+        self.batch_size = max(1, batch_size)
+        self.registry = registry
+        self._models: Dict[Tuple[str, str], Any] = {}
+        self._locks: Dict[Tuple[str, str], threading.Lock] = {}
+        self._registry_lock = threading.Lock()
+
+    def supports(self, source: str, target: str) -> bool:
+        if source == "auto" or not self.pairs:
+            return False
+        return "*" in self.pairs or f"{source}-{target}".lower() in self.pairs
+
+    def plan(self, texts: Sequence[str]) -> List[List[int]]:
+        indices = list(range(len(texts)))
+        return [indices[i:i + self.batch_size] for i in range(0, len(indices), self.batch_size)]
+
+    def _lock_for(self, pair: Tuple[str, str]) -> threading.Lock:
+        with self._registry_lock:
+            return self._locks.setdefault(pair, threading.Lock())
+
+    def _load_pair(self, source: str, target: str):
+        from transformers import MarianMTModel, MarianTokenizer
+
+        name = self.model_template.format(source=source, target=target)
+        logger.info("Loading local translation model %s", name)
+        tokenizer = MarianTokenizer.from_pretrained(name)
+        model = MarianMTModel.from_pretrained(name)
+        model.eval()
+        return tokenizer, model
+
+    def _load(self, source: str, target: str):
+        if self.registry is not None:
+            key = f"marian:{source}-{target}"
+            if not self.registry.is_registered(key):
+                self.registry.register(key, lambda: self._load_pair(source, target))
+            return self.registry.get(key)
+        pair = (source, target)
+        if pair not in self._models:
+            self._models[pair] = self._load_pair(source, target)
+        return self._models[pair]
+
+    def _generate(self, tokenizer, model, sentences: List[str]) -> List[str]:
+        import torch
+
+        outputs: List[str] = []
+        for i in range(0, len(sentences), self.batch_size):
+            batch = tokenizer(
+                sentences[i:i + self.batch_size],
+                return_tensors="pt",
+                padding=True,
+                truncation=True,
+            )
+            with torch.inference_mode():
+                generated = model.generate(**batch)
+            outputs.extend(tokenizer.batch_decode(generated, skip_special_tokens=True))
+        return outputs
+
+    def translate_batch(self, texts: Sequence[str], source: str, target: str) -> List[ItemResult]:
+        pair = (source, target)
+        with self._lock_for(pair):
+            tokenizer, model = self._load(source, target)
+            # Split every text into sentence-sized pieces, translate all
+            # pieces as one padded stream, then stitch each text back
+            pieces: List[str] = []
+            owners: List[int] = []
+            for i, text in enumerate(texts):
+                for piece in _chunk_paragraph(" ".join(text.split()), self.MAX_INPUT_CHARS):
+                    pieces.append(piece)
+                    owners.append(i)
+            translated = self._generate(tokenizer, model, pieces)
+
+        joined: List[List[str]] = [[] for _ in texts]
+        for owner, piece in zip(owners, translated):
+            joined[owner].append(piece)
+        return [ItemResult(index=i, value=" ".join(parts)) for i, parts in enumerate(joined)]
+
+
+@dataclass
+class BackendHealth:
+    calls: int = 0
+    failures: int = 0
+    consecutive_failures: int = 0
+    latency_per_item: float = 0.0   # exponentially weighted, seconds
+    cooldown_until: float = 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "failures": self.failures,
+            "latency_per_item_ms": round(self.latency_per_item * 1000, 1),
+            "cooling_down": self.cooldown_until > time.time(),
+        }
+
+
+class BackendRouter:
+    """
+    Picks a backend per language pair and falls back between backends.
+    - order comes from the pair override, else the default preference list
+    - a backend failing `max_failures` times in a row sits out `cooldown` seconds
+    - a backend slower than `slow_seconds` per item yields to a faster healthy one
+    """
+
+    def __init__(
+        self,
+        backends: Sequence[TranslationBackend],
+        pair_order: Optional[Dict[str, List[str]]] = None,
+        cooldown: float = 60.0,
+        max_failures: int = 3,
+        slow_seconds: float = 2.0,
+    ):
+        self.backends = {b.name: b for b in backends}
+        self.default_order = [b.name for b in backends]
+        self.pair_order = {k.lower(): v for k, v in (pair_order or {}).items()}
+        self.cooldown = cooldown
+        self.max_failures = max_failures
+        self.slow_seconds = slow_seconds
+        self.health = {name: BackendHealth() for name in self.backends}
+        self._lock = threading.Lock()
+
+    def candidates(self, source: str, target: str) -> List[TranslationBackend]:
+        order = self.pair_order.get(f"{source}-{target}".lower(), self.default_order)
+        usable = [
+            self.backends[name] for name in order
+            if name in self.backends and self.backends[name].supports(source, target)
+        ]
+        now = time.time()
+        healthy = [b for b in usable if self.health[b.name].cooldown_until <= now]
+        cooling = [b for b in usable if self.health[b.name].cooldown_until > now]
+        if len(healthy) > 1:
+            first = self.health[healthy[0].name]
+            fastest = min(healthy, key=lambda b: self.health[b.name].latency_per_item or float("inf"))
+            if first.latency_per_item > self.slow_seconds and fastest is not healthy[0]:
+                healthy.remove(fastest)
+                healthy.insert(0, fastest)
+        # Backends in cooldown are still tried last rather than not at all
+        return healthy + cooling
+
+    def plan(self, texts: Sequence[str], source: str, target: str) -> List[List[int]]:
+        candidates = self.candidates(source, target)
+        if not candidates:
+            return [[i] for i in range(len(texts))]
+        return candidates[0].plan(texts)
+
+    def _record(self, name: str, elapsed: float, items: int, ok: bool) -> None:
+        with self._lock:
+            health = self.health[name]
+            health.calls += 1
+            if ok:
+                health.consecutive_failures = 0
+                per_item = elapsed / max(items, 1)
+                health.latency_per_item = (
+                    per_item if not health.latency_per_item
+                    else 0.8 * health.latency_per_item + 0.2 * per_item
+                )
+            else:
+                health.failures += 1
+                health.consecutive_failures += 1
+                if health.consecutive_failures >= self.max_failures:
+                    health.cooldown_until = time.time() + self.cooldown
+
+    def translate_batch(self, texts: Sequence[str], source: str, target: str) -> List[ItemResult]:
+        candidates = self.candidates(source, target)
+        if not candidates:
+            raise RuntimeError(f"No translation backend supports {source}->{target}")
+        last_error: Optional[Exception] = None
+        for backend in candidates:
+            started = time.monotonic()
+            try:
+                results = backend.translate_batch(texts, source, target)
+            except Exception as exc:
+                self._record(backend.name, time.monotonic() - started, len(texts), ok=False)
+                logger.warning("Translation backend %s failed (%s->%s): %s", backend.name, source, target, exc)
+                last_error = exc
+                continue
+            self._record(backend.name, time.monotonic() - started, len(texts), ok=True)
+            return results
+        raise RuntimeError(str(last_error))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {name: health.as_dict() for name, health in self.health.items()}
@@ -0,0 +1,261 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+_INLINE_SPACE_RE = re.compile(r"[ \t\u00a0]+")
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize text before hashing so trivially different inputs share a key.
+    Line breaks are kept because they change how a document is translated.
+    """
+    t = unicodedata.normalize("NFC", text or "").strip()
+    lines = [_INLINE_SPACE_RE.sub(" ", line).strip() for line in t.split("\n")]
+    return "\n".join(lines)
+
+
+def make_translation_key(text: str, source: str, target: str) -> str:
+    """Cache key for one (text, source language, target language) triple."""
+    payload = f"{source}\x1f{target}\x1f{normalize_text(text)}"
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LRUCache:
+    """Thread-safe in-process LRU with a per-entry TTL."""
+
+    def __init__(self, max_entries: int = 2048, ttl: float = 86400):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._data: "OrderedDict[str, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            stored_at, value = item
+            if self.ttl and time.time() - stored_at > self.ttl:
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._data[key] = (time.time(), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class SQLiteCache:
+    """
+    Shared on-disk tier backed by a SQLite file.
+    Every gunicorn worker on the host opens the same file, so a phrase
+    translated by one worker is a hit for all the others.
+    """
+
+    _PRUNE_EVERY = 200
+
+    def __init__(self, path: str, namespace: str, ttl: float = 86400 * 7, max_entries: int = 100000):
+        self.path = path
+        self.namespace = namespace
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._local = threading.local()
+        self._writes = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        if not os.path.exists(directory):
+            os.makedirs(directory, exist_ok=True)
+        conn = self._connect()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache_entries ("
+            " namespace TEXT NOT NULL,"
+            " key TEXT NOT NULL,"
+            " value TEXT NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " accessed_at REAL NOT NULL,"
+            " PRIMARY KEY (namespace, key))"
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_cache_entries_accessed "
+            "ON cache_entries(namespace, accessed_at)"
+        )
+        conn.commit()
+
+    def _connect(self) -> sqlite3.Connection:
+        # Connections are per thread *and* per process; a forked worker must
+        # not reuse the parent's handle.
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and getattr(self._local, "pid", None) == os.getpid():
+            return conn
+        conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        self._local.conn = conn
+        self._local.pid = os.getpid()
+        return conn
+
+    def get(self, key: str) -> Optional[Any]:
+        conn = self._connect()
+        row = conn.execute(
+            "SELECT value, created_at FROM cache_entries WHERE namespace = ? AND key = ?",
+            (self.namespace, key),
+        ).fetchone()
+        if row is None:
+            return None
+        value, created_at = row
+        now = time.time()
+        if self.ttl and now - created_at > self.ttl:
+            conn.execute(
+                "DELETE FROM cache_entries WHERE namespace = ? AND key = ?",
+                (self.namespace, key),
+            )
+            return None
+        conn.execute(
+            "UPDATE cache_entries SET accessed_at = ? WHERE namespace = ? AND key = ?",
+            (now, self.namespace, key),
+        )
+        return json.loads(value)
+
+    def set(self, key: str, value: Any) -> None:
+        now = time.time()
+        conn = self._connect()
+        conn.execute(
+            "INSERT OR REPLACE INTO cache_entries (namespace, key, value, created_at, accessed_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (self.namespace, key, json.dumps(value, ensure_ascii=False), now, now),
+        )
+        with self._lock:
+            self._writes += 1
+            prune = self._writes % self._PRUNE_EVERY == 0
+        if prune:
+            self.prune()
+
+    def prune(self) -> int:
+        """Drop expired entries, then the least recently used beyond max_entries."""
+        conn = self._connect()
+        removed = 0
+        if self.ttl:
+            cur = conn.execute(
+                "DELETE FROM cache_entries WHERE namespace = ? AND created_at < ?",
+                (self.namespace, time.time() - self.ttl),
+            )
+            removed += cur.rowcount
+        cur = conn.execute(
+            "DELETE FROM cache_entries WHERE namespace = ? AND key IN ("
+            " SELECT key FROM cache_entries WHERE namespace = ?"
+            " ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+            (self.namespace, self.namespace, self.max_entries),
+        )
+        removed += cur.rowcount
+        return removed
+
+    def __len__(self) -> int:
+        row = self._connect().execute(
+            "SELECT COUNT(*) FROM cache_entries WHERE namespace = ?", (self.namespace,)
+        ).fetchone()
+        return row[0] if row else 0
+
+
+class TwoTierCache:
+    """
+    In-process LRU in front of an optional shared SQLite tier.
+    Failures in the shared tier are logged and treated as misses so a broken
+    cache file never breaks a request.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        memory_entries: int = 2048,
+        ttl: float = 86400,
+        disk_path: Optional[str] = None,
+        disk_ttl: Optional[float] = None,
+        disk_max_entries: int = 100000,
+    ):
+        self.namespace = namespace
+        self.memory = LRUCache(max_entries=memory_entries, ttl=ttl)
+        self.disk: Optional[SQLiteCache] = None
+        if disk_path:
+            try:
+                self.disk = SQLiteCache(
+                    disk_path,
+                    namespace,
+                    ttl=disk_ttl if disk_ttl is not None else ttl,
+                    max_entries=disk_max_entries,
+                )
+            except Exception as exc:
+                logger.warning("Shared cache tier disabled (%s): %s", disk_path, exc)
+        self._counters = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "sets": 0, "errors": 0}
+        self._lock = threading.Lock()
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._counters[name] += 1
+
+    def get(self, key: str) -> Optional[Any]:
+        value = self.memory.get(key)
+        if value is not None:
+            self._count("memory_hits")
+            return value
+        if self.disk is not None:
+            try:
+                value = self.disk.get(key)
+            except Exception as exc:
+                self._count("errors")
+                logger.warning("Shared cache read failed: %s", exc)
+                value = None
+            if value is not None:
+                self.memory.set(key, value)
+                self._count("disk_hits")
+                return value
+        self._count("misses")
+        return None
+
+    def set(self, key: str, value: Any) -> None:
+        self.memory.set(key, value)
+        self._count("sets")
+        if self.disk is not None:
+            try:
+                self.disk.set(key, value)
+            except Exception as exc:
+                self._count("errors")
+                logger.warning("Shared cache write failed: %s", exc)
+
+    def clear_memory(self) -> None:
+        self.memory.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counters = dict(self._counters)
+        hits = counters["memory_hits"] + counters["disk_hits"]
+        lookups = hits + counters["misses"]
+        return {
+            **counters,
+            "hits": hits,
+            "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+            "memory_entries": len(self.memory),
+            "shared_tier": self.disk is not None,
+        }
@@ -0,0 +1,59 @@
+from dataclasses import dataclass
+from typing import Mapping, Optional
+
+# langdetect is probabilistic; long inputs do not improve accuracy much but
+# cost linearly, so only a prefix is inspected.
+DETECTION_SAMPLE_CHARS = 1000
+
+_seeded = False
+
+
+@dataclass(frozen=True)
+class DetectionResult:
+    code: str                 # provider language code (e.g. "en"), "auto" when unknown
+    name: str                 # display name (e.g. "English"), "Unknown" when unknown
+    source: str = "detected"  # detected | caller
+
+    @property
+    def is_known(self) -> bool:
+        return self.code != "auto"
+
+
+def _detect_code(text: str) -> Optional[str]:
+    global _seeded
+    from langdetect import DetectorFactory, detect
+
+    if not _seeded:
+        # Make detection deterministic across calls and workers
+        DetectorFactory.seed = 0
+        _seeded = True
+    try:
+        return detect(text[:DETECTION_SAMPLE_CHARS])
+    except Exception:
+        return None
+
+
+def resolve_source_language(
+    text: str,
+    languages: Mapping[str, str],
+    source_lang: Optional[str] = None,
+) -> DetectionResult:
+    """
+    Compute the source language once per request.
+    `source_lang` may be a code ("fr") or a display name ("French"); when it is
+    given and recognised, detection is skipped entirely. Anything that is not
+    a string (a JSON number or list) is treated as auto-detect.
+    """
+    if isinstance(source_lang, str) and source_lang.strip().lower() not in ("", "auto"):
+        hint = source_lang.strip()
+        if hint.lower() in languages:
+            code = hint.lower()
+            return DetectionResult(code=code, name=languages[code], source="caller")
+        for code, name in languages.items():
+            if name.lower() == hint.lower():
+                return DetectionResult(code=code, name=name, source="caller")
+
+    code = _detect_code(text or "")
+    if not code:
+        return DetectionResult(code="auto", name="Unknown")
+    return DetectionResult(code=code, name=languages.get(code, "Unknown"))
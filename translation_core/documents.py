@@ -0,0 +1,86 @@
+import re
+from dataclasses import dataclass
+from typing import List
+
+from .packer import PROVIDER_CHAR_LIMIT
+
+_PARAGRAPH_RE = re.compile(r"(\n\s*\n+)")
+_SENTENCE_RE = re.compile(r"(?<=[.!?؟。！？])\s+")
+
+
+@dataclass
+class Segment:
+    text: str          # chunk sent to the provider ("" for pure separators)
+    separator: str     # whitespace that followed the chunk in the original
+
+
+def _split_long(text: str, max_chars: int) -> List[str]:
+    """Split a sentence that alone exceeds max_chars on word boundaries."""
+    pieces, current = [], ""
+    for word in text.split(" "):
+        candidate = f"{current} {word}" if current else word
+        if len(candidate) <= max_chars:
+            current = candidate
+            continue
+        if current:
+            pieces.append(current)
+        while len(word) > max_chars:
+            pieces.append(word[:max_chars])
+            word = word[max_chars:]
+        current = word
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def _chunk_paragraph(paragraph: str, max_chars: int) -> List[str]:
+    """Greedily merge whole sentences into chunks of at most max_chars."""
+    if len(paragraph) <= max_chars:
+        return [paragraph]
+    chunks, current = [], ""
+    for sentence in _SENTENCE_RE.split(paragraph):
+        if not sentence:
+            continue
+        for piece in ([sentence] if len(sentence) <= max_chars else _split_long(sentence, max_chars)):
+            candidate = f"{current} {piece}" if current else piece
+            if len(candidate) <= max_chars:
+                current = candidate
+            else:
+                chunks.append(current)
+                current = piece
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def segment_document(text: str, max_chars: int = PROVIDER_CHAR_LIMIT) -> List[Segment]:
+    """
+    Split a document into provider-sized chunks.
+    Paragraphs are never merged, so an edit in one paragraph leaves the
+    chunks (and cache keys) of every other paragraph unchanged; paragraphs
+    longer than max_chars are split on sentence boundaries. Single line
+    breaks inside a paragraph (hard-wrapped PDF text) are joined with a
+    space so a sentence is never translated as fragments.
+    """
+    segments: List[Segment] = []
+    parts = _PARAGRAPH_RE.split(text or "")
+    # parts alternates paragraph, separator, paragraph, ...
+    for i in range(0, len(parts), 2):
+        separator = parts[i + 1] if i + 1 < len(parts) else ""
+        paragraph = " ".join(line.strip() for line in parts[i].splitlines() if line.strip())
+        if not paragraph:
+            segments.append(Segment(text="", separator=separator))
+            continue
+        chunks = _chunk_paragraph(paragraph, max_chars)
+        for k, chunk in enumerate(chunks):
+            segments.append(Segment(text=chunk, separator=separator if k == len(chunks) - 1 else " "))
+    return segments
+
+
+def reassemble_document(segments: List[Segment], translations: List[str]) -> str:
+    """Join translated chunks back in order, restoring the original breaks."""
+    out = []
+    for segment, translated in zip(segments, translations):
+        out.append(translated if segment.text else "")
+        out.append(segment.separator)
+    return "".join(out).strip()
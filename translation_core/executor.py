@@ -0,0 +1,74 @@
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence
+
+
+@dataclass
+class ItemResult:
+    index: int
+    value: Any = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def run_ordered(
+    items: Sequence[Any],
+    fn: Callable[[Any], Any],
+    max_workers: int = 8,
+    timeout: Optional[float] = 30.0,
+    key: Callable[[Any], Hashable] = lambda item: item,
+) -> List[ItemResult]:
+    """
+    Apply `fn` to every item on a bounded thread pool.
+    - identical items (by `key`) are computed once and shared
+    - results come back in input order
+    - an exception or a timeout only fails that item; `timeout` is counted
+      from the moment the item starts running, not from submission
+    """
+    results = [ItemResult(index=i) for i in range(len(items))]
+    if not items:
+        return results
+
+    positions: Dict[Hashable, List[int]] = {}
+    for i, item in enumerate(items):
+        positions.setdefault(key(item), []).append(i)
+
+    started: Dict[Hashable, float] = {}
+
+    def _call(k: Hashable, item: Any) -> Any:
+        started[k] = time.monotonic()
+        return fn(item)
+
+    def _settle(k: Hashable, value: Any = None, error: Optional[str] = None) -> None:
+        for i in positions[k]:
+            results[i].value = value
+            results[i].error = error
+
+    pool = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(positions))))
+    try:
+        pending = {
+            pool.submit(_call, k, items[idx[0]]): k
+            for k, idx in positions.items()
+        }
+        while pending:
+            done, _ = wait(pending, timeout=0.05 if timeout else None, return_when=FIRST_COMPLETED)
+            for future in done:
+                k = pending.pop(future)
+                try:
+                    _settle(k, value=future.result())
+                except Exception as exc:
+                    _settle(k, error=str(exc) or exc.__class__.__name__)
+            if timeout:
+                now = time.monotonic()
+                for future, k in list(pending.items()):
+                    if k in started and now - started[k] > timeout and not future.done():
+                        # The worker thread cannot be interrupted; its result is discarded
+                        pending.pop(future)
+                        _settle(k, error=f"Timed out after {timeout:g}s")
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+    return results
@@ -0,0 +1,100 @@
+import contextlib
+import logging
+import os
+import threading
+from typing import Any, Callable, Hashable, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+
+class BatchSweeper:
+    """
+    Collects keys (e.g. user ids) that need housekeeping and hands them to
+    `handler` in batches from a background thread, so request handlers only
+    pay for a set insert. A sweep runs every `interval` seconds, or sooner
+    once `batch_size` keys are pending. `context` wraps each sweep (e.g. a
+    Flask app context).
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[List[Hashable]], Any],
+        interval: float = 5.0,
+        batch_size: int = 200,
+        context: Optional[Callable[[], Any]] = None,
+        name: str = "sweeper",
+    ):
+        self.handler = handler
+        self.interval = interval
+        self.batch_size = batch_size
+        self.context = context or contextlib.nullcontext
+        self.name = name
+        self._pending: Set[Hashable] = set()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self.sweeps = 0
+        self.failures = 0
+
+    def mark(self, key: Hashable) -> None:
+        with self._lock:
+            self._pending.add(key)
+            pending = len(self._pending)
+        self._ensure_started()
+        if pending >= self.batch_size:
+            self._wake.set()
+
+    def _take(self) -> List[Hashable]:
+        with self._lock:
+            keys = list(self._pending)[: self.batch_size]
+            self._pending.difference_update(keys)
+            return keys
+
+    def run_once(self) -> int:
+        """Sweep every pending key now, batch by batch; returns how many were handled."""
+        handled = 0
+        while True:
+            keys = self._take()
+            if not keys:
+                return handled
+            try:
+                with self.context():
+                    self.handler(keys)
+                with self._lock:
+                    self.sweeps += 1
+                handled += len(keys)
+            except Exception as exc:
+                # Keep the keys so the next sweep retries them
+                with self._lock:
+                    self.failures += 1
+                    self._pending.update(keys)
+                logger.error("%s failed for %d keys: %s", self.name, len(keys), exc, exc_info=True)
+                return handled
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            self.run_once()
+
+    def _ensure_started(self) -> None:
+        # Fork-aware: a preloaded master's thread does not survive into workers
+        if self._pid == os.getpid() and self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._pid == os.getpid() and self._thread is not None and self._thread.is_alive():
+                return
+            self._pid = os.getpid()
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
+
+    def stats(self):
+        with self._lock:
+            return {"pending": len(self._pending), "sweeps": self.sweeps, "failures": self.failures}
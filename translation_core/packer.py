@@ -0,0 +1,59 @@
+from typing import Callable, List, Sequence
+
+from .executor import ItemResult
+
+# GoogleTranslator rejects payloads of 5000 characters or more
+PROVIDER_CHAR_LIMIT = 4900
+
+# Texts are packed one per line; the provider keeps line breaks, so the
+# translated payload can be split back on the same separator.
+SEPARATOR = "\n"
+
+
+def pack_texts(texts: Sequence[str], max_chars: int = PROVIDER_CHAR_LIMIT) -> List[List[int]]:
+    """
+    Greedily group text indices into provider requests of at most `max_chars`.
+    Multi-line texts (which would break the line-based split) and texts that
+    are already at the limit are sent on their own.
+    """
+    packs: List[List[int]] = []
+    current: List[int] = []
+    size = 0
+    for i, text in enumerate(texts):
+        if SEPARATOR in text or len(text) >= max_chars:
+            packs.append([i])
+            continue
+        extra = len(text) + (len(SEPARATOR) if current else 0)
+        if current and size + extra > max_chars:
+            packs.append(current)
+            current, size = [], 0
+            extra = len(text)
+        current.append(i)
+        size += extra
+    if current:
+        packs.append(current)
+    return packs
+
+
+def translate_pack(texts: Sequence[str], translate: Callable[[str], str]) -> List[ItemResult]:
+    """
+    Translate a pack produced by pack_texts() with a single provider call.
+    If the provider call fails or the line count does not survive the round
+    trip, falls back to one call per text so each text gets its own result.
+    """
+    if len(texts) > 1:
+        try:
+            translated = translate(SEPARATOR.join(texts)) or ""
+            parts = translated.split(SEPARATOR)
+            if len(parts) == len(texts):
+                return [ItemResult(index=i, value=part.strip()) for i, part in enumerate(parts)]
+        except Exception:
+            pass
+
+    results = []
+    for i, text in enumerate(texts):
+        try:
+            results.append(ItemResult(index=i, value=translate(text)))
+        except Exception as exc:
+            results.append(ItemResult(index=i, error=str(exc) or exc.__class__.__name__))
+    return results
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Background worker for audio/video upload jobs
+Usage: python worker.py [--processes 2] [--threads 1]
+
+Runs jobs queued by /upload_audio and /upload_video (sent with async=1) from
+the shared SQLite queue. Start it next to the web server and set
+JOB_INLINE_WORKERS=0 so the web processes only enqueue.
+"""
+
+import argparse
+import multiprocessing
+import os
+import signal
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_worker(threads):
+    """Import the app in this process and work the queue until stopped"""
+    from app import app, job_worker
+
+    signal.signal(signal.SIGTERM, lambda *_: job_worker.stop())
+    app.logger.info(f"🛠️ Job worker started (pid {os.getpid()}, {threads} thread(s))")
+    if threads > 1:
+        job_worker.start(threads - 1)
+    job_worker.run_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--processes', type=int, default=int(os.getenv('JOB_WORKER_PROCESSES', '1')))
+    parser.add_argument('--threads', type=int, default=1, help='Jobs run concurrently per process')
+    args = parser.parse_args()
+
+    if args.processes <= 1:
+        run_worker(args.threads)
+        return
+
+    context = multiprocessing.get_context('spawn')
+    processes = [context.Process(target=run_worker, args=(args.threads,)) for _ in range(args.processes)]
+    for process in processes:
+        process.start()
+
+    def stop(*_):
+        for process in processes:
+            process.terminate()
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    for process in processes:
+        process.join()
+
+
+if __name__ == '__main__':
+    main()